@@ -6,6 +6,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 try:
     from app import create_app
+    # Functions are frozen between invocations, so no background threads:
+    # bulk jobs run from Vercel Cron (/api/v1/cron/bulk-jobs)
     app = create_app()
 except Exception as e:
     import traceback
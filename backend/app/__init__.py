@@ -2,8 +2,15 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 
 
-def create_app(config_name: str = "development") -> Flask:
-    """Flask application factory."""
+def create_app(
+    config_name: str = "development", background: bool = False, preload: bool = False
+) -> Flask:
+    """Flask application factory.
+
+    `background` starts the background work (see `start_background_work`)
+    in this process. `preload` is for an app built before forking workers:
+    no threads are started, and each worker calls `start_profiler` itself.
+    """
     app = Flask(__name__)
 
     # Load config
@@ -13,6 +20,21 @@ def create_app(config_name: str = "development") -> Flask:
     # Enable CORS for frontend dev server
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
+    # Faster JSON encoding and gzip/brotli for large responses
+    from app.utils.json_provider import init_json
+    from app.utils.compression import init_compression
+    init_json(app)
+    init_compression(app)
+
+    # Sampling profiler (PROFILE_ENABLED=1)
+    from app.utils.profiler import init_profiler
+    init_profiler(app, start=not preload)
+
+    # Open event streams per process (serve.py lowers it to fit its threads)
+    from app.services.change_feed import set_max_subscribers, share_changes
+    set_max_subscribers(app.config["SSE_MAX_SUBSCRIBERS"])
+    share_changes(app.config["CHANGE_FEED_SHARED"])
+
     # Register blueprints
     from app.routes import register_blueprints
     register_blueprints(app)
@@ -41,4 +63,53 @@ def create_app(config_name: str = "development") -> Flask:
     def internal_error(e):
         return jsonify({"error": "Internal server error", "code": 500}), 500
 
+    if background:
+        start_background_work(app)
+
     return app
+
+
+def start_background_work(app: Flask) -> None:
+    """Start the bulk job runner, and the weekly summary scheduler if
+    SUMMARY_SCHEDULER_ENABLED, in this process."""
+    from app.services.bulk_service import start_job_runner
+    start_job_runner(
+        poll_seconds=app.config["BULK_JOB_POLL_SECONDS"],
+        lease_seconds=app.config["BULK_JOB_LEASE_SECONDS"],
+    )
+
+    if app.config.get("SUMMARY_SCHEDULER_ENABLED"):
+        from app.services.summary_batch_service import start_weekly_scheduler
+        start_weekly_scheduler(
+            weekday=app.config["SUMMARY_SCHEDULE_WEEKDAY"],
+            hour=app.config["SUMMARY_SCHEDULE_HOUR"],
+            **summary_batch_options(app),
+        )
+
+
+def follow_shared_changes(app: Flask) -> None:
+    """Apply changes made by other processes in this one: stream them to
+    its event subscribers and drop its cached analytics and workload."""
+    if not app.config["CHANGE_FEED_SHARED"]:
+        return
+    from app.services.analytics_service import invalidate_project
+    from app.services.change_feed import on_remote_change, start_follower
+    from app.services.workload_service import invalidate_workload
+
+    def _invalidate(event: dict) -> None:
+        if event.get("project_id"):
+            invalidate_project(event["project_id"])
+            invalidate_workload(event["project_id"])
+
+    on_remote_change(_invalidate)
+    start_follower(app.config["CHANGE_FEED_POLL_SECONDS"])
+
+
+def summary_batch_options(app: Flask) -> dict:
+    """Keyword arguments for run_summary_batch taken from app config."""
+    return {
+        "tone": app.config["SUMMARY_BATCH_TONE"],
+        "max_workers": app.config["SUMMARY_BATCH_WORKERS"],
+        "rate_per_minute": app.config["SUMMARY_BATCH_RATE_PER_MINUTE"],
+        "state_path": app.config["SUMMARY_BATCH_STATE_PATH"],
+    }
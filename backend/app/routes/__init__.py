@@ -9,8 +9,20 @@ def register_blueprints(app: Flask) -> None:
     from app.routes.projects import projects_bp
     from app.routes.milestones import milestones_bp
     from app.routes.search import search_bp
+    from app.routes.batch import batch_bp
+    from app.routes.analytics import analytics_bp
+    from app.routes.events import events_bp
+    from app.routes.sync import sync_bp
+    from app.routes.metrics import metrics_bp
+    from app.routes.cron import cron_bp
 
     app.register_blueprint(scopes_bp, url_prefix="/api/v1")
     app.register_blueprint(projects_bp, url_prefix="/api/v1")
     app.register_blueprint(milestones_bp, url_prefix="/api/v1")
     app.register_blueprint(search_bp, url_prefix="/api/v1")
+    app.register_blueprint(batch_bp, url_prefix="/api/v1")
+    app.register_blueprint(analytics_bp, url_prefix="/api/v1")
+    app.register_blueprint(events_bp, url_prefix="/api/v1")
+    app.register_blueprint(sync_bp, url_prefix="/api/v1")
+    app.register_blueprint(metrics_bp, url_prefix="/api/v1")
+    app.register_blueprint(cron_bp, url_prefix="/api/v1")
@@ -0,0 +1,43 @@
+"""Analytics endpoints — burndown, velocity and forecast charts, team workload."""
+
+from flask import Blueprint, jsonify
+
+from app.services.analytics_service import (
+    get_portfolio_analytics,
+    get_project_analytics,
+)
+from app.services.workload_service import get_workload
+
+analytics_bp = Blueprint("analytics", __name__)
+
+
+@analytics_bp.route("/projects/<project_id>/analytics", methods=["GET"])
+def project_analytics(project_id: str):
+    """Daily burndown, rolling velocity and projected finish for a project."""
+    try:
+        analytics = get_project_analytics(project_id)
+    except LookupError as e:
+        return jsonify({"error": str(e), "code": 404}), 404
+    return jsonify({"analytics": analytics})
+
+
+@analytics_bp.route("/analytics/portfolio", methods=["GET"])
+def portfolio_analytics():
+    """Burndown and velocity summed across active projects, plus per-project forecasts."""
+    return jsonify({"analytics": get_portfolio_analytics()})
+
+
+@analytics_bp.route("/projects/<project_id>/workload", methods=["GET"])
+def project_workload(project_id: str):
+    """Assigned milestones, open stories and overdue work per team member."""
+    try:
+        workload = get_workload(project_id)
+    except LookupError as e:
+        return jsonify({"error": str(e), "code": 404}), 404
+    return jsonify({"workload": workload})
+
+
+@analytics_bp.route("/workload", methods=["GET"])
+def portfolio_workload():
+    """Workload per person across active projects."""
+    return jsonify({"workload": get_workload()})
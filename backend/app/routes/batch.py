@@ -0,0 +1,140 @@
+"""Batch endpoint — /api/v1/batch
+
+Dispatches a list of sub-requests through the Flask app in-process and
+returns one combined response, saving the per-request HTTP round trip.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import urlsplit
+
+from flask import Blueprint, Flask, current_app, request, jsonify, abort
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from app.routes.events import portfolio_events, project_events
+from app.routes.projects import export_project_ndjson
+
+batch_bp = Blueprint("batch", __name__)
+
+API_PREFIX = "/api/v1"
+VALID_BATCH_METHODS = {"GET", "POST", "PATCH", "DELETE"}
+# Responses that never end or are meant to be streamed, not buffered
+STREAMING_VIEWS = (portfolio_events, project_events, export_project_ndjson)
+
+
+def _full_path(path: str) -> str:
+    return path if path.startswith(API_PREFIX) else API_PREFIX + path
+
+
+def _endpoint(app: Flask, sub: dict[str, Any]) -> str | None:
+    """The view a sub-request would be routed to, if any."""
+    adapter = app.url_map.bind("localhost")
+    try:
+        endpoint, _ = adapter.match(urlsplit(_full_path(sub["path"])).path, method=sub["method"])
+    except HTTPException:
+        return None
+    return endpoint
+
+
+def _dispatch(app: Flask, sub: dict[str, Any]) -> dict[str, Any]:
+    """Run one sub-request through the app and capture status and body."""
+    path = _full_path(sub["path"])
+
+    # The combined response is compressed as a whole, not each body in it
+    headers = {
+        k: v for k, v in (sub.get("headers") or {}).items()
+        if k.lower() != "accept-encoding"
+    }
+    builder = EnvironBuilder(
+        path=path,
+        method=sub["method"],
+        json=sub.get("body"),
+        headers=headers,
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    with app.request_context(environ):
+        try:
+            response = app.make_response(app.full_dispatch_request())
+        except Exception:
+            app.logger.exception("Batch sub-request %s %s failed", sub["method"], path)
+            response = app.make_response(
+                (jsonify({"error": "Internal server error", "code": 500}), 500)
+            )
+
+    if response.is_streamed:
+        # Frees whatever the stream holds (e.g. an event stream slot)
+        response.close()
+        return {
+            "id": sub["id"],
+            "status": 400,
+            "body": {"error": "Streaming responses cannot be batched", "code": 400},
+        }
+
+    body: Any = response.get_json(silent=True)
+    if body is None:
+        body = response.get_data(as_text=True) or None
+    return {"id": sub["id"], "status": response.status_code, "body": body}
+
+
+def _groups(subs: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Split sub-requests into execution groups, preserving order.
+
+    Consecutive GETs are independent and form one concurrent group; every
+    write is its own group so it observes the effects of earlier entries.
+    """
+    groups: list[list[dict[str, Any]]] = []
+    for sub in subs:
+        if sub["method"] == "GET" and groups and groups[-1][0]["method"] == "GET":
+            groups[-1].append(sub)
+        else:
+            groups.append([sub])
+    return groups
+
+
+def _validate(app: Flask, subs: Any, max_requests: int) -> str | None:
+    if not isinstance(subs, list) or not subs:
+        return "'requests' array is required"
+    if len(subs) > max_requests:
+        return f"At most {max_requests} sub-requests are allowed per batch"
+    for idx, sub in enumerate(subs):
+        if not isinstance(sub, dict) or not isinstance(sub.get("path"), str):
+            return f"Sub-request {idx} must have a 'path'"
+        sub["method"] = str(sub.get("method", "GET")).upper()
+        if sub["method"] not in VALID_BATCH_METHODS:
+            return f"Sub-request {idx} has unsupported method '{sub['method']}'"
+        view = app.view_functions.get(_endpoint(app, sub))
+        if view is run_batch:
+            return "Batch requests cannot be nested"
+        if view in STREAMING_VIEWS:
+            return f"Sub-request {idx} is a streaming endpoint and cannot be batched"
+        sub.setdefault("id", str(idx))
+    return None
+
+
+@batch_bp.route("/batch", methods=["POST"])
+def run_batch():
+    """Execute sub-requests and return `{responses: [{id, status, body}]}`.
+
+    Body: `{"requests": [{"id", "method", "path", "body", "headers"}]}`.
+    Paths may omit the /api/v1 prefix. Responses are returned in request
+    order, each with its own status code.
+    """
+    data = request.get_json(silent=True) or {}
+    subs = data.get("requests")
+
+    app = current_app._get_current_object()
+    err = _validate(app, subs, current_app.config["BATCH_MAX_REQUESTS"])
+    if err:
+        abort(400, description=err)
+
+    responses: list[dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=current_app.config["BATCH_MAX_WORKERS"]) as pool:
+        for group in _groups(subs):
+            responses.extend(pool.map(lambda sub: _dispatch(app, sub), group))
+
+    return jsonify({"responses": responses})
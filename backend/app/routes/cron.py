@@ -0,0 +1,35 @@
+"""Scheduled work for serverless deployments — /api/v1/cron/*
+
+Where no long-lived process runs the background work (Vercel), Vercel Cron
+calls these routes instead. They require `Authorization: Bearer
+<CRON_SECRET>`.
+"""
+
+import hmac
+import time
+
+from flask import Blueprint, current_app, jsonify, request
+
+from app.services.bulk_service import run_pending_jobs
+
+cron_bp = Blueprint("cron", __name__)
+
+
+def _authorized() -> bool:
+    secret = current_app.config["CRON_SECRET"]
+    supplied = request.headers.get("Authorization", "")
+    return bool(secret) and hmac.compare_digest(supplied, f"Bearer {secret}")
+
+
+@cron_bp.route("/cron/bulk-jobs", methods=["GET"])
+def run_bulk_jobs():
+    """Work through queued bulk jobs for up to BULK_JOB_CRON_SECONDS.
+
+    A job that is not finished by then goes back to the queue and the next
+    run resumes it.
+    """
+    if not _authorized():
+        return jsonify({"error": "Unauthorized", "code": 401}), 401
+    deadline = time.monotonic() + current_app.config["BULK_JOB_CRON_SECONDS"]
+    jobs = run_pending_jobs(current_app.config["BULK_JOB_LEASE_SECONDS"], deadline)
+    return jsonify({"jobs": jobs})
@@ -0,0 +1,31 @@
+"""Server-sent change feed — /api/v1/events and /api/v1/projects/<id>/events"""
+
+from flask import Blueprint, Response, jsonify, request
+
+from app.services.change_feed import open_stream
+
+events_bp = Blueprint("events", __name__)
+
+
+def _sse(project_id: str | None):
+    frames = open_stream(project_id, request.headers.get("Last-Event-ID"))
+    if frames is None:
+        error = "Too many open event streams — retry later"
+        return jsonify({"error": error, "code": 503}), 503, {"Retry-After": "5"}
+    return Response(
+        frames,
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@events_bp.route("/events", methods=["GET"])
+def portfolio_events():
+    """Stream change events for every project and scope."""
+    return _sse(None)
+
+
+@events_bp.route("/projects/<project_id>/events", methods=["GET"])
+def project_events(project_id: str):
+    """Stream change events for one project."""
+    return _sse(project_id)
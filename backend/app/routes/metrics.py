@@ -0,0 +1,13 @@
+"""Process metrics — /api/v1/metrics"""
+
+from flask import Blueprint, jsonify
+
+from app.utils.metrics import snapshot
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Counters collected by this process since it started."""
+    return jsonify({"metrics": snapshot()})
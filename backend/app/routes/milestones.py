@@ -1,7 +1,17 @@
 """Milestones, user stories, team members, and updates endpoints."""
 
+from datetime import datetime, timezone
+
 from flask import Blueprint, request, jsonify, abort
 from app.db import supabase
+from app.services.analytics_service import invalidate_milestone, invalidate_project
+from app.services.change_feed import project_for_milestone, publish
+from app.services.progress_service import adjust_story_counts
+from app.services.sync_service import record_deletion
+from app.services.schedule_service import propagate_dates
+from app.services.story_service import apply_operations, parse_operations
+from app.services.workload_service import invalidate_workload
+from app.utils.pagination import after_cursor, keyset_page, parse_page_args
 from app.utils.validators import (
     validate_required,
     validate_enum,
@@ -12,16 +22,32 @@ from app.utils.validators import (
 
 milestones_bp = Blueprint("milestones", __name__)
 
+# Rows of each collection embedded in GET /milestones/<id>; the rest are
+# fetched page by page
+MILESTONE_STORIES_LIMIT = 100
+MILESTONE_UPDATES_LIMIT = 20
+MAX_PAGE_LIMIT = 200
+
 
 # ── Milestones ──
 
 @milestones_bp.route("/milestones/<milestone_id>", methods=["GET"])
 def get_milestone(milestone_id: str):
-    """Single milestone with its user stories and updates."""
+    """Single milestone with its first user stories and latest updates.
+
+    Each embedded collection is limited inside the nested select and comes
+    with a `<collection>_next_cursor` for the load-more endpoints below.
+    """
     milestone = (
         supabase.table("milestones")
         .select("*, user_stories(*), updates(*)")
         .eq("id", milestone_id)
+        .order("order_index", foreign_table="user_stories")
+        .order("id", foreign_table="user_stories")
+        .limit(MILESTONE_STORIES_LIMIT + 1, foreign_table="user_stories")
+        .order("logged_at", desc=True, foreign_table="updates")
+        .order("id", desc=True, foreign_table="updates")
+        .limit(MILESTONE_UPDATES_LIMIT + 1, foreign_table="updates")
         .single()
         .execute()
     ).data
@@ -29,18 +55,48 @@ def get_milestone(milestone_id: str):
     if not milestone:
         abort(404, description="Milestone not found")
 
-    # Sort updates by logged_at descending
-    if milestone.get("updates"):
-        milestone["updates"] = sorted(
-            milestone["updates"], key=lambda u: u.get("logged_at", ""), reverse=True
-        )
-
+    milestone["user_stories"], milestone["user_stories_next_cursor"] = keyset_page(
+        milestone.get("user_stories") or [], MILESTONE_STORIES_LIMIT, "order_index"
+    )
+    milestone["updates"], milestone["updates_next_cursor"] = keyset_page(
+        milestone.get("updates") or [], MILESTONE_UPDATES_LIMIT, "logged_at"
+    )
     return jsonify({"milestone": milestone})
 
 
+@milestones_bp.route("/milestones/<milestone_id>/updates", methods=["GET"])
+def get_milestone_updates(milestone_id: str):
+    """Older updates of a milestone, newest first: `cursor=`, `limit=`."""
+    cursor, limit = parse_page_args(MILESTONE_UPDATES_LIMIT, MAX_PAGE_LIMIT)
+    q = supabase.table("updates").select("*").eq("milestone_id", milestone_id)
+    if cursor:
+        q = after_cursor(q, cursor, "logged_at")
+    rows = (
+        q.order("logged_at", desc=True).order("id", desc=True).limit(limit + 1).execute()
+    ).data
+    updates, next_cursor = keyset_page(rows, limit, "logged_at")
+    return jsonify({"updates": updates, "next_cursor": next_cursor})
+
+
+@milestones_bp.route("/milestones/<milestone_id>/user-stories", methods=["GET"])
+def get_milestone_user_stories(milestone_id: str):
+    """More user stories of a milestone, in order: `cursor=`, `limit=`."""
+    cursor, limit = parse_page_args(MILESTONE_STORIES_LIMIT, MAX_PAGE_LIMIT)
+    q = supabase.table("user_stories").select("*").eq("milestone_id", milestone_id)
+    if cursor:
+        q = after_cursor(q, cursor, "order_index", desc=False)
+    rows = (q.order("order_index").order("id").limit(limit + 1).execute()).data
+    stories, next_cursor = keyset_page(rows, limit, "order_index")
+    return jsonify({"user_stories": stories, "next_cursor": next_cursor})
+
+
 @milestones_bp.route("/milestones/<milestone_id>", methods=["PATCH"])
 def patch_milestone(milestone_id: str):
-    """Update status, progress_percent, due_date, assigned_to, name."""
+    """Update status, progress_percent, due_date, assigned_to, name.
+
+    progress_percent can only be set on milestones without user stories;
+    otherwise it is derived from them (409).
+    """
     data = request.get_json(silent=True) or {}
 
     if "status" in data:
@@ -55,12 +111,36 @@ def patch_milestone(milestone_id: str):
     allowed = {"status", "progress_percent", "due_date", "assigned_to", "name", "description"}
     filtered = {k: v for k, v in data.items() if k in allowed}
 
-    result = (
-        supabase.table("milestones").update(filtered).eq("id", milestone_id).execute()
-    )
+    query = supabase.table("milestones").update(filtered).eq("id", milestone_id)
+    if "progress_percent" in filtered:
+        # Progress is only set by hand until the milestone has user stories
+        query = query.eq("stories_total", 0)
+    result = query.execute()
     if not result.data:
+        exists = (
+            supabase.table("milestones").select("id").eq("id", milestone_id).execute()
+        ).data
+        if exists and "progress_percent" in filtered:
+            return jsonify({
+                "error": "progress_percent is derived from user stories for this milestone",
+                "code": 409,
+            }), 409
         abort(404, description="Milestone not found")
-    return jsonify({"milestone": result.data[0]})
+
+    milestone = result.data[0]
+    shifted = []
+    if "due_date" in filtered:
+        # Push dependent milestones later if the due date now overlaps them
+        shifted = propagate_dates(milestone["project_id"], milestone_id)
+
+    invalidate_project(milestone["project_id"])
+    invalidate_workload(milestone["project_id"])
+    publish("milestones", "update", milestone_id, milestone["project_id"], filtered)
+    for m in shifted:
+        publish("milestones", "update", m["id"], m["project_id"], {
+            "start_date": m["start_date"], "due_date": m["due_date"],
+        })
+    return jsonify({"milestone": milestone, "shifted_milestones": shifted})
 
 
 @milestones_bp.route("/milestones/<milestone_id>", methods=["DELETE"])
@@ -71,6 +151,22 @@ def delete_milestone(milestone_id: str):
     )
     if not result.data:
         abort(404, description="Milestone not found")
+    invalidate_project(result.data[0]["project_id"])
+    invalidate_workload(result.data[0]["project_id"])
+    record_deletion("milestones", milestone_id, result.data[0]["project_id"])
+    publish("milestones", "delete", milestone_id, result.data[0]["project_id"])
+    return jsonify({"success": True})
+
+
+@milestones_bp.route("/milestone-dependencies/<dependency_id>", methods=["DELETE"])
+def delete_milestone_dependency(dependency_id: str):
+    """Remove a dependency edge between two milestones."""
+    result = (
+        supabase.table("milestone_dependencies").delete().eq("id", dependency_id).execute()
+    )
+    if not result.data:
+        abort(404, description="Dependency not found")
+    publish("milestone_dependencies", "delete", dependency_id, result.data[0]["project_id"])
     return jsonify({"success": True})
 
 
@@ -103,12 +199,15 @@ def log_update(milestone_id: str):
     # Attach milestone name for frontend convenience
     milestone = (
         supabase.table("milestones")
-        .select("name")
+        .select("name, project_id")
         .eq("id", milestone_id)
         .single()
         .execute()
     ).data
     update["milestone_name"] = milestone["name"] if milestone else ""
+    if milestone:
+        invalidate_project(milestone["project_id"])
+        publish("updates", "insert", update["id"], milestone["project_id"], update)
 
     return jsonify({"update": update}), 201
 
@@ -117,7 +216,10 @@ def log_update(milestone_id: str):
 
 @milestones_bp.route("/user-stories/<story_id>", methods=["PATCH"])
 def patch_user_story(story_id: str):
-    """Toggle is_completed or update title/description."""
+    """Toggle is_completed or update title/description.
+
+    A toggle re-derives the milestone's progress, returned as `milestone`.
+    """
     data = request.get_json(silent=True) or {}
 
     allowed = {"is_completed", "title", "description"}
@@ -126,12 +228,61 @@ def patch_user_story(story_id: str):
     if not filtered:
         abort(400, description="No valid fields to update")
 
-    result = (
-        supabase.table("user_stories").update(filtered).eq("id", story_id).execute()
-    )
+    toggled = False
+    if "is_completed" in filtered:
+        filtered["completed_at"] = (
+            datetime.now(timezone.utc).isoformat() if filtered["is_completed"] else None
+        )
+        # Only a real change of state moves the counts
+        result = (
+            supabase.table("user_stories")
+            .update(filtered)
+            .eq("id", story_id)
+            .neq("is_completed", filtered["is_completed"])
+            .execute()
+        )
+        toggled = bool(result.data)
+        if not toggled:
+            # Already in that state: keep its completed_at, apply the rest
+            filtered = {
+                k: v for k, v in filtered.items() if k not in ("is_completed", "completed_at")
+            }
+
+    if not toggled:
+        query = supabase.table("user_stories")
+        query = query.update(filtered) if filtered else query.select("*")
+        result = query.eq("id", story_id).execute()
     if not result.data:
         abort(404, description="User story not found")
-    return jsonify({"user_story": result.data[0]})
+    story = result.data[0]
+
+    milestone = None
+    if toggled:
+        milestone = adjust_story_counts(
+            story.get("milestone_id"), completed_delta=1 if story["is_completed"] else -1
+        )
+    invalidate_milestone(story.get("milestone_id"))
+    if story.get("milestone_id") and filtered:
+        publish(
+            "user_stories", "update", story_id,
+            project_for_milestone(story["milestone_id"]), filtered,
+        )
+    return jsonify({"user_story": story, "milestone": milestone})
+
+
+@milestones_bp.route("/user-stories/bulk", methods=["POST"])
+def bulk_user_stories():
+    """Complete, edit, move or delete many user stories in one request.
+
+    Body: `{"ids": [...], "patch": {...}}` or `{"items": [{"id", ...}]}`.
+    Each result carries its own status; see story_service.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        ops = parse_operations(data)
+    except ValueError as e:
+        abort(400, description=str(e))
+    return jsonify(apply_operations(ops))
 
 
 @milestones_bp.route("/milestones/<milestone_id>/user-stories", methods=["POST"])
@@ -142,11 +293,16 @@ def create_user_story(milestone_id: str):
     if error:
         abort(400, description=error)
 
-    # Get max order_index
-    max_idx = 0
-    existing = supabase.table("user_stories").select("order_index").eq("milestone_id", milestone_id).execute().data
-    if existing:
-        max_idx = max((s.get("order_index", 0) or 0) for s in existing) + 1
+    # Append after the current last story
+    last = (
+        supabase.table("user_stories")
+        .select("order_index")
+        .eq("milestone_id", milestone_id)
+        .order("order_index", desc=True)
+        .limit(1)
+        .execute()
+    ).data
+    max_idx = (last[0].get("order_index") or 0) + 1 if last else 0
 
     story_data = {
         "milestone_id": milestone_id,
@@ -156,7 +312,13 @@ def create_user_story(milestone_id: str):
         "order_index": max_idx
     }
     result = supabase.table("user_stories").insert(story_data).execute()
-    return jsonify({"user_story": result.data[0]}), 201
+    milestone = adjust_story_counts(milestone_id, total_delta=1)
+    invalidate_milestone(milestone_id)
+    publish(
+        "user_stories", "insert", result.data[0]["id"],
+        project_for_milestone(milestone_id), result.data[0],
+    )
+    return jsonify({"user_story": result.data[0], "milestone": milestone}), 201
 
 
 @milestones_bp.route("/user-stories/<story_id>", methods=["DELETE"])
@@ -165,7 +327,17 @@ def delete_user_story(story_id: str):
     result = supabase.table("user_stories").delete().eq("id", story_id).execute()
     if not result.data:
         abort(404, description="User story not found")
-    return jsonify({"success": True})
+    story = result.data[0]
+    milestone_id = story.get("milestone_id")
+    milestone = adjust_story_counts(
+        milestone_id, total_delta=-1, completed_delta=-1 if story["is_completed"] else 0
+    )
+    invalidate_milestone(milestone_id)
+    if milestone_id:
+        project_id = project_for_milestone(milestone_id)
+        record_deletion("user_stories", story_id, project_id)
+        publish("user_stories", "delete", story_id, project_id)
+    return jsonify({"success": True, "milestone": milestone})
 
 
 # ── Team Members ──
@@ -186,6 +358,8 @@ def patch_team_member(member_id: str):
     )
     if not result.data:
         abort(404, description="Team member not found")
+    invalidate_workload(result.data[0]["project_id"])
+    publish("team_members", "update", member_id, result.data[0]["project_id"], filtered)
     return jsonify({"team_member": result.data[0]})
 
 
@@ -197,4 +371,7 @@ def delete_team_member(member_id: str):
     )
     if not result.data:
         abort(404, description="Team member not found")
+    invalidate_workload(result.data[0]["project_id"])
+    record_deletion("team_members", member_id, result.data[0]["project_id"])
+    publish("team_members", "delete", member_id, result.data[0]["project_id"])
     return jsonify({"success": True})
@@ -1,34 +1,112 @@
 """Projects endpoints — /api/v1/projects/*"""
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
-from flask import Blueprint, request, jsonify, abort
+from flask import Blueprint, Response, request, jsonify, abort, stream_with_context
 from app.db import supabase
+from app.services.analytics_service import invalidate_project
+from app.services.bulk_service import (
+    get_job,
+    parse_bulk,
+    set_projects_archived,
+    start_delete_job,
+)
+from app.services.change_feed import publish
+from app.services.schedule_service import add_dependency, compute_schedule
 from app.services.summary_service import generate_summary
+from app.services.sync_service import record_deletion
+from app.services.transfer_service import export_project, import_projects
+from app.services.workload_service import invalidate_workload
+from app.utils.etag import conditional
+from app.utils.fieldsets import (
+    MILESTONE_COLUMNS,
+    PROJECT_COLUMNS,
+    build_select,
+    parse_list_param,
+    truncate_fields,
+    validate_subset,
+    validate_truncate,
+)
+from app.utils.pagination import after_cursor, keyset_page, parse_page_args
 from app.utils.validators import (
     validate_required,
     validate_enum,
     VALID_PROJECT_STATUSES,
     VALID_SUMMARY_TONES,
+    VALID_UPDATE_TYPES,
 )
 
 projects_bp = Blueprint("projects", __name__)
 
+PROJECT_INCLUDES = {"team_members"}
+MILESTONE_INCLUDES = {"user_stories"}
+ACTIVITY_PAGE_SIZE = 50
+ACTIVITY_MAX_PAGE_SIZE = 200
+
+
+def _projects_version() -> list:
+    """Version of everything behind get_projects: the latest change to any
+    project, milestone or team member (`tree_updated_at`, bumped by
+    triggers) and the project count, which catches deletes. Health also
+    depends on today's date."""
+    result = (
+        supabase.table("projects")
+        .select("tree_updated_at", count="exact")
+        .order("tree_updated_at", desc=True)
+        .limit(1)
+        .execute()
+    )
+    latest = result.data[0]["tree_updated_at"] if result.data else None
+    return [date.today().isoformat(), latest, result.count]
+
+
+def _milestones_version(project_id: str) -> list:
+    """Row versions behind get_milestones."""
+    return (
+        supabase.table("milestones")
+        .select("id, updated_at, user_stories(id, updated_at)")
+        .eq("project_id", project_id)
+        .order("id")
+        .execute()
+    ).data
+
 
 @projects_bp.route("/projects", methods=["GET"])
+@conditional(_projects_version)
 def get_projects():
-    """List all active projects with progress summary."""
+    """List all active projects with progress summary.
+
+    Optional `fields=` limits project columns, `include=team_members` (the
+    default) embeds the team, and `truncate=N` shortens descriptions.
+    """
+    fields = parse_list_param(request.args.get("fields"))
+    include = parse_list_param(request.args.get("include"))
+    truncate = request.args.get("truncate", type=int)
+    err = (
+        validate_subset(fields, PROJECT_COLUMNS, "fields")
+        or validate_subset(include, PROJECT_INCLUDES, "include")
+        or validate_truncate(truncate)
+    )
+    if err:
+        abort(400, description=err)
+    include = ["team_members"] if include is None else include
+
+    embeds = ["milestones(id, status, progress_percent, due_date, assigned_to)"]
+    if "team_members" in include:
+        embeds.append("team_members(id, name, avatar_color)")
+
     projects = (
         supabase.table("projects")
-        .select("*, milestones(id, status, progress_percent, due_date, assigned_to), team_members(id, name, avatar_color)")
+        .select(build_select(fields, embeds))
         .order("created_at", desc=True)
         .execute()
     ).data
+    truncate_fields(projects, ("description",), truncate)
 
     cards = []
     for p in projects:
         ms = p.pop("milestones", []) or []
-        team = p.pop("team_members", []) or []
+        team = p.pop("team_members", None)
         total = len(ms)
         completed = sum(1 for m in ms if m["status"] == "completed")
         progress = (
@@ -56,19 +134,33 @@ def get_projects():
         )
         next_due = upcoming[0]["due_date"] if upcoming else None
 
-        cards.append({
+        card = {
             **p,
             "milestone_count": total,
             "completed_milestones": completed,
             "progress_percent": progress,
             "health": health,
             "next_due_date": next_due,
-            "team_members": team,
-        })
+        }
+        if "team_members" in include:
+            card["team_members"] = team or []
+        cards.append(card)
 
     return jsonify({"projects": cards})
 
 
+@projects_bp.route("/projects/import", methods=["POST"])
+def import_project_ndjson():
+    """Bulk import projects from an NDJSON export (streamed request body)."""
+    try:
+        result = import_projects(request.stream)
+    except ValueError as e:
+        abort(400, description=str(e))
+    for p in result["projects"]:
+        publish("projects", "insert", p["id"], p["id"], p)
+    return jsonify(result), 201
+
+
 @projects_bp.route("/projects/<project_id>", methods=["GET"])
 def get_project(project_id: str):
     """Full project detail: milestones, team, recent updates."""
@@ -86,6 +178,23 @@ def get_project(project_id: str):
     return jsonify({"project": project})
 
 
+@projects_bp.route("/projects/<project_id>/export", methods=["GET"])
+def export_project_ndjson(project_id: str):
+    """Stream the project and all related rows as NDJSON."""
+    try:
+        lines = export_project(project_id)
+    except ValueError:
+        abort(404, description="Project not found")
+
+    return Response(
+        stream_with_context(lines),
+        mimetype="application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="project-{project_id}.ndjson"'
+        },
+    )
+
+
 @projects_bp.route("/projects/<project_id>", methods=["PATCH"])
 def patch_project(project_id: str):
     """Update name, description, status, start_date."""
@@ -104,19 +213,41 @@ def patch_project(project_id: str):
     )
     if not result.data:
         abort(404, description="Project not found")
+    invalidate_project(project_id)
+    invalidate_workload(project_id)
+    publish("projects", "update", project_id, project_id, filtered)
     return jsonify({"project": result.data[0]})
 
 
 @projects_bp.route("/projects/<project_id>/milestones", methods=["GET"])
+@conditional(_milestones_version)
 def get_milestones(project_id: str):
-    """All milestones for a project, ordered by order_index."""
+    """All milestones for a project, ordered by order_index.
+
+    Optional `fields=` limits milestone columns, `include=user_stories` (the
+    default) embeds stories, and `truncate=N` shortens descriptions.
+    """
+    fields = parse_list_param(request.args.get("fields"))
+    include = parse_list_param(request.args.get("include"))
+    truncate = request.args.get("truncate", type=int)
+    err = (
+        validate_subset(fields, MILESTONE_COLUMNS, "fields")
+        or validate_subset(include, MILESTONE_INCLUDES, "include")
+        or validate_truncate(truncate)
+    )
+    if err:
+        abort(400, description=err)
+    include = ["user_stories"] if include is None else include
+
+    embeds = ["user_stories(*)"] if "user_stories" in include else []
     milestones = (
         supabase.table("milestones")
-        .select("*, user_stories(*)")
+        .select(build_select(fields, embeds))
         .eq("project_id", project_id)
         .order("order_index")
         .execute()
     ).data
+    truncate_fields(milestones, ("description",), truncate)
 
     return jsonify({"milestones": milestones})
 
@@ -134,10 +265,56 @@ def reorder_milestones(project_id: str):
         supabase.table("milestones").update(
             {"order_index": item["order_index"]}
         ).eq("id", item["id"]).eq("project_id", project_id).execute()
+        publish("milestones", "update", item["id"], project_id, {
+            "order_index": item["order_index"],
+        })
 
     return jsonify({"success": True})
 
 
+@projects_bp.route("/projects/<project_id>/schedule", methods=["GET"])
+def get_schedule(project_id: str):
+    """Milestone dependency graph with slack and the critical path."""
+    try:
+        schedule = compute_schedule(project_id)
+    except ValueError as e:
+        abort(400, description=str(e))
+    return jsonify({"schedule": schedule})
+
+
+@projects_bp.route("/projects/<project_id>/dependencies", methods=["POST"])
+def create_dependency(project_id: str):
+    """Make `milestone_id` start after `depends_on_id` finishes (+ lag_days)."""
+    data = request.get_json(silent=True) or {}
+    error = validate_required(data, ["milestone_id", "depends_on_id"])
+    if error:
+        abort(400, description=error)
+
+    lag_days = data.get("lag_days", 0)
+    if not isinstance(lag_days, int) or lag_days < 0:
+        abort(400, description="'lag_days' must be a non-negative integer")
+
+    try:
+        dependency = add_dependency(
+            project_id, data["milestone_id"], data["depends_on_id"], lag_days=lag_days
+        )
+    except ValueError as e:
+        abort(400, description=str(e))
+
+    if dependency["shifted_milestones"]:
+        invalidate_project(project_id)
+    publish("milestone_dependencies", "insert", dependency["id"], project_id, {
+        "milestone_id": dependency["milestone_id"],
+        "depends_on_id": dependency["depends_on_id"],
+        "lag_days": dependency["lag_days"],
+    })
+    for m in dependency["shifted_milestones"]:
+        publish("milestones", "update", m["id"], project_id, {
+            "start_date": m["start_date"], "due_date": m["due_date"],
+        })
+    return jsonify({"dependency": dependency}), 201
+
+
 @projects_bp.route("/projects/<project_id>/updates", methods=["GET"])
 def get_project_updates(project_id: str):
     """Paginated activity feed — all updates across all milestones."""
@@ -175,9 +352,56 @@ def get_project_updates(project_id: str):
     return jsonify({"updates": updates, "page": page, "per_page": per_page})
 
 
+@projects_bp.route("/updates", methods=["GET"])
+def get_portfolio_updates():
+    """Activity feed across all projects, newest first.
+
+    Filters: `update_type=` and `project_status=` (comma-separated). Pages
+    by (logged_at, id) with `cursor=` / `limit=`.
+    """
+    cursor, limit = parse_page_args(ACTIVITY_PAGE_SIZE, ACTIVITY_MAX_PAGE_SIZE)
+    update_types = parse_list_param(request.args.get("update_type"))
+    statuses = parse_list_param(request.args.get("project_status"))
+    err = validate_subset(update_types, VALID_UPDATE_TYPES, "update_type") or validate_subset(
+        statuses, VALID_PROJECT_STATUSES, "project_status"
+    )
+    if err:
+        abort(400, description=err)
+
+    def page_query(status: str | None):
+        q = supabase.table("updates").select("*, milestones(name, projects(name))")
+        if status:
+            q = q.eq("project_status", status)
+        if update_types:
+            q = q.in_("update_type", update_types)
+        if cursor:
+            q = after_cursor(q, cursor, "logged_at")
+        return q.order("logged_at", desc=True).order("id", desc=True).limit(limit + 1)
+
+    # project_status is denormalized onto updates, so each status reads its
+    # own (project_status, logged_at, id) index range; several statuses are
+    # read separately and merged rather than sorted in the database
+    if not statuses:
+        rows = page_query(None).execute().data
+    else:
+        rows = [r for status in statuses for r in page_query(status).execute().data]
+        rows.sort(key=lambda r: (datetime.fromisoformat(r["logged_at"]), r["id"]), reverse=True)
+    updates, next_cursor = keyset_page(rows[:limit + 1], limit, "logged_at")
+
+    for u in updates:
+        milestone = u.pop("milestones")
+        u["milestone_name"] = milestone["name"]
+        u["project_name"] = milestone["projects"]["name"]
+    return jsonify({"updates": updates, "next_cursor": next_cursor})
+
+
 @projects_bp.route("/projects/<project_id>/summary", methods=["POST"])
 def create_summary(project_id: str):
-    """Generate AI weekly summary."""
+    """Generate AI weekly summary.
+
+    Returns 200 with the stored summary when nothing changed since it was
+    generated; `extend: true` revises the previous summary with new updates.
+    """
     data = request.get_json(silent=True) or {}
     tone = data.get("tone", "executive")
 
@@ -186,8 +410,10 @@ def create_summary(project_id: str):
         abort(400, description=err)
 
     try:
-        summary = generate_summary(project_id, tone)
-        return jsonify({"summary": summary}), 201
+        summary = generate_summary(project_id, tone, extend=bool(data.get("extend")))
+        if not summary["reused"]:
+            publish("summaries", "insert", summary["id"], project_id, {"tone": tone})
+        return jsonify({"summary": summary}), 200 if summary["reused"] else 201
     except RuntimeError as e:
         return jsonify({"error": str(e), "code": 500}), 500
 
@@ -294,6 +520,8 @@ def add_team_member(project_id: str):
     }
 
     result = supabase.table("team_members").insert(member_data).execute()
+    invalidate_workload(project_id)
+    publish("team_members", "insert", result.data[0]["id"], project_id, result.data[0])
     return jsonify({"team_member": result.data[0]}), 201
 @projects_bp.route("/projects/<project_id>", methods=["DELETE"])
 def delete_project(project_id: str):
@@ -301,9 +529,39 @@ def delete_project(project_id: str):
     result = supabase.table("projects").delete().eq("id", project_id).execute()
     if not result.data:
         abort(404, description="Project not found")
+    invalidate_project(project_id)
+    invalidate_workload(project_id)
+    record_deletion("projects", project_id, project_id)
+    publish("projects", "delete", project_id, project_id)
     return jsonify({"success": True})
 
 
+@projects_bp.route("/projects/bulk", methods=["POST"])
+def bulk_projects():
+    """Archive, unarchive or delete many projects: `{ids, action}`.
+
+    Archive/unarchive return per-item results. Delete returns 202 with a
+    job to poll at /bulk-jobs/<id>.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        ids, action = parse_bulk(data)
+    except ValueError as e:
+        abort(400, description=str(e))
+    if action == "delete":
+        return jsonify({"job": start_delete_job("projects", ids)}), 202
+    return jsonify({"results": set_projects_archived(ids, action == "archive")})
+
+
+@projects_bp.route("/bulk-jobs/<job_id>", methods=["GET"])
+def get_bulk_job(job_id: str):
+    """Progress and per-item results of a bulk delete."""
+    job = get_job(job_id)
+    if not job:
+        abort(404, description="Job not found")
+    return jsonify({"job": job})
+
+
 @projects_bp.route("/projects/<project_id>/milestones", methods=["POST"])
 def create_milestone(project_id: str):
     """Create a new manual milestone for a project."""
@@ -328,4 +586,6 @@ def create_milestone(project_id: str):
         "order_index": max_idx
     }
     result = supabase.table("milestones").insert(ms_data).execute()
+    invalidate_project(project_id)
+    publish("milestones", "insert", result.data[0]["id"], project_id, result.data[0])
     return jsonify({"milestone": result.data[0]}), 201
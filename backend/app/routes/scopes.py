@@ -1,31 +1,125 @@
 """Scopes endpoints — /api/v1/scopes/*"""
 
 from flask import Blueprint, request, jsonify, abort
+from app.services.bulk_service import parse_bulk, set_scopes_archived, start_delete_job
 from app.services.scope_service import (
     create_scope,
     get_scope,
+    list_epic_stories,
     list_scopes,
+    scope_version,
+    scopes_version,
     update_scope,
     archive_scope,
     convert_scope_to_project,
+    regenerate_epic,
+    REUSE_MODES,
+    SCOPE_INCLUDES,
+    SCOPE_MAX_PAGE_SIZE,
+    SCOPE_PAGE_SIZE,
+    SCOPE_STORIES_PER_EPIC,
 )
+from app.services.similarity_service import find_similar
+from app.utils.etag import conditional
+from app.utils.fieldsets import (
+    SCOPE_COLUMNS,
+    parse_list_param,
+    validate_subset,
+    validate_truncate,
+)
+from app.utils.idempotency import idempotent
+from app.utils.pagination import parse_page_args
 from app.utils.validators import validate_required, validate_enum, VALID_SCOPE_STATUSES
 
 scopes_bp = Blueprint("scopes", __name__)
 
 
+def _library_params() -> dict:
+    """Validated status / prefix / cursor / limit args of GET /scopes."""
+    status = request.args.get("status")
+    err = validate_enum(status, VALID_SCOPE_STATUSES, "status")
+    if err:
+        abort(400, description=err)
+    cursor, limit = parse_page_args(SCOPE_PAGE_SIZE, SCOPE_MAX_PAGE_SIZE)
+    return {
+        "status": status,
+        "prefix": request.args.get("prefix", "").strip() or None,
+        "cursor": cursor,
+        "limit": limit,
+    }
+
+
+def _scopes_version():
+    return scopes_version(**_library_params())
+
+
 @scopes_bp.route("/scopes", methods=["GET"])
+@conditional(_scopes_version)
 def get_scopes():
-    """List all scopes — returns id, product_name, status, created_at."""
-    scopes = list_scopes()
-    return jsonify({"scopes": scopes})
+    """List scopes newest first — returns id, product_name, status, created_at.
+
+    Filters: `status=`, `prefix=` (case-insensitive product name prefix).
+    Pages of `limit=` (default 50, max 200); pass `next_cursor` back as
+    `cursor=` for the next page. Optional `fields=` selects other columns;
+    `truncate=N` shortens idea_text.
+    """
+    fields = parse_list_param(request.args.get("fields"))
+    truncate = request.args.get("truncate", type=int)
+    err = validate_subset(fields, SCOPE_COLUMNS, "fields") or validate_truncate(truncate)
+    if err:
+        abort(400, description=err)
+
+    page = list_scopes(fields, truncate=truncate, **_library_params())
+    return jsonify(page)
 
 
 @scopes_bp.route("/scopes/generate", methods=["POST"])
+@idempotent("scopes.generate")
 def generate_scope():
-    """Receive idea text + context, call LLM, persist full scope."""
+    """Receive idea text + context, call LLM, persist full scope.
+
+    `reuse: "clone" | "example"` reuses the most similar existing scope
+    instead of, or as an example for, the LLM call. Honors
+    `Idempotency-Key`; concurrent identical requests share one LLM call.
+    """
     data = request.get_json(silent=True) or {}
+    _validate_idea(data)
+    err = validate_enum(data.get("reuse"), REUSE_MODES, "reuse")
+    if err:
+        abort(400, description=err)
 
+    try:
+        scope = create_scope(
+            product_name=data["product_name"],
+            idea_text=data["idea_text"],
+            target_audience=data.get("target_audience"),
+            budget_range=data.get("budget_range"),
+            timeline_pressure=data.get("timeline_pressure"),
+            reuse=data.get("reuse") or "off",
+        )
+        return jsonify({"scope": scope}), 201
+    except RuntimeError as e:
+        return jsonify({"error": str(e), "code": 500}), 500
+
+
+@scopes_bp.route("/scopes/similar", methods=["POST"])
+def similar_scopes():
+    """Existing scopes most similar to an idea (same body as generate).
+
+    `limit` defaults to 5, max 20.
+    """
+    data = request.get_json(silent=True) or {}
+    _validate_idea(data)
+    limit = data.get("limit", 5)
+    if not isinstance(limit, int) or not 1 <= limit <= 20:
+        abort(400, description="limit must be an integer between 1 and 20")
+
+    matches = find_similar(data, limit)
+    return jsonify({"scopes": matches})
+
+
+def _validate_idea(data: dict) -> None:
+    """Abort with 400 unless `data` is a valid generate request body."""
     error = validate_required(data, ["product_name", "idea_text"])
     if error:
         abort(400, description=error)
@@ -39,23 +133,26 @@ def generate_scope():
         if err:
             abort(400, description=err)
 
-    try:
-        scope = create_scope(
-            product_name=data["product_name"],
-            idea_text=data["idea_text"],
-            target_audience=data.get("target_audience"),
-            budget_range=data.get("budget_range"),
-            timeline_pressure=data.get("timeline_pressure"),
-        )
-        return jsonify({"scope": scope}), 201
-    except RuntimeError as e:
-        return jsonify({"error": str(e), "code": 500}), 500
-
 
 @scopes_bp.route("/scopes/<scope_id>", methods=["GET"])
+@conditional(scope_version)
 def get_scope_by_id(scope_id: str):
-    """Return full scope including epics and user stories."""
-    scope = get_scope(scope_id)
+    """Return full scope including epics and user stories.
+
+    `fields=` limits scope columns; `include=` picks from epics,
+    user_stories and ai_output_raw (default: epics,user_stories). Each epic
+    embeds its first 50 stories; the rest are paged from
+    /scopes/<id>/epics/<epic_id>/user-stories.
+    """
+    fields = parse_list_param(request.args.get("fields"))
+    include = parse_list_param(request.args.get("include"))
+    err = validate_subset(fields, SCOPE_COLUMNS, "fields") or validate_subset(
+        include, SCOPE_INCLUDES, "include"
+    )
+    if err:
+        abort(400, description=err)
+
+    scope = get_scope(scope_id, fields, include)
     if not scope:
         abort(404, description="Scope not found")
     return jsonify({"scope": scope})
@@ -78,8 +175,12 @@ def patch_scope(scope_id: str):
 
 
 @scopes_bp.route("/scopes/<scope_id>/convert", methods=["POST"])
+@idempotent("scopes.convert", flight_key=lambda scope_id: scope_id)
 def convert_scope(scope_id: str):
-    """Convert scope to project — creates project + milestones + user stories."""
+    """Convert scope to project — creates project + milestones + user stories.
+
+    Honors `Idempotency-Key`; concurrent conversions of one scope share a result.
+    """
     data = request.get_json(silent=True) or {}
 
     try:
@@ -91,6 +192,63 @@ def convert_scope(scope_id: str):
         abort(400, description=str(e))
 
 
+@scopes_bp.route("/scopes/<scope_id>/epics/<epic_id>/regenerate", methods=["POST"])
+@idempotent("scopes.regenerate_epic", flight_key=lambda scope_id, epic_id: epic_id)
+def regenerate_scope_epic(scope_id: str, epic_id: str):
+    """Regenerate one epic — or only its stories with `mode: "stories"` —
+    using the rest of the scope as context. Optional `instructions` are
+    passed to the LLM as reviewer feedback.
+    """
+    data = request.get_json(silent=True) or {}
+    mode = data.get("mode", "epic")
+    err = validate_enum(mode, {"epic", "stories"}, "mode")
+    if err:
+        abort(400, description=err)
+
+    try:
+        epic = regenerate_epic(
+            scope_id,
+            epic_id,
+            stories_only=mode == "stories",
+            instructions=data.get("instructions"),
+        )
+    except LookupError as e:
+        return jsonify({"error": str(e), "code": 404}), 404
+    except ValueError as e:
+        abort(400, description=str(e))
+    except RuntimeError as e:
+        return jsonify({"error": str(e), "code": 500}), 500
+    return jsonify({"epic": epic})
+
+
+@scopes_bp.route("/scopes/<scope_id>/epics/<epic_id>/user-stories", methods=["GET"])
+def get_epic_user_stories(scope_id: str, epic_id: str):
+    """More user stories of an epic, in order: `cursor=`, `limit=`."""
+    cursor, limit = parse_page_args(SCOPE_STORIES_PER_EPIC, SCOPE_MAX_PAGE_SIZE)
+    try:
+        page = list_epic_stories(scope_id, epic_id, cursor, limit)
+    except LookupError as e:
+        return jsonify({"error": str(e), "code": 404}), 404
+    return jsonify(page)
+
+
+@scopes_bp.route("/scopes/bulk", methods=["POST"])
+def bulk_scopes():
+    """Archive, unarchive or delete many scopes: `{ids, action}`.
+
+    Archive/unarchive return per-item results. Delete (scopes without a
+    project only) returns 202 with a job to poll at /bulk-jobs/<id>.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        ids, action = parse_bulk(data)
+    except ValueError as e:
+        abort(400, description=str(e))
+    if action == "delete":
+        return jsonify({"job": start_delete_job("scopes", ids)}), 202
+    return jsonify({"results": set_scopes_archived(ids, action == "archive")})
+
+
 @scopes_bp.route("/scopes/<scope_id>", methods=["DELETE"])
 def delete_scope(scope_id: str):
     """Soft delete — set status to archived."""
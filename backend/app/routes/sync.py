@@ -0,0 +1,20 @@
+"""Delta sync endpoint — /api/v1/sync"""
+
+from flask import Blueprint, jsonify, request, abort
+
+from app.services.sync_service import sync
+
+sync_bp = Blueprint("sync", __name__)
+
+
+@sync_bp.route("/sync", methods=["GET"])
+def get_sync():
+    """Rows created, updated or deleted since `since` (all rows if omitted).
+
+    Optional `project_id` limits the sync to one project and its children.
+    """
+    try:
+        result = sync(request.args.get("since"), request.args.get("project_id"))
+    except ValueError as e:
+        abort(400, description=str(e))
+    return jsonify(result)
@@ -0,0 +1,292 @@
+"""Burndown, velocity and forecast analytics computed over columnar NumPy
+arrays, cached per project in-process."""
+
+import threading
+import time
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+from app.db import supabase
+from app.services.change_feed import project_for_milestone
+from app.utils.pagination import paged
+
+CACHE_TTL_SECONDS = 300
+VELOCITY_WINDOW_DAYS = 7
+FORECAST_WINDOW_DAYS = 14
+
+_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+_milestone_projects: dict[str, str] = {}
+_portfolio: tuple[float, dict[str, Any]] | None = None
+_lock = threading.Lock()
+
+
+# ── Cache ──
+
+def invalidate_project(project_id: str) -> None:
+    """Drop cached analytics for a project (and the portfolio rollup)."""
+    global _portfolio
+    with _lock:
+        _cache.pop(project_id, None)
+        _portfolio = None
+
+
+def invalidate_milestone(milestone_id: str | None) -> None:
+    """Drop cached analytics for the project owning a milestone."""
+    if not milestone_id:
+        return
+    project_id = _milestone_projects.get(milestone_id)
+    if project_id is None:
+        # Milestones never change project, so the answer can be kept
+        project_id = project_for_milestone(milestone_id)
+        if project_id is None:
+            return
+        with _lock:
+            _milestone_projects[milestone_id] = project_id
+    invalidate_project(project_id)
+
+
+def _cached(project_id: str) -> dict[str, Any] | None:
+    entry = _cache.get(project_id)
+    if entry and time.monotonic() - entry[0] < CACHE_TTL_SECONDS:
+        return entry[1]
+    return None
+
+
+# ── Loading ──
+
+def _to_days(values: list[str | None]) -> np.ndarray:
+    """ISO date/timestamp strings → datetime64[D] (NaT for missing)."""
+    return np.array([v[:10] if v else "NaT" for v in values], dtype="datetime64[D]")
+
+
+def _history(
+    project: dict[str, Any],
+    milestones: list[dict[str, Any]],
+    stories: list[dict[str, Any]],
+    updates: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Column arrays for one project's milestones, stories and updates."""
+    start = (project.get("start_date") or project["created_at"])[:10]
+    # Stories completed before completed_at was tracked count as done from
+    # the start of their milestone (or of the project)
+    milestone_starts = {m["id"]: m.get("start_date") for m in milestones}
+    completed = np.array([bool(s["is_completed"]) for s in stories], dtype=bool)
+    completed_on = _to_days([
+        s.get("completed_at") or milestone_starts.get(s["milestone_id"]) or start
+        for s in stories
+    ])
+    return {
+        "start": np.datetime64(start, "D"),
+        "due_dates": _to_days([m.get("due_date") for m in milestones]),
+        "completed": completed,
+        "completed_on": completed_on,
+        "logged_on": _to_days([u["logged_at"] for u in updates]),
+    }
+
+
+def _load_history(project_id: str) -> dict[str, Any]:
+    """Load the project's stories and updates; raises LookupError if the
+    project does not exist."""
+    row = (
+        supabase.table("projects")
+        .select("id, start_date, created_at")
+        .eq("id", project_id)
+        .maybe_single()
+        .execute()
+    )
+    if not row or not row.data:
+        raise LookupError("Project not found")
+    milestones = (
+        supabase.table("milestones")
+        .select("id, start_date, due_date")
+        .eq("project_id", project_id)
+        .execute()
+    ).data
+    milestone_ids = [m["id"] for m in milestones]
+    with _lock:
+        _milestone_projects.update((mid, project_id) for mid in milestone_ids)
+
+    stories: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    if milestone_ids:
+        stories = list(paged(
+            lambda: supabase.table("user_stories")
+            .select("id, milestone_id, is_completed, completed_at")
+            .in_("milestone_id", milestone_ids)
+            .order("id")
+        ))
+        updates = list(paged(
+            lambda: supabase.table("updates")
+            .select("id, logged_at")
+            .in_("milestone_id", milestone_ids)
+            .order("id")
+        ))
+    return _history(row.data, milestones, stories, updates)
+
+
+def _load_active_histories() -> dict[str, dict[str, Any]]:
+    """Histories of every active project, in four queries whatever the
+    number of projects."""
+    projects = list(paged(
+        lambda: supabase.table("projects")
+        .select("id, start_date, created_at")
+        .eq("status", "active")
+        .order("id")
+    ))
+    milestones = list(paged(
+        lambda: supabase.table("milestones")
+        .select("id, project_id, start_date, due_date, projects!inner(status)")
+        .eq("projects.status", "active")
+        .order("id")
+    ))
+    # Children are matched to projects through the milestones read above;
+    # rows of milestones created since are left out
+    stories = list(paged(
+        lambda: supabase.table("user_stories")
+        .select("id, milestone_id, is_completed, completed_at, milestones!inner(projects!inner(status))")
+        .eq("milestones.projects.status", "active")
+        .order("id")
+    ))
+    updates = list(paged(
+        lambda: supabase.table("updates")
+        .select("id, milestone_id, logged_at, milestones!inner(projects!inner(status))")
+        .eq("milestones.projects.status", "active")
+        .order("id")
+    ))
+
+    owner = {m["id"]: m["project_id"] for m in milestones}
+    with _lock:
+        _milestone_projects.update(owner)
+    grouped: dict[str, tuple[list, list, list]] = {p["id"]: ([], [], []) for p in projects}
+    for m in milestones:
+        if m["project_id"] in grouped:
+            grouped[m["project_id"]][0].append(m)
+    for i, rows in ((1, stories), (2, updates)):
+        for row in rows:
+            group = grouped.get(owner.get(row["milestone_id"]))
+            if group is not None:
+                group[i].append(row)
+    return {p["id"]: _history(p, *grouped[p["id"]]) for p in projects}
+
+
+# ── Computation ──
+
+def _daily_counts(days: np.ndarray, start: np.datetime64, n_days: int) -> np.ndarray:
+    """Histogram of dates into n_days daily buckets starting at `start`."""
+    days = days[~np.isnat(days)]
+    offsets = (days - start).astype(np.int64)
+    offsets = np.clip(offsets, 0, n_days - 1)
+    return np.bincount(offsets, minlength=n_days)
+
+
+def _compute(history: dict[str, Any], today: np.datetime64) -> dict[str, Any]:
+    start = min(history["start"], today)
+    n_days = int((today - start).astype(np.int64)) + 1
+    dates = start + np.arange(n_days)
+
+    total = int(history["completed"].size)
+    completed_per_day = _daily_counts(
+        history["completed_on"][history["completed"]], start, n_days
+    )
+    remaining = total - np.cumsum(completed_per_day)
+    updates_per_day = _daily_counts(history["logged_on"], start, n_days)
+
+    # Rolling stories-per-week velocity
+    kernel = np.ones(VELOCITY_WINDOW_DAYS)
+    velocity = np.convolve(completed_per_day, kernel)[:n_days]
+
+    recent = completed_per_day[-FORECAST_WINDOW_DAYS:]
+    daily_rate = float(recent.mean()) if recent.size else 0.0
+    remaining_now = int(remaining[-1])
+    projected = None
+    if remaining_now == 0 and total:
+        projected = str(dates[np.flatnonzero(remaining == 0)[0]])
+    elif daily_rate > 0:
+        projected = str(today + int(np.ceil(remaining_now / daily_rate)))
+
+    due = history["due_dates"][~np.isnat(history["due_dates"])]
+    return {
+        "start_date": str(start),
+        "dates": np.datetime_as_string(dates).tolist(),
+        "remaining": remaining.tolist(),
+        "completed_per_day": completed_per_day.tolist(),
+        "velocity_7d": velocity.astype(int).tolist(),
+        "updates_per_day": updates_per_day.tolist(),
+        "total_stories": total,
+        "completed_stories": total - remaining_now,
+        "avg_daily_velocity": round(daily_rate, 3),
+        "projected_finish_date": projected,
+        "planned_finish_date": str(due.max()) if due.size else None,
+    }
+
+
+def get_project_analytics(project_id: str) -> dict[str, Any]:
+    """Burndown, velocity and forecast for one project (cached).
+
+    Raises LookupError for an unknown project.
+    """
+    cached = _cached(project_id)
+    if cached is not None:
+        return cached
+
+    result = {
+        "project_id": project_id,
+        **_compute(_load_history(project_id), np.datetime64(date.today(), "D")),
+    }
+    with _lock:
+        _cache[project_id] = (time.monotonic(), result)
+    return result
+
+
+def get_portfolio_analytics() -> dict[str, Any]:
+    """Per-project forecasts plus portfolio-wide burndown and velocity."""
+    global _portfolio
+    if _portfolio and time.monotonic() - _portfolio[0] < CACHE_TTL_SECONDS:
+        return _portfolio[1]
+
+    today = np.datetime64(date.today(), "D")
+    per_project = [
+        {"project_id": pid, **_compute(history, today)}
+        for pid, history in _load_active_histories().items()
+    ]
+
+    if per_project:
+        start = min(np.datetime64(a["start_date"], "D") for a in per_project)
+    else:
+        start = today
+    n_days = int((today - start).astype(np.int64)) + 1
+
+    # Align every project's series on the portfolio calendar and sum them
+    remaining = np.zeros(n_days, dtype=np.int64)
+    completed = np.zeros(n_days, dtype=np.int64)
+    for a in per_project:
+        offset = int((np.datetime64(a["start_date"], "D") - start).astype(np.int64))
+        series = np.asarray(a["remaining"], dtype=np.int64)
+        # Before a project starts, all of its stories are still remaining
+        remaining[:offset] += a["total_stories"]
+        remaining[offset:] += series
+        completed[offset:] += np.asarray(a["completed_per_day"], dtype=np.int64)
+
+    velocity = np.convolve(completed, np.ones(VELOCITY_WINDOW_DAYS))[:n_days]
+    result = {
+        "start_date": str(start),
+        "dates": np.datetime_as_string(start + np.arange(n_days)).tolist(),
+        "remaining": remaining.tolist(),
+        "velocity_7d": velocity.astype(int).tolist(),
+        "projects": [
+            {
+                k: a[k]
+                for k in (
+                    "project_id", "total_stories", "completed_stories",
+                    "avg_daily_velocity", "projected_finish_date",
+                    "planned_finish_date",
+                )
+            }
+            for a in per_project
+        ],
+    }
+    with _lock:
+        _portfolio = (time.monotonic(), result)
+    return result
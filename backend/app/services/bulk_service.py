@@ -0,0 +1,332 @@
+"""Bulk archive, unarchive and delete of scopes and projects.
+
+Archive and unarchive are one conditional update per target status and run
+in the request. Deletes run as a background job: the request validates the
+IDs and records a queued `bulk_jobs` row, and the job runner in the
+background-work process (see `start_job_runner`) deletes the items one by
+one, writing each result back to the row so any API process can report
+progress.
+
+A runner holds a job by its heartbeat: every progress write is conditional
+on the heartbeat it last wrote and renews it. A job whose heartbeat is
+older than the lease (its runner died or was restarted) is claimed again
+and resumed after the items that already have a result, up to
+MAX_JOB_ATTEMPTS times.
+
+A project's updates and milestones are deleted a few milestones at a time
+before the project row itself, so no single statement cascades through a
+whole large project.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from app.db import supabase
+from app.services import similarity_service
+from app.services.analytics_service import invalidate_project
+from app.services.change_feed import publish
+from app.services.sync_service import record_deletions
+from app.services.workload_service import invalidate_workload
+
+logger = logging.getLogger(__name__)
+
+MAX_BULK_ITEMS = 200
+BULK_ACTIONS = {"archive", "unarchive", "delete"}
+MILESTONE_CHUNK = 20
+MAX_JOB_ATTEMPTS = 3
+
+
+def parse_bulk(data: dict[str, Any]) -> tuple[list[str], str]:
+    """Validated `(ids, action)` from a bulk request; raises ValueError."""
+    ids, action = data.get("ids"), data.get("action")
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"'action' must be one of: {sorted(BULK_ACTIONS)}")
+    if not isinstance(ids, list) or not ids:
+        raise ValueError("'ids' must be a non-empty array")
+    if len(ids) > MAX_BULK_ITEMS:
+        raise ValueError(f"At most {MAX_BULK_ITEMS} items per request")
+    if not all(isinstance(i, str) and i for i in ids):
+        raise ValueError("'ids' must contain string IDs")
+    if len(set(ids)) != len(ids):
+        raise ValueError("'ids' must not contain duplicates")
+    return ids, action
+
+
+def _error(row_id: str, code: int, message: str) -> dict[str, Any]:
+    return {"id": row_id, "status": code, "error": message}
+
+
+def _set_status(
+    table: str, ids: list[str], status: str, from_archived: bool
+) -> dict[str, dict[str, Any]]:
+    """Move rows into or out of `archived`; returns the rows that changed."""
+    if not ids:
+        return {}
+    q = supabase.table(table).update({"status": status}).in_("id", ids)
+    q = q.eq("status", "archived") if from_archived else q.neq("status", "archived")
+    return {r["id"]: r for r in q.execute().data}
+
+
+def _status_results(
+    table: str, key: str, ids: list[str], changed: dict[str, dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Per-item results; rows left unchanged are reported as they are."""
+    rest = [i for i in ids if i not in changed]
+    existing = {
+        r["id"]: r for r in supabase.table(table).select("*").in_("id", rest).execute().data
+    } if rest else {}
+    results = []
+    for row_id in ids:
+        if row_id in changed:
+            results.append({"id": row_id, "status": 200, "changed": True, key: changed[row_id]})
+        elif row_id in existing:
+            results.append({"id": row_id, "status": 200, "changed": False, key: existing[row_id]})
+        else:
+            results.append(_error(row_id, 404, f"{key.capitalize()} not found"))
+    return results
+
+
+# ── Archive / unarchive ──
+
+def set_scopes_archived(ids: list[str], archived: bool) -> list[dict[str, Any]]:
+    """Archive scopes, or restore them to converted (if they have a project)
+    or draft."""
+    if archived:
+        changed = _set_status("scopes", ids, "archived", from_archived=False)
+    else:
+        converted = {
+            r["scope_id"]
+            for r in supabase.table("projects").select("scope_id").in_("scope_id", ids).execute().data
+        }
+        changed = _set_status(
+            "scopes", [i for i in ids if i in converted], "converted", from_archived=True
+        )
+        changed |= _set_status(
+            "scopes", [i for i in ids if i not in converted], "draft", from_archived=True
+        )
+
+    for scope in changed.values():
+        similarity_service.index.add(scope)
+        publish("scopes", "update", scope["id"], data={"status": scope["status"]})
+    return _status_results("scopes", "scope", ids, changed)
+
+
+def set_projects_archived(ids: list[str], archived: bool) -> list[dict[str, Any]]:
+    """Archive projects, or make archived ones active again."""
+    changed = _set_status(
+        "projects", ids, "archived" if archived else "active", from_archived=not archived
+    )
+    for project in changed.values():
+        invalidate_project(project["id"])
+        invalidate_workload(project["id"])
+        publish("projects", "update", project["id"], project["id"], {"status": project["status"]})
+    return _status_results("projects", "project", ids, changed)
+
+
+# ── Delete jobs ──
+
+def _delete_scope(scope_id: str) -> bool:
+    rows = supabase.table("scopes").delete().eq("id", scope_id).execute().data
+    if rows:
+        similarity_service.index.remove(scope_id)
+        publish("scopes", "delete", scope_id)
+    return bool(rows)
+
+
+def _delete_project(project_id: str) -> bool:
+    milestone_ids = [
+        m["id"]
+        for m in supabase.table("milestones").select("id").eq("project_id", project_id).execute().data
+    ]
+    for start in range(0, len(milestone_ids), MILESTONE_CHUNK):
+        chunk = milestone_ids[start:start + MILESTONE_CHUNK]
+        supabase.table("updates").delete().in_("milestone_id", chunk).execute()
+        supabase.table("milestones").delete().in_("id", chunk).execute()
+
+    rows = supabase.table("projects").delete().eq("id", project_id).execute().data
+    if rows:
+        record_deletions("projects", [(project_id, project_id)])
+        invalidate_project(project_id)
+        invalidate_workload(project_id)
+        publish("projects", "delete", project_id, project_id)
+    return bool(rows)
+
+
+_DELETERS = {"scopes": _delete_scope, "projects": _delete_project}
+
+
+def _deletable(target: str, ids: list[str]) -> tuple[list[str], list[dict[str, Any]]]:
+    """Split IDs into those to delete and immediate per-item errors."""
+    existing = {
+        r["id"] for r in supabase.table(target).select("id").in_("id", ids).execute().data
+    }
+    converted = set()
+    if target == "scopes":
+        # Their stories now belong to the project's milestones
+        converted = {
+            r["scope_id"]
+            for r in supabase.table("projects").select("scope_id").in_("scope_id", ids).execute().data
+        }
+
+    deletable, errors = [], []
+    for row_id in ids:
+        if row_id not in existing:
+            errors.append(_error(row_id, 404, "Not found"))
+        elif row_id in converted:
+            errors.append(_error(row_id, 422, "Scope has a project; delete the project first"))
+        else:
+            deletable.append(row_id)
+    return deletable, errors
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _finish(job_id: str, heartbeat: str | None, status: str) -> None:
+    q = supabase.table("bulk_jobs").update({"status": status, "finished_at": _now()}).eq("id", job_id)
+    q = q.eq("heartbeat_at", heartbeat) if heartbeat else q.is_("heartbeat_at", "null")
+    q.execute()
+
+
+def _release(job: dict[str, Any], heartbeat: str) -> None:
+    """Put a job back in the queue unfinished, without using up an attempt."""
+    supabase.table("bulk_jobs").update({
+        "status": "queued",
+        "heartbeat_at": None,
+        "attempts": job["attempts"] - 1,
+    }).eq("id", job["id"]).eq("heartbeat_at", heartbeat).execute()
+
+
+def _run_delete_job(job: dict[str, Any], deadline: float | None = None) -> None:
+    """Delete the job's remaining items for as long as it holds the lease,
+    or until `deadline` (time.monotonic()), when it is released."""
+    order = {row_id: i for i, row_id in enumerate(job["ids"])}
+    results = list(job["results"])
+    done = {r["id"] for r in results}
+    heartbeat = job["heartbeat_at"]
+
+    for row_id in job["ids"]:
+        if row_id in done:
+            continue
+        if deadline is not None and time.monotonic() >= deadline:
+            _release(job, heartbeat)
+            return
+        try:
+            deleted = _DELETERS[job["target"]](row_id)
+            results.append(
+                {"id": row_id, "status": 200} if deleted else _error(row_id, 404, "Not found")
+            )
+        except Exception as e:
+            logger.error("Bulk delete of %s %s failed: %s", job["target"], row_id, e)
+            results.append(_error(row_id, 500, str(e)))
+        results.sort(key=lambda r: order[r["id"]])
+
+        renewed = _now()
+        held = (
+            supabase.table("bulk_jobs")
+            .update({"processed": len(results), "results": results, "heartbeat_at": renewed})
+            .eq("id", job["id"])
+            .eq("heartbeat_at", heartbeat)
+            .execute()
+        ).data
+        if not held:
+            logger.warning("Bulk job %s was taken over by another runner", job["id"])
+            return
+        heartbeat = renewed
+
+    _finish(job["id"], heartbeat, "completed")
+
+
+def _claim(job: dict[str, Any]) -> dict[str, Any] | None:
+    """Take a queued or abandoned job; None if another runner got it first."""
+    q = supabase.table("bulk_jobs").update({
+        "status": "running",
+        "heartbeat_at": _now(),
+        "attempts": job["attempts"] + 1,
+    }).eq("id", job["id"]).eq("status", job["status"])
+    if job["heartbeat_at"]:
+        q = q.eq("heartbeat_at", job["heartbeat_at"])
+    else:
+        q = q.is_("heartbeat_at", "null")
+    rows = q.execute().data
+    return rows[0] if rows else None
+
+
+def run_pending_jobs(lease_seconds: int, deadline: float | None = None) -> int:
+    """Run the jobs that are queued, or running on an expired lease.
+
+    With a `deadline` (time.monotonic()) no job is started after it, and a
+    job still running at it goes back to the queue. Returns the number of
+    jobs this call worked on.
+    """
+    expired = (datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)).isoformat()
+    jobs = (
+        supabase.table("bulk_jobs")
+        .select("*")
+        .or_(f'status.eq.queued,and(status.eq.running,heartbeat_at.lt."{expired}")')
+        .order("created_at")
+        .execute()
+    ).data
+
+    ran = 0
+    for job in jobs:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        if job["attempts"] >= MAX_JOB_ATTEMPTS:
+            logger.error("Bulk job %s gave up after %d attempts", job["id"], job["attempts"])
+            _finish(job["id"], job["heartbeat_at"], "failed")
+            continue
+        claimed = _claim(job)
+        if claimed is None:
+            continue
+        try:
+            _run_delete_job(claimed, deadline)
+        except Exception as e:
+            # Left running, so it is resumed once its lease expires
+            logger.error("Bulk job %s failed: %s", job["id"], e)
+        ran += 1
+    return ran
+
+
+def start_job_runner(poll_seconds: float = 5, lease_seconds: int = 300) -> threading.Thread:
+    """Poll for bulk jobs and run them in a daemon thread of this process."""
+
+    def _loop() -> None:
+        while True:
+            try:
+                run_pending_jobs(lease_seconds)
+            except Exception as e:
+                logger.error("Bulk job runner failed: %s", e)
+            time.sleep(poll_seconds)
+
+    thread = threading.Thread(target=_loop, name="bulk-job-runner", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_delete_job(target: str, ids: list[str]) -> dict[str, Any]:
+    """Record a delete job for the job runner.
+
+    IDs that do not exist (or scopes that were converted) are resolved
+    up front and are already in the returned job's results.
+    """
+    deletable, errors = _deletable(target, ids)
+    return supabase.table("bulk_jobs").insert({
+        "target": target,
+        "action": "delete",
+        "status": "queued" if deletable else "completed",
+        "ids": ids,
+        "total": len(ids),
+        "processed": len(errors),
+        "results": errors,
+        "finished_at": None if deletable else _now(),
+    }).execute().data[0]
+
+
+def get_job(job_id: str) -> dict[str, Any] | None:
+    row = supabase.table("bulk_jobs").select("*").eq("id", job_id).maybe_single().execute()
+    return row.data if row else None
@@ -0,0 +1,292 @@
+"""In-process change feed — write handlers publish compact change events,
+SSE streams fan them out to connected clients.
+
+Events live in one bounded ring buffer shared by every subscriber; each
+subscriber just keeps a cursor into it, so memory does not grow with the
+number of clients. A client that reconnects with `Last-Event-ID` is
+replayed everything after that ID if it is still buffered, otherwise it is
+told to `reset` (refetch) and continues from the live tail.
+
+With several processes (serve.py workers, worker.py), published changes are
+also written to the `change_events` table. Each worker follows that table
+(see `start_follower`) and feeds other processes' changes into its own hub
+and to the `on_remote_change` handlers, which drop cached data.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any
+
+from app.db import supabase
+
+logger = logging.getLogger(__name__)
+
+BUFFER_SIZE = 2048
+HEARTBEAT_SECONDS = 15
+# Followers re-read this much of the shared log on every poll, so a change
+# whose row became visible late is still picked up
+SHARED_WINDOW = timedelta(seconds=5)
+SHARED_POLL_LIMIT = 1000
+EVENT_FIELDS = ("table", "op", "row_id", "project_id", "data")
+
+
+def _new_epoch() -> str:
+    return format(int(time.time()), "x") + format(os.getpid(), "x")
+
+
+# Distinguishes event IDs across process restarts and forked workers, which
+# each have their own buffer
+_EPOCH = _new_epoch()
+
+
+def _after_fork() -> None:
+    global _EPOCH
+    _EPOCH = _new_epoch()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+class ChangeHub:
+    """Bounded ring buffer of events with blocking cursor-based reads."""
+
+    def __init__(self, size: int = BUFFER_SIZE):
+        self._events: deque[dict[str, Any]] = deque(maxlen=size)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def publish(self, event: dict[str, Any]) -> None:
+        with self._cond:
+            self._seq += 1
+            self._events.append({"seq": self._seq, **event})
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """End every open stream (on server shutdown); clients reconnect."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def head(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def read(self, after: int, timeout: float) -> tuple[list[dict[str, Any]], bool]:
+        """Events with seq > `after`, waiting up to `timeout` for new ones.
+
+        The second value is False when events after `after` were already
+        evicted from the buffer (the caller missed some).
+        """
+        with self._cond:
+            if self._seq <= after:
+                self._cond.wait(timeout)
+            complete = not self._events or after >= self._events[0]["seq"] - 1
+            return [e for e in self._events if e["seq"] > after], complete
+
+
+hub = ChangeHub()
+# Each open stream holds a server thread; sized by set_max_subscribers
+_subscribers = threading.BoundedSemaphore(1)
+
+
+def set_max_subscribers(limit: int) -> None:
+    """Cap the event streams open at once in this process."""
+    global _subscribers
+    _subscribers = threading.BoundedSemaphore(max(limit, 1))
+
+
+@lru_cache(maxsize=4096)
+def project_for_milestone(milestone_id: str) -> str | None:
+    """Owning project of a milestone (milestones never change project)."""
+    rows = (
+        supabase.table("milestones")
+        .select("project_id")
+        .eq("id", milestone_id)
+        .execute()
+    ).data
+    return rows[0]["project_id"] if rows else None
+
+
+def publish(
+    table: str,
+    op: str,
+    row_id: str,
+    project_id: str | None = None,
+    data: dict[str, Any] | None = None,
+) -> None:
+    """Record a change. `op` is insert / update / delete; `data` holds the
+    inserted row or the patched fields."""
+    event = {
+        "table": table,
+        "op": op,
+        "row_id": row_id,
+        "project_id": project_id,
+        "data": data,
+    }
+    hub.publish(event)
+    if _shared:
+        try:
+            supabase.table("change_events").insert({**event, "origin": _EPOCH}).execute()
+        except Exception as e:
+            # Other processes converge through /sync and their cache TTLs
+            logger.warning("Sharing change %s %s %s failed: %s", op, table, row_id, e)
+
+
+# ── Sharing changes between processes ──
+
+_shared = False
+_remote_handlers: list[Callable[[dict[str, Any]], None]] = []
+
+
+def share_changes(enabled: bool) -> None:
+    """Also write published changes to `change_events` for other processes."""
+    global _shared
+    _shared = enabled
+
+
+def on_remote_change(handler: Callable[[dict[str, Any]], None]) -> None:
+    """Call `handler(event)` for each change published by another process."""
+    _remote_handlers.append(handler)
+
+
+def _poll_shared(since: datetime, seen: dict[int, datetime]) -> datetime:
+    """Deliver changes from other processes newer than `since` minus the
+    window; returns the new `since`. `seen` holds the IDs already delivered
+    within the window."""
+    rows = (
+        supabase.table("change_events")
+        .select("*")
+        .gt("created_at", (since - SHARED_WINDOW).isoformat())
+        .order("id")
+        .limit(SHARED_POLL_LIMIT)
+        .execute()
+    ).data
+    if len(rows) == SHARED_POLL_LIMIT:
+        logger.warning("More than %d shared changes in one poll", SHARED_POLL_LIMIT)
+
+    for row in rows:
+        created = datetime.fromisoformat(row["created_at"])
+        since = max(since, created)
+        if row["id"] in seen:
+            continue
+        seen[row["id"]] = created
+        if row["origin"] == _EPOCH:
+            continue
+        event = {k: row.get(k) for k in EVENT_FIELDS}
+        hub.publish(event)
+        for handler in _remote_handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error("Handling shared change %s failed: %s", row["id"], e)
+
+    for event_id, created in list(seen.items()):
+        if created < since - SHARED_WINDOW:
+            del seen[event_id]
+    return since
+
+
+def start_follower(poll_seconds: float) -> threading.Thread:
+    """Follow `change_events` in a daemon thread of this process, until the
+    hub is closed."""
+
+    def _loop() -> None:
+        since = datetime.now(timezone.utc)
+        seen: dict[int, datetime] = {}
+        while not hub.closed:
+            try:
+                since = _poll_shared(since, seen)
+            except Exception as e:
+                logger.error("Following shared changes failed: %s", e)
+            time.sleep(poll_seconds)
+
+    thread = threading.Thread(target=_loop, name="change-follower", daemon=True)
+    thread.start()
+    return thread
+
+
+def _event_id(seq: int) -> str:
+    return f"{_EPOCH}-{seq}"
+
+
+def _parse_event_id(last_event_id: str | None) -> int | None:
+    """Sequence number from a Last-Event-ID, or None if it is from another
+    process lifetime or malformed."""
+    if not last_event_id:
+        return None
+    epoch, _, seq = last_event_id.partition("-")
+    if epoch != _EPOCH or not seq.isdigit():
+        return None
+    return int(seq)
+
+
+def _format(event: dict[str, Any]) -> str:
+    payload = {k: v for k, v in event.items() if k != "seq"}
+    return f"id: {_event_id(event['seq'])}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+class _Subscription:
+    """Iterator over SSE frames that frees its subscriber slot on close().
+
+    The WSGI server calls close() when the client goes away, even if the
+    frame generator was never started.
+    """
+
+    def __init__(self, frames: Iterator[str], slots: threading.BoundedSemaphore):
+        self._frames = frames
+        self._slots = slots
+        self._open = True
+
+    def __iter__(self) -> "_Subscription":
+        return self
+
+    def __next__(self) -> str:
+        return next(self._frames)
+
+    def close(self) -> None:
+        self._frames.close()
+        if self._open:
+            self._open = False
+            self._slots.release()
+
+
+def open_stream(project_id: str | None, last_event_id: str | None) -> Iterator[str] | None:
+    """SSE frames for one project (or the whole portfolio if None).
+
+    Returns None when the process's limit of streams is already open.
+    """
+    slots = _subscribers
+    if not slots.acquire(blocking=False):
+        return None
+    return _Subscription(_frames(project_id, last_event_id), slots)
+
+
+def _frames(project_id: str | None, last_event_id: str | None) -> Iterator[str]:
+    cursor = _parse_event_id(last_event_id)
+    if cursor is None:
+        cursor = hub.head()
+        if last_event_id:
+            yield f"event: reset\nid: {_event_id(cursor)}\ndata: {{}}\n\n"
+
+    yield "retry: 3000\n\n"
+    while not hub.closed:
+        events, complete = hub.read(cursor, timeout=HEARTBEAT_SECONDS)
+        if not complete:
+            cursor = hub.head()
+            yield f"event: reset\nid: {_event_id(cursor)}\ndata: {{}}\n\n"
+            continue
+        if not events:
+            yield ": keep-alive\n\n"
+            continue
+        for event in events:
+            cursor = event["seq"]
+            if project_id is None or event["project_id"] == project_id:
+                yield _format(event)
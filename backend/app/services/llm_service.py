@@ -2,11 +2,14 @@
 
 import logging
 import os
+from typing import Any
 
 from google import genai
 from google.genai import types
 from pydantic import BaseModel
 
+from config import Config
+
 logger = logging.getLogger(__name__)
 
 # ── Debug file logger ──
@@ -26,6 +29,20 @@ logger.setLevel(logging.DEBUG)
 client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY", ""))
 MODEL = "gemini-2.5-flash"
 
+# Summary model tiers — small prompts go to a lighter, faster model
+SUMMARY_TIERS = {
+    "small": {
+        "model": Config.SUMMARY_SMALL_MODEL,
+        "max_output_tokens": 1024,
+        "timeout": 20_000,
+    },
+    "large": {
+        "model": Config.SUMMARY_LARGE_MODEL,
+        "max_output_tokens": 2048,
+        "timeout": 45_000,
+    },
+}
+
 
 # ── Pydantic schemas for structured output ──
 class UserStorySchema(BaseModel):
@@ -54,12 +71,43 @@ class ScopeOutputSchema(BaseModel):
     risks: list[RiskSchema]
 
 
+# Single-epic regeneration — EpicSchema minus order_index (kept from the
+# existing row), or just the epic's stories
+class EpicRegenerationSchema(BaseModel):
+    name: str
+    description: str
+    effort_days: int
+    user_stories: list[UserStorySchema]
+
+
+class EpicStoriesSchema(BaseModel):
+    user_stories: list[UserStorySchema]
+
+
 def generate_scope(system_prompt: str, user_prompt: str) -> ScopeOutputSchema:
     """Generate structured scope from idea using Gemini structured output.
 
     Retries once on failure with a corrective message.
     """
-    logger.debug("=== SCOPE GENERATION ===")
+    return _generate_structured("SCOPE", system_prompt, user_prompt, ScopeOutputSchema)
+
+
+def generate_epic(
+    system_prompt: str, user_prompt: str, stories_only: bool = False
+) -> EpicRegenerationSchema | EpicStoriesSchema:
+    """Regenerate one epic (or only its user stories) as structured output."""
+    schema = EpicStoriesSchema if stories_only else EpicRegenerationSchema
+    return _generate_structured("EPIC", system_prompt, user_prompt, schema)
+
+
+def _generate_structured(
+    label: str, system_prompt: str, user_prompt: str, schema: type[BaseModel]
+) -> Any:
+    """Gemini structured-output call validated against `schema`.
+
+    Retries once on failure with a corrective message.
+    """
+    logger.debug("=== %s GENERATION ===", label)
     logger.debug("System: %s", system_prompt)
     logger.debug("User: %s", user_prompt)
 
@@ -80,7 +128,7 @@ def generate_scope(system_prompt: str, user_prompt: str) -> ScopeOutputSchema:
                 config=types.GenerateContentConfig(
                     system_instruction=system_prompt,
                     response_mime_type="application/json",
-                    response_schema=ScopeOutputSchema,
+                    response_schema=schema,
                     temperature=0.7,
                     http_options={"timeout": 30_000},
                 ),
@@ -91,7 +139,7 @@ def generate_scope(system_prompt: str, user_prompt: str) -> ScopeOutputSchema:
             return parsed
 
         except Exception as e:
-            logger.error("Scope generation attempt %d failed: %s", attempt + 1, e)
+            logger.error("%s generation attempt %d failed: %s", label.title(), attempt + 1, e)
             if attempt == 1:
                 raise RuntimeError("AI generation failed — please try again") from e
 
@@ -99,23 +147,25 @@ def generate_scope(system_prompt: str, user_prompt: str) -> ScopeOutputSchema:
     raise RuntimeError("AI generation failed — please try again")
 
 
-def generate_summary(system_prompt: str, user_prompt: str) -> str:
-    """Generate weekly summary as plain prose text.
+def generate_summary(system_prompt: str, user_prompt: str, tier: str = "large") -> str:
+    """Generate weekly summary as plain prose text on a SUMMARY_TIERS model.
 
     Returns the raw text content from the LLM.
     """
-    logger.debug("=== SUMMARY GENERATION ===")
+    settings = SUMMARY_TIERS[tier]
+    logger.debug("=== SUMMARY GENERATION (%s: %s) ===", tier, settings["model"])
     logger.debug("System: %s", system_prompt)
     logger.debug("User: %s", user_prompt)
 
     try:
         response = client.models.generate_content(
-            model=MODEL,
+            model=settings["model"],
             contents=user_prompt,
             config=types.GenerateContentConfig(
                 system_instruction=system_prompt,
                 temperature=0.7,
-                http_options={"timeout": 30_000},
+                max_output_tokens=settings["max_output_tokens"],
+                http_options={"timeout": settings["timeout"]},
             ),
         )
 
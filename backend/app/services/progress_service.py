@@ -0,0 +1,163 @@
+"""Milestone progress derived from user story completion.
+
+Each milestone keeps `stories_total` and `stories_completed`, adjusted by
+the story write paths with the delta of each change, and `progress_percent`
+is recomputed from those two counts in the same update — no read ever has
+to scan a milestone's stories. Until a milestone has stories, its
+progress_percent is set manually.
+
+PostgREST has no atomic increment, so counts are updated with a
+compare-and-set on their previous values and retried when another writer
+got there first. The story write and the count update are separate
+requests, so counts can still drift (a crash in between, or a failed
+update). A milestone whose adjustment cannot be applied is recounted from
+its stories instead, and `reconcile_story_counts` (recount_stories.py)
+repairs any that drifted.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any
+
+from app.db import supabase
+from app.services.change_feed import publish
+from app.services.workload_service import invalidate_workload
+from app.utils.pagination import paged
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+COUNT_COLUMNS = "id, project_id, stories_total, stories_completed, progress_percent"
+
+
+def derive_progress(completed: int, total: int) -> int:
+    return round(100 * completed / total) if total else 0
+
+
+def _write_counts(
+    milestone_id: str, project_id: str, total: int, completed: int
+) -> dict[str, Any]:
+    changes = {
+        "stories_total": total,
+        "stories_completed": completed,
+        "progress_percent": derive_progress(completed, total),
+    }
+    supabase.table("milestones").update(changes).eq("id", milestone_id).execute()
+    invalidate_workload(project_id)
+    publish("milestones", "update", milestone_id, project_id, changes)
+    return {"id": milestone_id, **changes}
+
+
+def recount_story_counts(milestone_id: str) -> dict[str, Any] | None:
+    """Set a milestone's counts from its stories; None if it was deleted."""
+    milestone = (
+        supabase.table("milestones")
+        .select("project_id")
+        .eq("id", milestone_id)
+        .maybe_single()
+        .execute()
+    )
+    if not milestone or not milestone.data:
+        return None
+
+    def count(completed_only: bool) -> int:
+        q = (
+            supabase.table("user_stories")
+            .select("id", count="exact", head=True)
+            .eq("milestone_id", milestone_id)
+        )
+        if completed_only:
+            q = q.eq("is_completed", True)
+        return q.execute().count or 0
+
+    return _write_counts(milestone_id, milestone.data["project_id"], count(False), count(True))
+
+
+def adjust_story_counts(
+    milestone_id: str | None, total_delta: int = 0, completed_delta: int = 0
+) -> dict[str, Any] | None:
+    """Apply story count deltas to a milestone and re-derive its progress.
+
+    Returns the milestone's id, counts and progress_percent, or None when
+    there is nothing to adjust (no milestone, no delta, or it was deleted).
+    The story change has already been written when this runs, so it does
+    not raise: if the counts keep changing underneath it they are recounted,
+    and if that fails too the error is logged and None is returned.
+    """
+    if not milestone_id or not (total_delta or completed_delta):
+        return None
+
+    try:
+        for _ in range(MAX_ATTEMPTS):
+            current = (
+                supabase.table("milestones")
+                .select(COUNT_COLUMNS)
+                .eq("id", milestone_id)
+                .maybe_single()
+                .execute()
+            )
+            if not current or not current.data:
+                return None
+            current = current.data
+
+            total = max(current["stories_total"] + total_delta, 0)
+            completed = min(max(current["stories_completed"] + completed_delta, 0), total)
+            changes = {
+                "stories_total": total,
+                "stories_completed": completed,
+                "progress_percent": derive_progress(completed, total),
+            }
+            updated = (
+                supabase.table("milestones")
+                .update(changes)
+                .eq("id", milestone_id)
+                .eq("stories_total", current["stories_total"])
+                .eq("stories_completed", current["stories_completed"])
+                .execute()
+            )
+            if updated.data:
+                invalidate_workload(current["project_id"])
+                publish("milestones", "update", milestone_id, current["project_id"], changes)
+                return {"id": milestone_id, **changes}
+
+        logger.warning("Story counts of milestone %s kept changing; recounting", milestone_id)
+        return recount_story_counts(milestone_id)
+    except Exception as e:
+        logger.error("Adjusting story counts of milestone %s failed: %s", milestone_id, e)
+        return None
+
+
+def reconcile_story_counts(project_id: str | None = None) -> dict[str, int]:
+    """Recount stories for every milestone (of one project, or all) in one
+    scan of user_stories, and fix the milestones whose counts drifted."""
+    def milestone_query():
+        q = supabase.table("milestones").select(COUNT_COLUMNS)
+        return (q.eq("project_id", project_id) if project_id else q).order("id")
+
+    milestones = {m["id"]: m for m in paged(milestone_query)}
+    if not milestones:
+        return {"milestones": 0, "fixed": 0}
+
+    def story_query():
+        q = supabase.table("user_stories").select("id, milestone_id, is_completed")
+        if project_id:
+            q = q.in_("milestone_id", list(milestones))
+        else:
+            q = q.not_.is_("milestone_id", "null")
+        return q.order("id")
+
+    counts: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    for story in paged(story_query):
+        counts[story["milestone_id"]][0] += 1
+        counts[story["milestone_id"]][1] += int(bool(story["is_completed"]))
+
+    fixed = 0
+    for milestone_id, m in milestones.items():
+        total, completed = counts.get(milestone_id, (0, 0))
+        drifted = (m["stories_total"], m["stories_completed"]) != (total, completed) or (
+            total and m["progress_percent"] != derive_progress(completed, total)
+        )
+        if drifted:
+            _write_counts(milestone_id, m["project_id"], total, completed)
+            fixed += 1
+    return {"milestones": len(milestones), "fixed": fixed}
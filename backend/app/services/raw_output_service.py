@@ -0,0 +1,69 @@
+"""Compressed storage of the raw LLM output behind each scope.
+
+The normalized epics and stories are what the app reads; the raw Gemini
+output is kept for debugging and is only fetched on explicit request. It
+lives in `scope_outputs`, one row per scope, as zlib-compressed JSON in a
+bytea column, so the `scopes` table stays small and scans of it never touch
+the raw output.
+"""
+
+import json
+import zlib
+from typing import Any
+
+from app.db import supabase
+
+ENCODING = "zlib"
+COMPRESSION_LEVEL = 9
+
+
+def encode_output(output: dict[str, Any]) -> dict[str, Any]:
+    """Row fields for `scope_outputs` (without scope_id)."""
+    raw = json.dumps(output, separators=(",", ":"), ensure_ascii=False).encode()
+    packed = zlib.compress(raw, COMPRESSION_LEVEL)
+    return {
+        "encoding": ENCODING,
+        # PostgREST takes and returns bytea as a \x-prefixed hex string
+        "payload": "\\x" + packed.hex(),
+        "raw_bytes": len(raw),
+        "stored_bytes": len(packed),
+    }
+
+
+def decode_output(row: dict[str, Any]) -> dict[str, Any]:
+    if row["encoding"] != ENCODING:
+        raise ValueError(f"Unknown raw output encoding '{row['encoding']}'")
+    packed = bytes.fromhex(row["payload"].removeprefix("\\x"))
+    return json.loads(zlib.decompress(packed))
+
+
+def save_raw_output(scope_id: str, output: dict[str, Any]) -> None:
+    supabase.table("scope_outputs").upsert(
+        {"scope_id": scope_id, **encode_output(output)}
+    ).execute()
+
+
+def load_raw_output(scope_id: str) -> dict[str, Any] | None:
+    """The scope's raw LLM output, or None if it has none.
+
+    Falls back to the legacy `scopes.ai_output_raw` column for rows that
+    migrate_raw_outputs.py has not moved yet.
+    """
+    row = (
+        supabase.table("scope_outputs")
+        .select("encoding, payload")
+        .eq("scope_id", scope_id)
+        .maybe_single()
+        .execute()
+    )
+    if row and row.data:
+        return decode_output(row.data)
+
+    legacy = (
+        supabase.table("scopes")
+        .select("ai_output_raw")
+        .eq("id", scope_id)
+        .maybe_single()
+        .execute()
+    )
+    return legacy.data.get("ai_output_raw") if legacy and legacy.data else None
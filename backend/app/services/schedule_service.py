@@ -0,0 +1,226 @@
+"""Milestone dependency graph, critical path and incremental date propagation.
+
+Dependencies are finish-to-start edges stored in `milestone_dependencies`:
+a milestone starts `lag_days` after the latest due date of the milestones
+it depends on, and keeps its own duration (due_date - start_date).
+"""
+
+from collections import deque
+from datetime import date, timedelta
+from typing import Any
+
+from app.db import supabase
+
+
+class _Graph:
+    """In-memory DAG of one project's milestones."""
+
+    def __init__(self, milestones: list[dict[str, Any]], edges: list[dict[str, Any]]):
+        self.nodes = {m["id"]: m for m in milestones}
+        self.preds: dict[str, list[tuple[str, int]]] = {mid: [] for mid in self.nodes}
+        self.succs: dict[str, list[tuple[str, int]]] = {mid: [] for mid in self.nodes}
+        for e in edges:
+            if e["milestone_id"] in self.nodes and e["depends_on_id"] in self.nodes:
+                lag = e.get("lag_days") or 0
+                self.preds[e["milestone_id"]].append((e["depends_on_id"], lag))
+                self.succs[e["depends_on_id"]].append((e["milestone_id"], lag))
+
+    def topo_order(self) -> list[str]:
+        """Kahn's algorithm; raises ValueError if the graph has a cycle."""
+        indegree = {mid: len(p) for mid, p in self.preds.items()}
+        queue = deque(mid for mid, d in indegree.items() if d == 0)
+        order = []
+        while queue:
+            mid = queue.popleft()
+            order.append(mid)
+            for succ, _ in self.succs[mid]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    queue.append(succ)
+        if len(order) != len(self.nodes):
+            raise ValueError("Milestone dependencies contain a cycle")
+        return order
+
+    def descendants(self, source: str) -> set[str]:
+        """`source` plus every milestone reachable along successor edges."""
+        seen, stack = {source}, [source]
+        while stack:
+            for succ, _ in self.succs[stack.pop()]:
+                if succ not in seen:
+                    seen.add(succ)
+                    stack.append(succ)
+        return seen
+
+
+def _dates(m: dict[str, Any]) -> tuple[date | None, date | None]:
+    start = date.fromisoformat(m["start_date"]) if m.get("start_date") else None
+    due = date.fromisoformat(m["due_date"]) if m.get("due_date") else None
+    return start, due
+
+
+def _duration(m: dict[str, Any]) -> int:
+    start, due = _dates(m)
+    return max((due - start).days, 0) if start and due else 0
+
+
+def _load_graph(project_id: str, columns: str = "*") -> _Graph:
+    milestones = (
+        supabase.table("milestones")
+        .select(columns)
+        .eq("project_id", project_id)
+        .execute()
+    ).data
+    edges = (
+        supabase.table("milestone_dependencies")
+        .select("milestone_id, depends_on_id, lag_days")
+        .eq("project_id", project_id)
+        .execute()
+    ).data
+    return _Graph(milestones, edges)
+
+
+def compute_schedule(project_id: str) -> dict[str, Any]:
+    """Forward/backward pass over the DAG — slack and the critical path."""
+    graph = _load_graph(
+        project_id, "id, name, status, start_date, due_date, order_index"
+    )
+    order = graph.topo_order()
+
+    # Forward pass: earliest start/finish as day offsets from the project's
+    # earliest milestone start
+    starts = [s for s, _ in (_dates(m) for m in graph.nodes.values()) if s]
+    origin = min(starts) if starts else date.today()
+    earliest_start: dict[str, int] = {}
+    earliest_finish: dict[str, int] = {}
+    for mid in order:
+        own_start, _ = _dates(graph.nodes[mid])
+        es = (own_start - origin).days if own_start else 0
+        if graph.preds[mid]:
+            es = max(earliest_finish[p] + lag for p, lag in graph.preds[mid])
+        earliest_start[mid] = es
+        earliest_finish[mid] = es + _duration(graph.nodes[mid])
+
+    # Backward pass: latest finish without delaying the project end
+    project_end = max(earliest_finish.values(), default=0)
+    latest_finish: dict[str, int] = {}
+    for mid in reversed(order):
+        succs = graph.succs[mid]
+        if succs:
+            latest_finish[mid] = min(
+                latest_finish[s] - _duration(graph.nodes[s]) - lag for s, lag in succs
+            )
+        else:
+            latest_finish[mid] = project_end
+
+    nodes = []
+    for mid in order:
+        slack = latest_finish[mid] - earliest_finish[mid]
+        nodes.append({
+            "id": mid,
+            "name": graph.nodes[mid]["name"],
+            "status": graph.nodes[mid]["status"],
+            "earliest_start": (origin + timedelta(days=earliest_start[mid])).isoformat(),
+            "earliest_finish": (origin + timedelta(days=earliest_finish[mid])).isoformat(),
+            "latest_finish": (origin + timedelta(days=latest_finish[mid])).isoformat(),
+            "slack_days": slack,
+            "critical": slack == 0,
+        })
+
+    return {
+        "nodes": nodes,
+        "critical_path": [n["id"] for n in nodes if n["critical"]],
+        "dependencies": [
+            {"milestone_id": mid, "depends_on_id": p, "lag_days": lag}
+            for mid, preds in graph.preds.items()
+            for p, lag in preds
+        ],
+        "project_end": (origin + timedelta(days=project_end)).isoformat(),
+    }
+
+
+def propagate_dates(project_id: str, changed_id: str) -> list[dict[str, Any]]:
+    """Push milestones downstream of `changed_id` later after its dates changed.
+
+    Only descendants are visited, in topological order, and a branch stops
+    as soon as a milestone does not have to move. Milestones are only ever
+    pushed later: one that already starts after its predecessors keeps the
+    dates it was given. The new dates are written in one call to the
+    `shift_milestone_dates` function, which sets only those two columns, so
+    concurrent edits to other columns survive and deleted milestones stay
+    deleted. Returns the updated rows.
+    """
+    graph = _load_graph(project_id)
+    if changed_id not in graph.nodes:
+        return []
+
+    # Topological order restricted to the changed node and its descendants
+    affected = graph.descendants(changed_id)
+    order = [mid for mid in graph.topo_order() if mid in affected]
+    dirty = {changed_id}
+    changed: dict[str, dict[str, Any]] = {}
+
+    for mid in order:
+        if mid == changed_id or not any(p in dirty for p, _ in graph.preds[mid]):
+            continue
+        node = graph.nodes[mid]
+        pred_dues = [
+            _dates(graph.nodes[p])[1] + timedelta(days=lag)
+            for p, lag in graph.preds[mid]
+            if graph.nodes[p].get("due_date")
+        ]
+        if not pred_dues:
+            continue
+        new_start = max(pred_dues)
+        start, _ = _dates(node)
+        if start is not None and new_start <= start:
+            continue
+        new_due = new_start + timedelta(days=_duration(node))
+        node["start_date"] = new_start.isoformat()
+        node["due_date"] = new_due.isoformat()
+        changed[mid] = node
+        dirty.add(mid)
+
+    if not changed:
+        return []
+    shifts = [
+        {"id": mid, "start_date": node["start_date"], "due_date": node["due_date"]}
+        for mid, node in changed.items()
+    ]
+    return supabase.rpc("shift_milestone_dates", {"shifts": shifts}).execute().data or []
+
+
+def add_dependency(
+    project_id: str, milestone_id: str, depends_on_id: str, lag_days: int = 0
+) -> dict[str, Any]:
+    """Add a finish-to-start edge, rejecting cycles, then shift dates."""
+    if milestone_id == depends_on_id:
+        raise ValueError("A milestone cannot depend on itself")
+    graph = _load_graph(project_id, "id")
+    if milestone_id not in graph.nodes or depends_on_id not in graph.nodes:
+        raise ValueError("Both milestones must belong to this project")
+    if depends_on_id in graph.descendants(milestone_id):
+        raise ValueError("Dependency would create a cycle")
+
+    result = (
+        supabase.table("milestone_dependencies")
+        .insert({
+            "project_id": project_id,
+            "milestone_id": milestone_id,
+            "depends_on_id": depends_on_id,
+            "lag_days": lag_days,
+        })
+        .execute()
+    )
+    dependency = result.data[0]
+    dependency["shifted_milestones"] = propagate_dates(project_id, depends_on_id)
+    return dependency
+
+
+def chain_dependencies(project_id: str, milestone_ids: list[str]) -> None:
+    """Make each milestone depend on the previous one (one batch insert)."""
+    rows = [
+        {"project_id": project_id, "milestone_id": curr, "depends_on_id": prev, "lag_days": 0}
+        for prev, curr in zip(milestone_ids, milestone_ids[1:])
+    ]
+    if rows:
+        supabase.table("milestone_dependencies").insert(rows).execute()
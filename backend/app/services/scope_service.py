@@ -1,11 +1,45 @@
 """Scope generation, CRUD, and scope-to-project conversion logic."""
 
+import logging
+import re
 from datetime import date, timedelta
 from typing import Any
 
 from app.db import supabase
-from app.services.llm_service import generate_scope, ScopeOutputSchema
-from app.utils.prompt_builder import build_scope_prompt, SCOPE_SYSTEM_PROMPT
+from config import Config
+from app.services import similarity_service
+from app.services.change_feed import publish
+from app.services.llm_service import generate_epic, generate_scope, ScopeOutputSchema
+from app.services.progress_service import derive_progress
+from app.services.raw_output_service import load_raw_output, save_raw_output
+from app.services.schedule_service import chain_dependencies
+from app.utils import metrics
+from app.utils.fieldsets import SCOPE_COLUMNS, build_select, truncate_fields
+from app.utils.pagination import after_cursor, keyset_page
+from app.utils.prompt_builder import (
+    build_epic_prompt,
+    build_scope_example,
+    build_scope_prompt,
+    EPIC_SYSTEM_PROMPT,
+    SCOPE_SYSTEM_PROMPT,
+)
+
+logger = logging.getLogger(__name__)
+
+SCOPE_LIST_FIELDS = ["id", "product_name", "idea_text", "status", "created_at"]
+SCOPE_INCLUDES = {"epics", "user_stories", "ai_output_raw"}
+SCOPE_DEFAULT_INCLUDE = ["epics", "user_stories"]
+SCOPE_PAGE_SIZE = 50
+SCOPE_STORIES_PER_EPIC = 50
+SCOPE_MAX_PAGE_SIZE = 200
+
+
+# Reuse of past scopes on generate: "clone" copies a near-identical scope
+# without calling the LLM, "example" sends the nearest one as a few-shot
+# example. "clone" falls back to "example" when no scope is close enough.
+REUSE_MODES = {"off", "clone", "example"}
+CLONE_MIN_SIMILARITY = Config.SCOPE_CLONE_MIN_SIMILARITY
+EXAMPLE_MIN_SIMILARITY = Config.SCOPE_EXAMPLE_MIN_SIMILARITY
 
 
 def create_scope(
@@ -14,23 +48,46 @@ def create_scope(
     target_audience: str | None = None,
     budget_range: str | None = None,
     timeline_pressure: str | None = None,
+    reuse: str = "off",
 ) -> dict[str, Any]:
-    """Call LLM, persist scope + epics + user stories, return full scope."""
-
-    # Build prompt and call Gemini
-    user_prompt = build_scope_prompt(
-        product_name, idea_text, target_audience, budget_range, timeline_pressure
-    )
-    ai_output: ScopeOutputSchema = generate_scope(SCOPE_SYSTEM_PROMPT, user_prompt)
+    """Call LLM, persist scope + epics + user stories, return full scope.
 
-    # Persist scope row
-    scope_data = {
+    With `reuse` set, the most similar existing scope is cloned or used as
+    an example (see REUSE_MODES); `reused_from` on the result says which.
+    """
+    fields = {
         "product_name": product_name,
         "idea_text": idea_text,
         "target_audience": target_audience,
         "budget_range": budget_range,
         "timeline_pressure": timeline_pressure,
-        "ai_output_raw": ai_output.model_dump(),
+    }
+
+    match = None
+    if reuse != "off":
+        nearest = similarity_service.index.search(fields, limit=1)
+        if nearest and nearest[0][1] >= EXAMPLE_MIN_SIMILARITY:
+            match = nearest[0]
+
+    reused_from = None
+    if match and reuse == "clone" and match[1] >= CLONE_MIN_SIMILARITY:
+        ai_output = _scope_output(get_scope(match[0], story_limit=None))
+        reused_from = {"scope_id": match[0], "similarity": round(match[1], 4), "mode": "clone"}
+    else:
+        # Build prompt and call Gemini
+        user_prompt = build_scope_prompt(
+            product_name, idea_text, target_audience, budget_range, timeline_pressure
+        )
+        if match:
+            user_prompt += "\n\n" + build_scope_example(get_scope(match[0]))
+            reused_from = {"scope_id": match[0], "similarity": round(match[1], 4), "mode": "example"}
+        ai_output = generate_scope(SCOPE_SYSTEM_PROMPT, user_prompt)
+    if reuse != "off":
+        metrics.incr(f"scopes.reuse.{reused_from['mode'] if reused_from else 'miss'}")
+
+    # Persist scope row
+    scope_data = {
+        **fields,
         "suggested_stack": [s for s in ai_output.suggested_stack],
         "timeline_weeks": ai_output.timeline_weeks,
         "risks": [r.model_dump() for r in ai_output.risks],
@@ -38,6 +95,8 @@ def create_scope(
     }
     scope_result = supabase.table("scopes").insert(scope_data).execute()
     scope = scope_result.data[0]
+    save_raw_output(scope["id"], ai_output.model_dump())
+    similarity_service.index.add(scope)
 
     # Persist epics + user stories
     epics_out = []
@@ -70,30 +129,251 @@ def create_scope(
         epics_out.append(epic)
 
     scope["epics"] = epics_out
+    scope["reused_from"] = reused_from
+    publish("scopes", "insert", scope["id"], data={
+        "product_name": scope["product_name"], "status": scope["status"],
+    })
     return scope
 
 
-def get_scope(scope_id: str) -> dict[str, Any] | None:
-    """Fetch a scope with its epics and user stories."""
-    result = (
+def _scope_output(scope: dict[str, Any]) -> ScopeOutputSchema:
+    """Rebuild generator output from a stored scope, including later edits
+    and regenerated epics, so it can be persisted as a new scope."""
+    return ScopeOutputSchema.model_validate({
+        "epics": [
+            {**epic, "user_stories": sorted(epic.get("user_stories") or [], key=lambda s: s["order_index"])}
+            for epic in sorted(scope.get("epics") or [], key=lambda e: e["order_index"])
+        ],
+        "suggested_stack": scope.get("suggested_stack") or [],
+        "timeline_weeks": scope.get("timeline_weeks") or 0,
+        "risks": scope.get("risks") or [],
+    })
+
+
+def get_scope(
+    scope_id: str,
+    fields: list[str] | None = None,
+    include: list[str] | None = None,
+    story_limit: int | None = SCOPE_STORIES_PER_EPIC,
+) -> dict[str, Any] | None:
+    """Fetch a scope with its epics and user stories.
+
+    `ai_output_raw` duplicates the normalized epics and is stored apart
+    (see raw_output_service), so it is only loaded when explicitly included.
+    Each epic embeds at most `story_limit` stories (None for all), plus a
+    `user_stories_next_cursor` for list_epic_stories.
+    """
+    include = SCOPE_DEFAULT_INCLUDE if include is None else include
+    columns = list(fields) if fields is not None else sorted(SCOPE_COLUMNS)
+
+    embeds = []
+    if "user_stories" in include:
+        embeds.append("epics(*, user_stories(*))")
+    elif "epics" in include:
+        embeds.append("epics(*)")
+
+    query = (
         supabase.table("scopes")
-        .select("*, epics(*, user_stories(*))")
+        .select(build_select(columns, embeds))
         .eq("id", scope_id)
-        .single()
+    )
+    if embeds:
+        query = query.order("order_index", foreign_table="epics")
+    paginate = "user_stories" in include and story_limit is not None
+    if "user_stories" in include:
+        query = query.order("order_index", foreign_table="epics.user_stories").order(
+            "id", foreign_table="epics.user_stories"
+        )
+        if paginate:
+            query = query.limit(story_limit + 1, foreign_table="epics.user_stories")
+
+    scope = query.single().execute().data
+    if scope and "ai_output_raw" in include:
+        scope["ai_output_raw"] = load_raw_output(scope_id)
+    if scope and paginate:
+        for epic in scope.get("epics") or []:
+            epic["user_stories"], epic["user_stories_next_cursor"] = keyset_page(
+                epic.get("user_stories") or [], story_limit, "order_index"
+            )
+    return scope
+
+
+def list_epic_stories(
+    scope_id: str,
+    epic_id: str,
+    cursor: tuple[str | int, str] | None = None,
+    limit: int = SCOPE_STORIES_PER_EPIC,
+) -> dict[str, Any]:
+    """One page of an epic's user stories in order. Raises LookupError if
+    the epic is not part of the scope."""
+    epic = (
+        supabase.table("epics")
+        .select("id")
+        .eq("id", epic_id)
+        .eq("scope_id", scope_id)
+        .maybe_single()
         .execute()
     )
-    return result.data
+    if not epic or not epic.data:
+        raise LookupError("Epic not found in this scope")
 
+    query = supabase.table("user_stories").select("*").eq("epic_id", epic_id)
+    if cursor:
+        query = after_cursor(query, cursor, "order_index", desc=False)
+    rows = query.order("order_index").order("id").limit(limit + 1).execute().data
+    stories, next_cursor = keyset_page(rows, limit, "order_index")
+    return {"user_stories": stories, "next_cursor": next_cursor}
 
-def list_scopes() -> list[dict[str, Any]]:
-    """List all scopes (summary fields only)."""
-    result = (
+
+def regenerate_epic(
+    scope_id: str,
+    epic_id: str,
+    stories_only: bool = False,
+    instructions: str | None = None,
+) -> dict[str, Any]:
+    """Regenerate one epic (or only its user stories) with the LLM.
+
+    The rest of the scope is sent as context and left untouched. The epic
+    keeps its id and order_index; its stories are replaced — new rows are
+    inserted before the old ones are deleted, so a failed write never leaves
+    the epic empty. Raises LookupError if the scope or epic is missing and
+    ValueError if the scope was already converted (its stories then belong
+    to milestones).
+    """
+    scope = (
         supabase.table("scopes")
-        .select("id, product_name, idea_text, status, created_at")
-        .order("created_at", desc=True)
+        .select(
+            "id, product_name, idea_text, target_audience, budget_range, "
+            "timeline_pressure, status, "
+            "epics(id, name, description, effort_days, order_index, user_stories(id, title))"
+        )
+        .eq("id", scope_id)
+        .maybe_single()
         .execute()
     )
-    return result.data
+    if not scope or not scope.data:
+        raise LookupError("Scope not found")
+    scope = scope.data
+    if scope["status"] == "converted":
+        raise ValueError("Converted scopes can no longer be regenerated")
+
+    epics = sorted(scope.pop("epics") or [], key=lambda e: e["order_index"])
+    epic = next((e for e in epics if e["id"] == epic_id), None)
+    if epic is None:
+        raise LookupError("Epic not found in this scope")
+    others = [e for e in epics if e["id"] != epic_id]
+
+    output = generate_epic(
+        EPIC_SYSTEM_PROMPT,
+        build_epic_prompt(scope, epic, others, stories_only, instructions),
+        stories_only=stories_only,
+    )
+
+    old_story_ids = [s["id"] for s in epic.get("user_stories") or []]
+    new_stories = [
+        {
+            "epic_id": epic_id,
+            "title": s.title,
+            "description": s.description,
+            "is_completed": False,
+            "order_index": s.order_index,
+        }
+        for s in output.user_stories
+    ]
+    stories = []
+    if new_stories:
+        stories = supabase.table("user_stories").insert(new_stories).execute().data
+    if old_story_ids:
+        supabase.table("user_stories").delete().in_("id", old_story_ids).execute()
+
+    updated = {k: v for k, v in epic.items() if k != "user_stories"}
+    if not stories_only:
+        changes = {
+            "name": output.name,
+            "description": output.description,
+            "effort_days": output.effort_days,
+        }
+        updated = supabase.table("epics").update(changes).eq("id", epic_id).execute().data[0]
+    updated["user_stories"] = stories
+
+    publish("epics", "update", epic_id, data={"scope_id": scope_id, "stories_only": stories_only})
+    return updated
+
+
+def scope_version(scope_id: str) -> list[dict[str, Any]]:
+    """Row versions behind get_scope — cheap input for its ETag."""
+    return (
+        supabase.table("scopes")
+        .select("updated_at, epics(id, user_stories(id, updated_at))")
+        .eq("id", scope_id)
+        .execute()
+    ).data
+
+
+def _library_query(
+    columns: str,
+    status: str | None,
+    prefix: str | None,
+    cursor: tuple[str, str] | None,
+    count: str | None = None,
+):
+    q = supabase.table("scopes").select(columns, count=count)
+    if status:
+        q = q.eq("status", status)
+    if prefix:
+        # Escape LIKE wildcards so the prefix matches literally
+        escaped = re.sub(r"([\\%_])", r"\\\1", prefix.replace("*", ""))
+        q = q.ilike("product_name", f"{escaped}%")
+    if cursor:
+        q = after_cursor(q, cursor, "created_at")
+    return q.order("created_at", desc=True).order("id", desc=True)
+
+
+def scopes_version(
+    status: str | None = None,
+    prefix: str | None = None,
+    cursor: tuple[str, str] | None = None,
+    limit: int = SCOPE_PAGE_SIZE,
+) -> list[dict[str, Any]]:
+    """Row versions behind one list_scopes page — cheap input for its ETag."""
+    return (
+        _library_query("id, updated_at", status, prefix, cursor).limit(limit + 1).execute()
+    ).data
+
+
+def list_scopes(
+    fields: list[str] | None = None,
+    truncate: int | None = None,
+    status: str | None = None,
+    prefix: str | None = None,
+    cursor: tuple[str, str] | None = None,
+    limit: int = SCOPE_PAGE_SIZE,
+) -> dict[str, Any]:
+    """One page of scopes, newest first (summary fields, or the requested
+    fieldset), filtered by status and case-insensitive name prefix.
+
+    Returns {scopes, next_cursor, total}. `total` is PostgREST's estimated
+    count (exact for small results, the planner's estimate for large ones)
+    and is only computed for the first page.
+    """
+    columns = list(dict.fromkeys([*(fields or SCOPE_LIST_FIELDS), "id", "created_at"]))
+    result = (
+        _library_query(
+            build_select(columns),
+            status,
+            prefix,
+            cursor,
+            count=None if cursor else "estimated",
+        )
+        .limit(limit + 1)
+        .execute()
+    )
+    rows, next_cursor = keyset_page(result.data, limit, "created_at")
+    return {
+        "scopes": truncate_fields(rows, ("idea_text",), truncate),
+        "next_cursor": next_cursor,
+        "total": result.count,
+    }
 
 
 def update_scope(scope_id: str, updates: dict[str, Any]) -> dict[str, Any]:
@@ -103,6 +383,9 @@ def update_scope(scope_id: str, updates: dict[str, Any]) -> dict[str, Any]:
     result = (
         supabase.table("scopes").update(filtered).eq("id", scope_id).execute()
     )
+    if result.data:
+        similarity_service.index.add(result.data[0])
+        publish("scopes", "update", scope_id, data=filtered)
     return result.data[0] if result.data else {}
 
 
@@ -122,7 +405,8 @@ def convert_scope_to_project(
     - Copies user_stories with milestone_id set
     - Auto-calculates start/due dates from cumulative effort_days
     """
-    scope = get_scope(scope_id)
+    # Every story moves to a milestone, so none may be left out
+    scope = get_scope(scope_id, story_limit=None)
     if not scope:
         raise ValueError("Scope not found")
     if scope.get("status") == "converted":
@@ -134,6 +418,65 @@ def convert_scope_to_project(
         else date.today()
     )
 
+    # Claim the scope with a conditional update so a concurrent conversion
+    # (e.g. on another instance) fails instead of creating a second project
+    claimed = (
+        supabase.table("scopes")
+        .update({"status": "converted"})
+        .eq("id", scope_id)
+        .neq("status", "converted")
+        .execute()
+    )
+    if not claimed.data:
+        raise ValueError("Scope already converted")
+
+    try:
+        project = _create_project_from_scope(scope, project_start)
+    except Exception:
+        try:
+            _discard_partial_project(scope_id)
+        except Exception as e:
+            # The scope stays converted, matching the project that is left
+            logger.error("Cleaning up the failed conversion of %s failed: %s", scope_id, e)
+            raise
+        supabase.table("scopes").update({"status": scope["status"]}).eq(
+            "id", scope_id
+        ).execute()
+        raise
+
+    publish("scopes", "update", scope_id, data={"status": "converted"})
+    publish("projects", "insert", project["id"], project["id"], {
+        "name": project["name"], "scope_id": scope_id,
+    })
+    return project
+
+
+def _discard_partial_project(scope_id: str) -> None:
+    """Remove what a failed conversion created: the project (milestones and
+    dependencies cascade), after unlinking the stories moved onto it."""
+    project_ids = [
+        p["id"]
+        for p in supabase.table("projects").select("id").eq("scope_id", scope_id).execute().data
+    ]
+    if not project_ids:
+        return
+    milestone_ids = [
+        m["id"]
+        for m in supabase.table("milestones").select("id").in_("project_id", project_ids).execute().data
+    ]
+    if milestone_ids:
+        supabase.table("user_stories").update({"milestone_id": None}).in_(
+            "milestone_id", milestone_ids
+        ).execute()
+    supabase.table("projects").delete().in_("id", project_ids).execute()
+
+
+def _create_project_from_scope(
+    scope: dict[str, Any], project_start: date
+) -> dict[str, Any]:
+    """Insert the project, milestones and story links for a claimed scope."""
+    scope_id = scope["id"]
+
     # Create the project
     project_data = {
         "scope_id": scope_id,
@@ -154,13 +497,17 @@ def convert_scope_to_project(
         effort_days = epic.get("effort_days", 7)
         milestone_due = current_start + timedelta(days=effort_days)
 
+        stories = epic.get("user_stories", [])
+        completed = sum(1 for story in stories if story.get("is_completed"))
         milestone_data = {
             "project_id": project["id"],
             "epic_id": epic["id"],
             "name": epic["name"],
             "description": epic.get("description", ""),
             "status": "not_started",
-            "progress_percent": 0,
+            "progress_percent": derive_progress(completed, len(stories)),
+            "stories_total": len(stories),
+            "stories_completed": completed,
             "start_date": current_start.isoformat(),
             "due_date": milestone_due.isoformat(),
             "order_index": idx,
@@ -171,7 +518,6 @@ def convert_scope_to_project(
         milestone = ms_result.data[0]
 
         # Copy user stories with milestone_id
-        stories = epic.get("user_stories", [])
         for story in stories:
             supabase.table("user_stories").update(
                 {"milestone_id": milestone["id"]}
@@ -181,10 +527,9 @@ def convert_scope_to_project(
         milestones_out.append(milestone)
         current_start = milestone_due
 
-    # Mark scope as converted
-    supabase.table("scopes").update({"status": "converted"}).eq(
-        "id", scope_id
-    ).execute()
+    # Each milestone follows the previous one, so moving a due date later
+    # shifts everything after it
+    chain_dependencies(project["id"], [m["id"] for m in milestones_out])
 
     project["milestones"] = milestones_out
     return project
@@ -0,0 +1,232 @@
+"""In-process similarity index over scopes, for reusing past generations.
+
+Each scope is turned into a sparse hashed TF-IDF vector from its product
+name (weighted double), idea text, audience, budget and timeline. Terms are
+word unigrams and bigrams hashed into N_FEATURES buckets with CRC32, so the
+vectors are stable across processes and need no stored vocabulary.
+
+The index is an inverted list of buckets → (scope, term frequency). Document
+frequencies are kept as counters, so adding a scope is incremental; IDF
+weights are applied at query time, to the candidates that share at least
+one term with the query. A document's norm depends on the IDF of all its
+terms, so each document keeps three sums from which its norm under the
+current IDF follows in constant time (see `_norm`); they are adjusted only
+for documents sharing a term whose document frequency changed. Writes in this process update the index directly;
+scopes created, edited or archived by other processes are picked up by a
+periodic catch-up query on updated_at.
+"""
+
+import math
+import re
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict
+from typing import Any
+
+from app.db import supabase
+from app.utils.pagination import paged
+
+N_FEATURES = 1 << 20
+REFRESH_SECONDS = 60
+# Catch-ups larger than this rebuild all norm sums once instead of
+# adjusting them scope by scope
+BULK_REINDEX_ROWS = 100
+INDEX_COLUMNS = "id, product_name, idea_text, target_audience, budget_range, timeline_pressure, status, updated_at"
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have i in is it its of on or so that "
+    "the their them they this to was we will with you your app platform".split()
+)
+
+
+def _stem(word: str) -> str:
+    """Fold plurals so "invoices" matches "invoice"."""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _terms(scope: dict[str, Any]) -> Counter[int]:
+    """Hashed term counts for a scope's identifying fields."""
+    counts: Counter[int] = Counter()
+    for field, weight in (("product_name", 2), ("idea_text", 1), ("target_audience", 1)):
+        words = [
+            _stem(w) for w in _WORD.findall((scope.get(field) or "").lower())
+            if w not in _STOPWORDS
+        ]
+        grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for gram in grams:
+            counts[zlib.crc32(gram.encode()) % N_FEATURES] += weight
+    # Categorical fields are single tokens, so "low" budget only matches budget
+    for field in ("budget_range", "timeline_pressure"):
+        if scope.get(field):
+            counts[zlib.crc32(f"{field}={scope[field]}".encode()) % N_FEATURES] += 1
+    return counts
+
+
+def _tf(counts: Counter[int]) -> dict[int, float]:
+    return {term: 1 + math.log(n) for term, n in counts.items()}
+
+
+class ScopeIndex:
+    """Incremental hashed TF-IDF index with cosine-similarity search."""
+
+    def __init__(self):
+        self._docs: dict[str, dict[int, float]] = {}
+        self._postings: dict[int, dict[str, float]] = defaultdict(dict)
+        self._df: Counter[int] = Counter()
+        # Per document: sum(w²), sum(w²·b) and sum(w²·b²) with b = ln(1 + df)
+        self._sums: dict[str, list[float]] = {}
+        self._lock = threading.RLock()
+        self._loaded_until: str | None = None
+        self._refreshed_at = 0.0
+
+    def add(self, scope: dict[str, Any]) -> None:
+        """Index (or re-index) a scope. Archived scopes are removed."""
+        with self._lock:
+            self._add(scope, track_norms=True)
+
+    def _add(self, scope: dict[str, Any], track_norms: bool) -> None:
+        """Without `track_norms`, other documents' sums go stale and must be
+        rebuilt with `_rebuild_sums` (cheaper when loading many scopes)."""
+        self.remove(scope["id"])
+        if scope.get("status") == "archived":
+            return
+        vector = _tf(_terms(scope))
+        self._docs[scope["id"]] = vector
+        for term, weight in vector.items():
+            if track_norms:
+                self._shift_df(term, 1)
+            else:
+                self._df[term] += 1
+            self._postings[term][scope["id"]] = weight
+        self._sums[scope["id"]] = self._doc_sums(vector)
+
+    def remove(self, scope_id: str) -> None:
+        with self._lock:
+            vector = self._docs.pop(scope_id, None)
+            self._sums.pop(scope_id, None)
+            for term in vector or ():
+                self._postings[term].pop(scope_id, None)
+                self._shift_df(term, -1)
+
+    def _shift_df(self, term: int, delta: int) -> None:
+        """Change a term's document frequency and the sums of the documents
+        that contain it."""
+        old_b = math.log(1 + self._df[term])
+        self._df[term] += delta
+        new_b = math.log(1 + self._df[term])
+        for scope_id, weight in self._postings[term].items():
+            sums = self._sums[scope_id]
+            sums[1] += weight * weight * (new_b - old_b)
+            sums[2] += weight * weight * (new_b * new_b - old_b * old_b)
+
+    def _doc_sums(self, vector: dict[int, float]) -> list[float]:
+        sums = [0.0, 0.0, 0.0]
+        for term, weight in vector.items():
+            b = math.log(1 + self._df[term])
+            sums[0] += weight * weight
+            sums[1] += weight * weight * b
+            sums[2] += weight * weight * b * b
+        return sums
+
+    def _rebuild_sums(self) -> None:
+        self._sums = {scope_id: self._doc_sums(v) for scope_id, v in self._docs.items()}
+
+    def _idf(self, term: int) -> float:
+        return math.log((1 + len(self._docs)) / (1 + self._df[term])) + 1
+
+    def _norm(self, scope_id: str) -> float:
+        """Norm of a document's TF-IDF vector under the current IDF.
+
+        With idf = a - b, a = ln(1 + N) + 1 and b = ln(1 + df), the squared
+        norm sum(w²·(a - b)²) expands to a²·sum(w²) - 2a·sum(w²·b) + sum(w²·b²).
+        """
+        s0, s1, s2 = self._sums[scope_id]
+        a = math.log(1 + len(self._docs)) + 1
+        return math.sqrt(max(a * a * s0 - 2 * a * s1 + s2, 0.0))
+
+    def search(
+        self, query: dict[str, Any], limit: int = 5, exclude: str | None = None
+    ) -> list[tuple[str, float]]:
+        """Most similar scope IDs with cosine similarity in [0, 1]."""
+        self._refresh()
+        q = _tf(_terms(query))
+        with self._lock:
+            idf = {term: self._idf(term) for term in q}
+            q_norm = math.sqrt(sum((w * idf[t]) ** 2 for t, w in q.items()))
+            if not q_norm:
+                return []
+
+            dots: Counter[str] = Counter()
+            for term, qw in q.items():
+                for scope_id, dw in self._postings.get(term, {}).items():
+                    dots[scope_id] += qw * dw * idf[term] ** 2
+            dots.pop(exclude, None)
+
+            scored = [
+                (scope_id, min(dot / (q_norm * self._norm(scope_id)), 1.0))
+                for scope_id, dot in dots.items()
+            ]
+        scored.sort(key=lambda s: s[1], reverse=True)
+        return scored[:limit]
+
+    def _refresh(self) -> None:
+        """Load the index on first use, then catch up on changed scopes."""
+        if time.monotonic() - self._refreshed_at < REFRESH_SECONDS:
+            return
+        with self._lock:
+            if time.monotonic() - self._refreshed_at < REFRESH_SECONDS:
+                return
+            since = self._loaded_until
+
+            def query():
+                q = supabase.table("scopes").select(INDEX_COLUMNS)
+                if since is None:
+                    q = q.neq("status", "archived")
+                else:
+                    # Includes archived rows, so add() drops them
+                    q = q.gt("updated_at", since)
+                return q.order("updated_at").order("id")
+
+            scopes = paged(query)
+            bulk = since is None
+            if not bulk:
+                scopes = list(scopes)
+                bulk = len(scopes) > BULK_REINDEX_ROWS
+            for scope in scopes:
+                self._add(scope, track_norms=not bulk)
+                self._loaded_until = max(self._loaded_until or "", scope["updated_at"])
+            if bulk:
+                self._rebuild_sums()
+            self._refreshed_at = time.monotonic()
+
+
+index = ScopeIndex()
+
+
+def find_similar(
+    query: dict[str, Any], limit: int = 5, exclude: str | None = None
+) -> list[dict[str, Any]]:
+    """Nearest scopes to `query` (same fields as a generate request).
+
+    Returns [{id, product_name, idea_text, status, similarity}], best first.
+    """
+    matches = index.search(query, limit, exclude)
+    if not matches:
+        return []
+    rows = {
+        r["id"]: r
+        for r in supabase.table("scopes")
+        .select("id, product_name, idea_text, status")
+        .in_("id", [scope_id for scope_id, _ in matches])
+        .execute()
+        .data
+    }
+    return [
+        {**rows[scope_id], "similarity": round(score, 4)}
+        for scope_id, score in matches
+        if scope_id in rows
+    ]
@@ -0,0 +1,273 @@
+"""Bulk user story operations.
+
+A bulk request is a list of per-story operations — complete or uncomplete,
+edit title/description, move to another milestone, delete. However many
+stories it touches, it is applied with a fixed set of queries:
+
+1. one read of the stories and one of the milestones involved
+2. one conditional update per completion state, so a story only counts as
+   toggled if it actually changed (as in PATCH /user-stories/<id>)
+3. one delete, plus one insert of its tombstones
+4. one update per distinct edit of title/description, writing only the
+   edited columns
+
+followed by one story count adjustment per affected milestone. Moves are
+the exception: each moved story gets its own update (it is appended at the
+end of its new milestone, after one order_index lookup per milestone),
+conditional on it still being in the milestone it was read from, so the
+count deltas stay correct.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any
+
+from app.db import supabase
+from app.services.analytics_service import invalidate_milestone
+from app.services.change_feed import publish
+from app.services.progress_service import adjust_story_counts
+from app.services.sync_service import record_deletions
+
+MAX_BULK_STORIES = 200
+EDITABLE_FIELDS = {"title", "description", "milestone_id"}
+BULK_FIELDS = EDITABLE_FIELDS | {"is_completed", "delete"}
+
+
+def parse_operations(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Normalize a bulk request into one operation per story.
+
+    Accepts `{"ids": [...], "patch": {...}}` (the same patch for every story)
+    or `{"items": [{"id": ..., **patch}]}`. Raises ValueError when invalid.
+    """
+    if "items" in data:
+        items = data["items"]
+        if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+            raise ValueError("'items' must be an array of objects")
+        ops = [dict(i) for i in items]
+    else:
+        ids, patch = data.get("ids"), data.get("patch")
+        if not isinstance(ids, list) or not isinstance(patch, dict):
+            raise ValueError("Provide 'ids' with a 'patch', or 'items'")
+        ops = [{**patch, "id": story_id} for story_id in ids]
+
+    if not ops:
+        raise ValueError("No user stories given")
+    if len(ops) > MAX_BULK_STORIES:
+        raise ValueError(f"At most {MAX_BULK_STORIES} user stories per request")
+
+    seen = set()
+    for idx, op in enumerate(ops):
+        story_id = op.get("id")
+        if not isinstance(story_id, str) or not story_id:
+            raise ValueError(f"Item {idx} must have an 'id'")
+        if story_id in seen:
+            raise ValueError(f"User story '{story_id}' appears more than once")
+        seen.add(story_id)
+
+        fields = set(op) - {"id"}
+        if not fields:
+            raise ValueError(f"Item {idx} has no fields to change")
+        unknown = fields - BULK_FIELDS
+        if unknown:
+            raise ValueError(f"Item {idx} has unknown fields: {sorted(unknown)}")
+        if "delete" in op and (op["delete"] is not True or len(fields) > 1):
+            raise ValueError(f"Item {idx}: 'delete' must be true and the only field")
+        if "is_completed" in op and not isinstance(op["is_completed"], bool):
+            raise ValueError(f"Item {idx}: 'is_completed' must be a boolean")
+        for field in ("title", "milestone_id"):
+            if field in op and (not isinstance(op[field], str) or not op[field].strip()):
+                raise ValueError(f"Item {idx}: '{field}' must be a non-empty string")
+        if "description" in op and not isinstance(op["description"], str):
+            raise ValueError(f"Item {idx}: 'description' must be a string")
+    return ops
+
+
+def _error(story_id: str, code: int, message: str) -> dict[str, Any]:
+    return {"id": story_id, "status": code, "error": message}
+
+
+def _toggle(ops: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Apply completion changes; returns the rows that actually flipped."""
+    now = datetime.now(timezone.utc).isoformat()
+    flipped = {}
+    for value in (True, False):
+        ids = [op["id"] for op in ops if op.get("is_completed") is value]
+        if not ids:
+            continue
+        rows = (
+            supabase.table("user_stories")
+            .update({"is_completed": value, "completed_at": now if value else None})
+            .in_("id", ids)
+            .neq("is_completed", value)
+            .execute()
+        ).data
+        flipped.update({r["id"]: r for r in rows})
+    return flipped
+
+
+def _next_order_index(milestone_id: str, cache: dict[str, int]) -> int:
+    """Next free order_index at the end of a milestone's stories."""
+    if milestone_id not in cache:
+        last = (
+            supabase.table("user_stories")
+            .select("order_index")
+            .eq("milestone_id", milestone_id)
+            .order("order_index", desc=True)
+            .limit(1)
+            .execute()
+        ).data
+        cache[milestone_id] = (last[0].get("order_index") or 0) + 1 if last else 0
+    else:
+        cache[milestone_id] += 1
+    return cache[milestone_id]
+
+
+def apply_operations(ops: list[dict[str, Any]]) -> dict[str, Any]:
+    """Apply parsed operations.
+
+    Returns `{"results": [...], "milestones": [...]}`: one result per
+    operation, in order — `{id, status: 200, user_story}` (or `deleted: true`)
+    on success, `{id, status, error}` otherwise — and the new counts and
+    progress of every milestone whose stories changed.
+    """
+    ids = [op["id"] for op in ops]
+    stories = {
+        s["id"]: s
+        for s in supabase.table("user_stories").select("*").in_("id", ids).execute().data
+    }
+    milestone_ids = {op["milestone_id"] for op in ops if "milestone_id" in op}
+    milestone_ids |= {s["milestone_id"] for s in stories.values() if s.get("milestone_id")}
+    projects = {
+        m["id"]: m["project_id"]
+        for m in (
+            supabase.table("milestones")
+            .select("id, project_id")
+            .in_("id", list(milestone_ids))
+            .execute()
+        ).data
+    } if milestone_ids else {}
+
+    results: dict[str, dict[str, Any]] = {}
+    live = []
+    for op in ops:
+        story = stories.get(op["id"])
+        target = op.get("milestone_id")
+        if story is None:
+            results[op["id"]] = _error(op["id"], 404, "User story not found")
+        elif target and target not in projects:
+            results[op["id"]] = _error(op["id"], 404, "Milestone not found")
+        elif target and projects.get(story.get("milestone_id")) != projects[target]:
+            results[op["id"]] = _error(
+                op["id"], 422, "User stories can only move between milestones of the same project"
+            )
+        else:
+            live.append(op)
+
+    flipped = _toggle(live)
+
+    delete_ids = [op["id"] for op in live if op.get("delete")]
+    deleted = {}
+    if delete_ids:
+        deleted = {
+            r["id"]: r
+            for r in supabase.table("user_stories").delete().in_("id", delete_ids).execute().data
+        }
+        record_deletions("user_stories", [
+            (r["id"], projects.get(r.get("milestone_id"))) for r in deleted.values()
+        ])
+
+    # Only the edited columns are written. Stories with the same edit share
+    # one update; moves are one conditional update each.
+    order_cache: dict[str, int] = {}
+    written: dict[str, dict[str, Any]] = {}
+    conflicts: set[str] = set()
+    same_edit: dict[tuple, list[str]] = defaultdict(list)
+    for op in live:
+        story = stories[op["id"]]
+        edits = {k: v for k, v in op.items() if k in EDITABLE_FIELDS}
+        if edits.get("milestone_id") == story.get("milestone_id"):
+            edits.pop("milestone_id")
+        if "milestone_id" in edits:
+            edits["order_index"] = _next_order_index(edits["milestone_id"], order_cache)
+            rows = (
+                supabase.table("user_stories")
+                .update(edits)
+                .eq("id", op["id"])
+                .eq("milestone_id", story["milestone_id"])
+                .execute()
+            ).data
+            if rows:
+                written[op["id"]] = rows[0]
+            else:
+                conflicts.add(op["id"])
+        elif edits:
+            same_edit[tuple(sorted(edits.items()))].append(op["id"])
+    for edit, story_ids in same_edit.items():
+        rows = (
+            supabase.table("user_stories").update(dict(edit)).in_("id", story_ids).execute()
+        ).data
+        written.update({r["id"]: r for r in rows})
+    missing = {story_id for group in same_edit.values() for story_id in group} - written.keys()
+
+    # Net count deltas per milestone: every story leaves its old milestone
+    # and joins its new one, with its completion state before and after
+    deltas: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    current: dict[str, dict[str, Any]] = {}
+    for op in live:
+        story_id = op["id"]
+        story = stories[story_id]
+        if op.get("delete"):
+            if story_id not in deleted:
+                results[story_id] = _error(story_id, 404, "User story not found")
+                continue
+            results[story_id] = {"id": story_id, "status": 200, "deleted": True}
+            before, after = deleted[story_id]["is_completed"], None
+            old_milestone, new_milestone = deleted[story_id].get("milestone_id"), None
+        elif story_id in missing:
+            # Deleted since it was read; its delete adjusted the counts
+            results[story_id] = _error(story_id, 404, "User story not found")
+            continue
+        else:
+            current[story_id] = {**story, **flipped.get(story_id, {}), **written.get(story_id, {})}
+            if story_id in conflicts:
+                # A completion change may still have been applied
+                results[story_id] = _error(
+                    story_id, 409, "User story was moved or deleted concurrently; please retry"
+                )
+            else:
+                results[story_id] = {"id": story_id, "status": 200, "user_story": current[story_id]}
+            after = current[story_id]["is_completed"]
+            before = (not after) if story_id in flipped else after
+            # Where the story was when it was toggled (or read), which is
+            # where its move was conditioned to start from
+            old_milestone = flipped.get(story_id, story).get("milestone_id")
+            new_milestone = current[story_id].get("milestone_id")
+
+        if old_milestone:
+            deltas[old_milestone][0] -= 1
+            deltas[old_milestone][1] -= int(before)
+        if new_milestone:
+            deltas[new_milestone][0] += 1
+            deltas[new_milestone][1] += int(bool(after))
+
+    milestones = []
+    for milestone_id, (total_delta, completed_delta) in deltas.items():
+        adjusted = adjust_story_counts(milestone_id, total_delta, completed_delta)
+        if adjusted:
+            milestones.append(adjusted)
+        invalidate_milestone(milestone_id)
+
+    for op in live:
+        result = results[op["id"]]
+        story = stories[op["id"]]
+        if result.get("deleted"):
+            publish("user_stories", "delete", op["id"], projects.get(story.get("milestone_id")))
+        elif op["id"] in current and story.get("milestone_id"):
+            changes = {k: v for k, v in current[op["id"]].items() if story.get(k) != v}
+            if changes:
+                publish(
+                    "user_stories", "update", op["id"],
+                    projects.get(story["milestone_id"]), changes,
+                )
+
+    return {"results": [results[story_id] for story_id in ids], "milestones": milestones}
@@ -0,0 +1,164 @@
+"""Portfolio-wide weekly summary runs — bounded concurrency, LLM rate
+limiting, and resumable progress."""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from app.db import supabase
+from app.services.summary_service import generate_summary
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _Progress:
+    """Run progress persisted to a JSON file after every project."""
+
+    def __init__(self, path: str, run_id: str, resume: bool):
+        self.path = path
+        self.run_id = run_id
+        self.done: list[str] = []
+        self.failed: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            if state.get("run_id") == run_id:
+                self.done = state.get("done", [])
+
+    def record(self, project_id: str, error: str | None = None) -> None:
+        with self._lock:
+            if error is None:
+                self.done.append(project_id)
+                self.failed.pop(project_id, None)
+            else:
+                self.failed[project_id] = error
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(
+                    {"run_id": self.run_id, "done": self.done, "failed": self.failed}, f
+                )
+            os.replace(tmp, self.path)
+
+
+def _active_project_ids() -> list[str]:
+    rows = (
+        supabase.table("projects")
+        .select("id")
+        .eq("status", "active")
+        .order("created_at")
+        .execute()
+    ).data
+    return [r["id"] for r in rows]
+
+
+def run_summary_batch(
+    tone: str = "executive",
+    max_workers: int = 4,
+    rate_per_minute: float = 30,
+    state_path: str = "summary_batch_state.json",
+    resume: bool = True,
+) -> dict[str, Any]:
+    """Generate summaries for every active project.
+
+    At most `max_workers` projects run at once and LLM calls are limited to
+    `rate_per_minute`. Progress is keyed by week and tone, so re-running an
+    interrupted run skips projects that already have this week's summary.
+    Summaries are persisted through `generate_summary`.
+    """
+    week_of = date.today() - timedelta(days=date.today().weekday())
+    progress = _Progress(state_path, f"{week_of.isoformat()}:{tone}", resume)
+    bucket = TokenBucket(rate_per_minute / 60, capacity=max_workers)
+
+    done = set(progress.done)
+    pending = [pid for pid in _active_project_ids() if pid not in done]
+    logger.info(
+        "Summary batch %s: %d pending, %d already done",
+        progress.run_id, len(pending), len(progress.done),
+    )
+
+    def _run(project_id: str) -> None:
+        bucket.acquire()
+        generate_summary(project_id, tone)
+
+    already_done = len(progress.done)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_run, pid): pid for pid in pending}
+        for future in as_completed(futures):
+            project_id = futures[future]
+            try:
+                future.result()
+                progress.record(project_id)
+            except Exception as e:
+                logger.error("Summary for project %s failed: %s", project_id, e)
+                progress.record(project_id, error=str(e))
+
+    return {
+        "run_id": progress.run_id,
+        "generated": len(progress.done) - already_done,
+        "skipped": already_done,
+        "failed": progress.failed,
+    }
+
+
+def start_weekly_scheduler(
+    weekday: int = 0, hour: int = 6, **batch_kwargs: Any
+) -> threading.Thread:
+    """Run `run_summary_batch` every week on `weekday` (0 = Monday) at `hour`.
+
+    Runs in a daemon thread in the current process.
+    """
+
+    def _next_run(now: datetime) -> datetime:
+        days_ahead = (weekday - now.weekday()) % 7
+        candidate = (now + timedelta(days=days_ahead)).replace(
+            hour=hour, minute=0, second=0, microsecond=0
+        )
+        return candidate if candidate > now else candidate + timedelta(days=7)
+
+    def _loop() -> None:
+        while True:
+            target = _next_run(datetime.now())
+            logger.info("Next summary batch at %s", target.isoformat())
+            time.sleep(max(0.0, (target - datetime.now()).total_seconds()))
+            try:
+                report = run_summary_batch(**batch_kwargs)
+                logger.info("Summary batch finished: %s", report)
+            except Exception as e:
+                logger.error("Summary batch failed: %s", e)
+
+    thread = threading.Thread(target=_loop, name="summary-scheduler", daemon=True)
+    thread.start()
+    return thread
@@ -1,16 +1,95 @@
 """Weekly summary generation logic."""
 
+import hashlib
+import json
+from collections.abc import Callable
 from datetime import date, timedelta
 from typing import Any
 
 from app.db import supabase
+from config import Config
+from app.services.llm_service import SUMMARY_TIERS
 from app.services.llm_service import generate_summary as llm_generate_summary
-from app.utils.prompt_builder import build_summary_prompt
+from app.utils import metrics
+from app.utils.prompt_budget import compact_updates, estimate_tokens
+from app.utils.prompt_builder import (
+    build_summary_extension_prompt,
+    build_summary_prompt,
+)
 
+# Extend the previous summary instead of regenerating when at most this
+# many updates were logged since it was written
+EXTEND_MAX_NEW_UPDATES = 5
 
-def generate_summary(project_id: str, tone: str = "executive") -> dict[str, Any]:
-    """Gather last 7 days of updates, call LLM, persist and return summary."""
+# Whole-prompt token budget (updates are compacted to fit), and the largest
+# prompt that is sent to the small model tier
+PROMPT_BUDGET_TOKENS = Config.SUMMARY_PROMPT_BUDGET_TOKENS
+SMALL_TIER_MAX_TOKENS = Config.SUMMARY_SMALL_TIER_MAX_TOKENS
 
+
+def _fingerprint(milestones: list[dict[str, Any]], update_ids: list[str]) -> str:
+    """Stable hash of the summary inputs: milestone states + update IDs."""
+    payload = {
+        "milestones": [
+            [m["id"], m["status"], m["progress_percent"], m["due_date"]]
+            for m in sorted(milestones, key=lambda m: m["id"])
+        ],
+        "updates": sorted(update_ids),
+    }
+    return hashlib.sha256(
+        json.dumps(payload, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+
+
+def _budgeted_prompt(
+    build: Callable[[str], tuple[str, str]], updates: list[dict[str, Any]]
+) -> tuple[str, str, dict[str, Any]]:
+    """Build prompts with the updates compacted to fit PROMPT_BUDGET_TOKENS.
+
+    `build(updates_text)` returns (system_prompt, user_prompt). Also returns
+    generation metadata: the model tier chosen by prompt size, the estimated
+    prompt tokens and what compaction did.
+    """
+    overhead = sum(estimate_tokens(p) for p in build(""))
+    updates_text, stats = compact_updates(
+        [
+            {
+                "milestone": u.get("milestones", {}).get("name", "Unknown"),
+                "update_type": u["update_type"],
+                "content": u["content"],
+            }
+            for u in updates
+        ],
+        max(PROMPT_BUDGET_TOKENS - overhead, 0),
+    )
+    system_prompt, user_prompt = build(updates_text)
+    tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+    tier = "small" if tokens <= SMALL_TIER_MAX_TOKENS else "large"
+    return system_prompt, user_prompt, {
+        "tier": tier,
+        "model": SUMMARY_TIERS[tier]["model"],
+        "prompt_tokens": tokens,
+        **stats,
+    }
+
+
+def _latest_summary(project_id: str, tone: str) -> dict[str, Any] | None:
+    rows = (
+        supabase.table("summaries")
+        .select("*")
+        .eq("project_id", project_id)
+        .eq("tone", tone)
+        .order("generated_at", desc=True)
+        .limit(1)
+        .execute()
+    ).data
+    return rows[0] if rows else None
+
+
+def _load_inputs(
+    project_id: str,
+) -> tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]], date]:
+    """Fetch the project, its milestones and the last 7 days of updates."""
     # Fetch project
     project = (
         supabase.table("projects")
@@ -44,29 +123,72 @@ def generate_summary(project_id: str, tone: str = "executive") -> dict[str, Any]
             .execute()
         ).data
 
+    return project, milestones, updates, week_start
+
+
+def generate_summary(
+    project_id: str, tone: str = "executive", extend: bool = False
+) -> dict[str, Any]:
+    """Gather last 7 days of updates, call LLM, persist and return summary.
+
+    If the inputs (milestone states + update IDs) match the latest summary
+    for this tone, that summary is returned as-is without an LLM call
+    (`reused: True`). With `extend=True`, a handful of new updates are
+    worked into the previous summary instead of regenerating from scratch.
+    """
+    project, milestones, updates, week_start = _load_inputs(project_id)
+
+    update_ids = [u["id"] for u in updates]
+    fingerprint = _fingerprint(milestones, update_ids)
+
+    previous = _latest_summary(project_id, tone)
+    if previous and previous.get("input_fingerprint") == fingerprint:
+        return {**previous, "reused": True}
+
     # Format milestone statuses for prompt
     milestone_statuses = "\n".join(
         f"- {m['name']}: {m['status']} ({m['progress_percent']}% done, due {m['due_date']})"
         for m in milestones
     )
 
-    # Format updates for prompt
-    updates_formatted = "\n".join(
-        f"- [{u.get('milestones', {}).get('name', 'Unknown')}] "
-        f"({u['update_type']}) {u['content']}"
-        for u in updates
-    ) or "No updates logged this week."
-
-    # Build prompts and call LLM
-    system_prompt, user_prompt = build_summary_prompt(
-        project_name=project["name"],
-        description=project.get("description", ""),
-        week_start=week_start.isoformat(),
-        milestone_statuses=milestone_statuses,
-        updates_formatted=updates_formatted,
-        tone=tone,
+    previous_ids = set((previous or {}).get("source_update_ids") or [])
+    new_updates = [u for u in updates if u["id"] not in previous_ids]
+    can_extend = (
+        extend
+        and previous is not None
+        and previous.get("source_update_ids") is not None
+        and previous_ids <= set(update_ids)
+        and 0 < len(new_updates) <= EXTEND_MAX_NEW_UPDATES
     )
-    content = llm_generate_summary(system_prompt, user_prompt)
+
+    # Build prompts within the token budget and call LLM on the chosen tier
+    if can_extend:
+        system_prompt, user_prompt, generation = _budgeted_prompt(
+            lambda updates_text: build_summary_extension_prompt(
+                project_name=project["name"],
+                previous_summary=previous["content"],
+                milestone_statuses=milestone_statuses,
+                new_updates_formatted=updates_text,
+                tone=tone,
+            ),
+            new_updates,
+        )
+    else:
+        system_prompt, user_prompt, generation = _budgeted_prompt(
+            lambda updates_text: build_summary_prompt(
+                project_name=project["name"],
+                description=project.get("description", ""),
+                week_start=week_start.isoformat(),
+                milestone_statuses=milestone_statuses,
+                updates_formatted=updates_text or "No updates logged this week.",
+                tone=tone,
+            ),
+            updates,
+        )
+    generation["mode"] = "extend" if can_extend else "full"
+    content = llm_generate_summary(system_prompt, user_prompt, tier=generation["tier"])
+    metrics.incr(f"summary.tier.{generation['tier']}")
+    metrics.incr("summary.prompt_tokens", generation["prompt_tokens"])
 
     # Persist the summary
     summary_data = {
@@ -74,6 +196,9 @@ def generate_summary(project_id: str, tone: str = "executive") -> dict[str, Any]
         "content": content,
         "tone": tone,
         "week_start": week_start.isoformat(),
+        "input_fingerprint": fingerprint,
+        "source_update_ids": update_ids,
+        "generation": generation,
     }
     result = supabase.table("summaries").insert(summary_data).execute()
-    return result.data[0]
+    return {**result.data[0], "reused": False}
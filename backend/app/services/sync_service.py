@@ -0,0 +1,161 @@
+"""Delta sync — rows created, updated or deleted since a client's last sync.
+
+Changed rows are found through each table's change timestamp; deletes are
+recorded as rows in `tombstones`. Deleting a project or milestone cascades
+to its children in the database, but only the parent gets a tombstone —
+clients drop the children of a deleted parent themselves.
+
+Sync tokens are opaque to clients. Each one encodes the server time the
+sync started, minus a small overlap so rows committed by transactions that
+were still in flight are picked up next time (clients upsert by id, so a
+row arriving twice is harmless).
+"""
+
+import base64
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from app.db import supabase
+from app.utils.pagination import paged
+
+# Synced tables and the column that moves when a row is written.
+# Updates are append-only, so their creation time is enough.
+SYNC_TABLES = {
+    "projects": "updated_at",
+    "team_members": "updated_at",
+    "milestones": "updated_at",
+    "user_stories": "updated_at",
+    "updates": "created_at",
+}
+
+SYNC_OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+# ── Tombstones ──
+
+def record_deletion(table: str, row_id: str, project_id: str | None) -> None:
+    """Remember that a synced row was deleted."""
+    supabase.table("tombstones").insert({
+        "table_name": table,
+        "row_id": row_id,
+        "project_id": project_id,
+    }).execute()
+
+
+def record_deletions(table: str, rows: list[tuple[str, str | None]]) -> None:
+    """Remember several deleted rows, given as (row_id, project_id), at once."""
+    if rows:
+        supabase.table("tombstones").insert([
+            {"table_name": table, "row_id": row_id, "project_id": project_id}
+            for row_id, project_id in rows
+        ]).execute()
+
+
+# ── Tokens ──
+
+def encode_token(at: datetime) -> str:
+    return base64.urlsafe_b64encode(at.isoformat().encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> datetime:
+    """Raises ValueError for malformed tokens."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        at = datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode())
+    except ValueError as e:
+        raise ValueError("Invalid sync token") from e
+    if at.tzinfo is None:
+        raise ValueError("Invalid sync token")
+    return at
+
+
+# ── Sync ──
+
+def _changed_rows(
+    table: str,
+    since: str | None,
+    project_id: str | None,
+    milestone_ids: list[str] | None,
+) -> list[dict[str, Any]]:
+    column = SYNC_TABLES[table]
+
+    def query():
+        q = supabase.table(table).select("*")
+        if project_id is not None:
+            if table == "projects":
+                q = q.eq("id", project_id)
+            elif table in ("team_members", "milestones"):
+                q = q.eq("project_id", project_id)
+            else:
+                q = q.in_("milestone_id", milestone_ids)
+        elif table == "user_stories":
+            # Stories of unconverted scopes are not part of any project
+            q = q.not_.is_("milestone_id", "null")
+        if since is not None:
+            q = q.gt(column, since)
+        return q.order(column).order("id")
+
+    if project_id is not None and table in ("user_stories", "updates") and not milestone_ids:
+        return []
+    return list(paged(query))
+
+
+def _deleted_ids(since: str, project_id: str | None) -> dict[str, list[str]]:
+    def query():
+        q = supabase.table("tombstones").select("table_name, row_id").gt("deleted_at", since)
+        if project_id is not None:
+            q = q.eq("project_id", project_id)
+        return q.order("deleted_at").order("row_id")
+
+    deleted: dict[str, list[str]] = {table: [] for table in SYNC_TABLES}
+    for row in paged(query):
+        if row["table_name"] in deleted:
+            deleted[row["table_name"]].append(row["row_id"])
+    return deleted
+
+
+def sync(since_token: str | None, project_id: str | None = None) -> dict[str, Any]:
+    """Rows changed and IDs deleted since `since_token`, plus the next token.
+
+    Without a token — or when the token is older than the tombstone
+    retention window — every row is returned and `full` is True, meaning
+    the client should replace its cached collections rather than merge.
+    Scoped to one project when `project_id` is given.
+    """
+    now = datetime.now(timezone.utc)
+    since = decode_token(since_token) if since_token else None
+    if since is not None and now - since > TOMBSTONE_RETENTION:
+        since = None
+    since_iso = since.isoformat() if since else None
+
+    milestone_ids = None
+    if project_id is not None:
+        milestone_ids = [
+            m["id"]
+            for m in supabase.table("milestones")
+            .select("id")
+            .eq("project_id", project_id)
+            .execute()
+            .data
+        ]
+
+    changes = {
+        table: _changed_rows(table, since_iso, project_id, milestone_ids)
+        for table in SYNC_TABLES
+    }
+    deleted = {table: [] for table in SYNC_TABLES}
+    if since_iso is not None:
+        deleted = _deleted_ids(since_iso, project_id)
+        # A row written and then deleted inside the window is just deleted
+        for table, ids in deleted.items():
+            if ids:
+                gone = set(ids)
+                changes[table] = [r for r in changes[table] if r["id"] not in gone]
+
+    return {
+        "token": encode_token(now - SYNC_OVERLAP),
+        "full": since is None,
+        "changes": changes,
+        "deleted": deleted,
+    }
@@ -0,0 +1,253 @@
+"""Project export / import as NDJSON — one JSON record per line.
+
+Export order is dependency order (project → team members → milestones →
+user stories → updates → summaries), so an import can stream the file
+top-to-bottom and remap foreign keys as it goes.
+"""
+
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from app.db import supabase
+from app.utils.pagination import paged
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+
+# Record types in the order they are exported (and must be imported)
+RECORD_TYPES = (
+    "project",
+    "team_member",
+    "milestone",
+    "user_story",
+    "update",
+    "summary",
+)
+
+# Server-managed columns that are never copied into the target database
+_DROP_ON_IMPORT = {"id", "created_at", "updated_at"}
+
+
+def _line(record_type: str, data: dict[str, Any]) -> str:
+    return json.dumps({"type": record_type, "data": data}, default=str) + "\n"
+
+
+def export_project(project_id: str) -> Iterator[str]:
+    """Yield the project and all its children as NDJSON lines.
+
+    Only one page of rows is held in memory at a time. Raises ValueError
+    before yielding anything if the project does not exist.
+    """
+    project = (
+        supabase.table("projects")
+        .select("*")
+        .eq("id", project_id)
+        .maybe_single()
+        .execute()
+    )
+    if not project or not project.data:
+        raise ValueError("Project not found")
+
+    milestone_ids = [
+        m["id"]
+        for m in supabase.table("milestones")
+        .select("id")
+        .eq("project_id", project_id)
+        .execute()
+        .data
+    ]
+
+    def _rows() -> Iterator[str]:
+        yield _line("project", project.data)
+
+        for member in paged(
+            lambda: supabase.table("team_members")
+            .select("*")
+            .eq("project_id", project_id)
+            .order("created_at")
+            .order("id")
+        ):
+            yield _line("team_member", member)
+
+        for milestone in paged(
+            lambda: supabase.table("milestones")
+            .select("*")
+            .eq("project_id", project_id)
+            .order("order_index")
+            .order("id")
+        ):
+            yield _line("milestone", milestone)
+
+        if milestone_ids:
+            for story in paged(
+                lambda: supabase.table("user_stories")
+                .select("*")
+                .in_("milestone_id", milestone_ids)
+                .order("id")
+            ):
+                yield _line("user_story", story)
+
+            for update in paged(
+                lambda: supabase.table("updates")
+                .select("*")
+                .in_("milestone_id", milestone_ids)
+                .order("logged_at")
+                .order("id")
+            ):
+                yield _line("update", update)
+
+        for summary in paged(
+            lambda: supabase.table("summaries")
+            .select("*")
+            .eq("project_id", project_id)
+            .order("generated_at")
+            .order("id")
+        ):
+            yield _line("summary", summary)
+
+    return _rows()
+
+
+class _ProjectImporter:
+    """Buffers records per table and flushes them in batched inserts.
+
+    Old IDs are mapped to the newly created ones so child rows can be
+    re-pointed at their imported parents. The maps are reset per project,
+    so memory stays bounded by the size of a single project's milestones
+    and team.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        self.batch_size = batch_size
+        self.projects: list[dict[str, Any]] = []
+        self.counts: dict[str, int] = {t: 0 for t in RECORD_TYPES}
+        self._project_id: str | None = None
+        self._member_ids: dict[str, str] = {}
+        self._milestone_ids: dict[str, str] = {}
+        self._pending_type: str | None = None
+        self._pending: list[tuple[str | None, dict[str, Any]]] = []
+
+    def add(self, record_type: str, data: dict[str, Any]) -> None:
+        if record_type not in RECORD_TYPES:
+            raise ValueError(f"Unknown record type '{record_type}'")
+        if record_type != "project" and self._project_id is None:
+            raise ValueError(f"'{record_type}' record appears before any project")
+
+        # Children depend on parents being inserted first
+        if record_type != self._pending_type:
+            self.flush()
+            self._pending_type = record_type
+
+        if record_type == "project":
+            self._insert_project(data)
+            return
+
+        row = self._remap(record_type, data)
+        self._pending.append((data.get("id"), row))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        table = {
+            "team_member": "team_members",
+            "milestone": "milestones",
+            "user_story": "user_stories",
+            "update": "updates",
+            "summary": "summaries",
+        }[self._pending_type]
+        old_ids = [old_id for old_id, _ in self._pending]
+        inserted = (
+            supabase.table(table).insert([row for _, row in self._pending]).execute()
+        ).data
+
+        if self._pending_type == "team_member":
+            self._member_ids.update(zip(old_ids, (r["id"] for r in inserted)))
+        elif self._pending_type == "milestone":
+            self._milestone_ids.update(zip(old_ids, (r["id"] for r in inserted)))
+
+        self.counts[self._pending_type] += len(inserted)
+        self._pending = []
+
+    def rollback(self) -> None:
+        """Delete every project created so far; children cascade."""
+        self._pending = []
+        ids = [p["id"] for p in self.projects]
+        if ids:
+            supabase.table("projects").delete().in_("id", ids).execute()
+        self.projects = []
+
+    def _insert_project(self, data: dict[str, Any]) -> None:
+        row = {k: v for k, v in data.items() if k not in _DROP_ON_IMPORT}
+        # scope_id is unique per project — the source scope is not exported
+        row["scope_id"] = None
+        project = supabase.table("projects").insert(row).execute().data[0]
+
+        self._project_id = project["id"]
+        self._member_ids = {}
+        self._milestone_ids = {}
+        self.projects.append({"id": project["id"], "name": project["name"]})
+        self.counts["project"] += 1
+
+    def _remap(self, record_type: str, data: dict[str, Any]) -> dict[str, Any]:
+        row = {k: v for k, v in data.items() if k not in _DROP_ON_IMPORT}
+
+        if record_type in ("team_member", "milestone", "summary"):
+            row["project_id"] = self._project_id
+        if record_type == "milestone":
+            # Epics live on the source scope, which is not part of the export
+            row["epic_id"] = None
+            row["assigned_to"] = self._member_ids.get(row.get("assigned_to"))
+        if record_type in ("user_story", "update"):
+            milestone_id = self._milestone_ids.get(row.get("milestone_id"))
+            if milestone_id is None:
+                raise ValueError(
+                    f"'{record_type}' references milestone '{row.get('milestone_id')}', "
+                    "which is not in this project"
+                )
+            row["milestone_id"] = milestone_id
+            row.pop("epic_id", None)
+        return row
+
+
+def import_projects(lines: Iterable[bytes | str], batch_size: int = BATCH_SIZE) -> dict[str, Any]:
+    """Import one or more exported projects from NDJSON lines.
+
+    Rows are written with batched inserts; IDs are regenerated and all
+    foreign keys are remapped. Returns the created projects and per-type
+    row counts. The import is all or nothing: on an invalid record (raised
+    as ValueError) or a failed insert, the projects created so far are
+    deleted again before the error propagates.
+    """
+    importer = _ProjectImporter(batch_size)
+    try:
+        for lineno, raw in enumerate(lines, start=1):
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8")
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                record = json.loads(raw)
+                record_type, data = record["type"], record["data"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"Invalid record on line {lineno}") from e
+            if not isinstance(data, dict):
+                raise ValueError(f"Invalid record on line {lineno}")
+            try:
+                importer.add(record_type, data)
+            except ValueError as e:
+                raise ValueError(f"Line {lineno}: {e}") from e
+        importer.flush()
+    except BaseException:
+        try:
+            importer.rollback()
+        except Exception as e:
+            logger.error("Rolling back import of %s failed: %s", importer.projects, e)
+        raise
+
+    return {"projects": importer.projects, "counts": importer.counts}
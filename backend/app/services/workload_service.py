@@ -0,0 +1,145 @@
+"""Team workload — assigned milestones, open stories and overdue work per
+team member, for one project or the whole portfolio, cached in-process.
+
+Each view is a single query: team members with their assigned milestones
+embedded through `milestones.assigned_to`, grouped here. Open stories come
+from the milestones' maintained story counts (see progress_service), so no
+user_stories rows are read.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Any
+
+from app.db import supabase
+from app.utils.pagination import paged
+
+CACHE_TTL_SECONDS = 120
+PORTFOLIO_KEY = "portfolio"
+WORKLOAD_SELECT = (
+    "id, project_id, name, role, avatar_color, "
+    "milestones!assigned_to(id, status, due_date, stories_total, stories_completed)"
+)
+
+_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+# Bumped on every invalidation, so a result computed from data read before
+# an invalidation is not cached after it
+_generations: dict[str, int] = defaultdict(int)
+_lock = threading.Lock()
+
+
+# ── Cache ──
+
+def invalidate_workload(project_id: str | None) -> None:
+    """Drop the cached workload of a project (and the portfolio view)."""
+    with _lock:
+        for key in ((project_id, PORTFOLIO_KEY) if project_id else (PORTFOLIO_KEY,)):
+            _cache.pop(key, None)
+            _generations[key] += 1
+
+
+def _cached(key: str) -> dict[str, Any] | None:
+    entry = _cache.get(key)
+    if entry and time.monotonic() - entry[0] < CACHE_TTL_SECONDS:
+        return entry[1]
+    return None
+
+
+# ── Aggregation ──
+
+def _empty_load() -> dict[str, int]:
+    return {
+        "milestones_assigned": 0,
+        "milestones_open": 0,
+        "milestones_blocked": 0,
+        "milestones_overdue": 0,
+        "stories_open": 0,
+    }
+
+
+def _add_milestones(load: dict[str, int], milestones: list[dict[str, Any]], today: str) -> None:
+    for m in milestones:
+        load["milestones_assigned"] += 1
+        if m["status"] == "completed":
+            continue
+        load["milestones_open"] += 1
+        load["stories_open"] += (m.get("stories_total") or 0) - (m.get("stories_completed") or 0)
+        if m["status"] == "blocked":
+            load["milestones_blocked"] += 1
+        if m.get("due_date") and m["due_date"][:10] < today:
+            load["milestones_overdue"] += 1
+
+
+def _project_workload(project_id: str) -> dict[str, Any]:
+    """Raises LookupError if the project does not exist."""
+    today = date.today().isoformat()
+    members = (
+        supabase.table("team_members")
+        .select(WORKLOAD_SELECT)
+        .eq("project_id", project_id)
+        .order("created_at")
+        .execute()
+    ).data
+    if not members:
+        exists = supabase.table("projects").select("id").eq("id", project_id).execute().data
+        if not exists:
+            raise LookupError("Project not found")
+    rows = []
+    for member in members:
+        load = _empty_load()
+        _add_milestones(load, member.pop("milestones") or [], today)
+        rows.append({**member, **load})
+    return {"project_id": project_id, "members": rows}
+
+
+def _portfolio_workload() -> dict[str, Any]:
+    """Active projects only. Team members are per project, so people on
+    several projects are merged by (case-insensitive) name."""
+    today = date.today().isoformat()
+    people: dict[str, dict[str, Any]] = {}
+    for member in paged(
+        lambda: supabase.table("team_members")
+        .select(f"{WORKLOAD_SELECT}, projects!inner(status)")
+        .eq("projects.status", "active")
+        .order("id")
+    ):
+        key = member["name"].strip().lower()
+        person = people.get(key)
+        if person is None:
+            person = people[key] = {
+                "name": member["name"],
+                "role": member["role"],
+                "avatar_color": member["avatar_color"],
+                "member_ids": [],
+                "project_ids": [],
+                **_empty_load(),
+            }
+        person["member_ids"].append(member["id"])
+        person["project_ids"].append(member["project_id"])
+        _add_milestones(person, member.get("milestones") or [], today)
+
+    members = sorted(
+        people.values(), key=lambda p: (-p["stories_open"], p["name"].lower())
+    )
+    return {"project_id": None, "members": members}
+
+
+def get_workload(project_id: str | None = None) -> dict[str, Any]:
+    """Per-member workload for a project, or the portfolio when None.
+
+    Raises LookupError for an unknown project.
+    """
+    key = project_id or PORTFOLIO_KEY
+    with _lock:
+        hit = _cached(key)
+        generation = _generations[key]
+    if hit is not None:
+        return hit
+
+    result = _project_workload(project_id) if project_id else _portfolio_workload()
+    with _lock:
+        if _generations[key] == generation:
+            _cache[key] = (time.monotonic(), result)
+    return result
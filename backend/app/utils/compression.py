@@ -0,0 +1,72 @@
+"""Negotiated gzip / brotli compression of buffered responses.
+
+Only responses above COMPRESS_MIN_SIZE are compressed; streamed responses
+(NDJSON export, SSE) are sent as-is so they keep flushing line by line.
+Brotli is used when the client accepts it and the `brotli` package is
+installed, gzip otherwise.
+"""
+
+import gzip
+
+from flask import Flask, Response, request
+
+from app.utils import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+COMPRESSIBLE_TYPES = {"application/json", "application/x-ndjson", "text/plain", "text/html"}
+
+
+def _choose_encoding() -> str | None:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def init_compression(app: Flask) -> None:
+    """Register the after_request hook that compresses large responses."""
+    min_size = app.config["COMPRESS_MIN_SIZE"]
+    gzip_level = app.config["COMPRESS_GZIP_LEVEL"]
+    brotli_quality = app.config["COMPRESS_BROTLI_QUALITY"]
+
+    @app.after_request
+    def compress(response: Response) -> Response:
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.is_streamed
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        encoding = _choose_encoding()
+        if encoding is None:
+            return response
+
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=gzip_level)
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+
+        # A strong ETag names exact bytes, so each encoding gets its own
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f"{etag}-{encoding}")
+
+        metrics.incr("compression.bytes_in", len(body))
+        metrics.incr(f"compression.bytes_out.{encoding}", len(compressed))
+        return response
@@ -0,0 +1,83 @@
+"""Conditional GET — strong ETags computed from cheap row-version queries.
+
+`@conditional(version)` runs `version(**view_kwargs)` first: a small select
+of ids and `updated_at` values that changes whenever the response would.
+Its hash (plus the query string) is the ETag, so a matching
+`If-None-Match` is answered with 304 before the view's expensive nested
+select runs.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from flask import Response, current_app, request
+
+from app.utils import metrics
+
+# Remember (uncompressed) response sizes per ETag so 304s can report the
+# bytes they saved
+_SIZES_MAX = 4096
+_sizes: OrderedDict[str, int] = OrderedDict()
+_lock = threading.Lock()
+
+
+def compute_etag(version: Any) -> str:
+    payload = json.dumps(
+        [version, request.full_path], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _remember_size(etag: str, size: int) -> None:
+    with _lock:
+        _sizes[etag] = size
+        _sizes.move_to_end(etag)
+        if len(_sizes) > _SIZES_MAX:
+            _sizes.popitem(last=False)
+
+
+def conditional(version: Callable[..., Any]):
+    """Decorate a GET view with ETag / If-None-Match handling."""
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(view)
+        def wrapper(**kwargs: Any):
+            etag = compute_etag(version(**kwargs))
+            endpoint = request.endpoint
+            metrics.incr("etag.requests")
+
+            # Compressed responses carry the tag with an encoding suffix
+            matched = next(
+                (
+                    tag for tag in (etag, f"{etag}-br", f"{etag}-gzip")
+                    if request.if_none_match.contains_weak(tag)
+                ),
+                None,
+            )
+            if matched is not None:
+                with _lock:
+                    saved = _sizes.get(etag, 0)
+                metrics.incr("etag.not_modified")
+                metrics.incr("etag.bytes_saved", saved)
+                metrics.incr(f"etag.bytes_saved.{endpoint}", saved)
+                response = Response(status=304)
+                response.set_etag(matched)
+                return response
+
+            response = current_app.make_response(view(**kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                size = response.calculate_content_length() or 0
+                _remember_size(etag, size)
+                metrics.incr("etag.bytes_sent", size)
+                metrics.incr(f"etag.bytes_sent.{endpoint}", size)
+            return response
+
+        return wrapper
+
+    return decorator
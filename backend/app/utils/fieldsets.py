@@ -0,0 +1,72 @@
+"""Sparse fieldset helpers — map `fields=` / `include=` query params to
+PostgREST select projections, plus server-side text truncation."""
+
+from typing import Any
+
+# Selectable columns per table (see runway_product_spec.md §3.2). A scope's
+# raw LLM output is stored apart and only returned with include=ai_output_raw.
+SCOPE_COLUMNS = {
+    "id", "product_name", "idea_text", "target_audience", "budget_range",
+    "timeline_pressure", "suggested_stack", "timeline_weeks",
+    "risks", "status", "created_at", "updated_at",
+}
+PROJECT_COLUMNS = {
+    "id", "scope_id", "name", "description", "start_date", "status",
+    "created_at", "updated_at",
+}
+MILESTONE_COLUMNS = {
+    "id", "project_id", "epic_id", "assigned_to", "name", "description",
+    "status", "progress_percent", "stories_total", "stories_completed",
+    "start_date", "due_date", "order_index", "created_at", "updated_at",
+}
+
+
+def parse_list_param(value: str | None) -> list[str] | None:
+    """Split a comma-separated query param; None when the param is absent."""
+    if value is None:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def validate_subset(values: list[str] | None, allowed: set[str], param: str) -> str | None:
+    """Return an error message if any requested name is not allowed."""
+    if values is None:
+        return None
+    unknown = [v for v in values if v not in allowed]
+    if unknown:
+        return f"'{param}' has unknown values: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}"
+    return None
+
+
+def validate_truncate(limit: int | None) -> str | None:
+    """Return an error message if a `truncate=` length is not positive."""
+    if limit is not None and limit < 1:
+        return "truncate must be at least 1"
+    return None
+
+
+def build_select(fields: list[str] | None, embeds: list[str] | None = None) -> str:
+    """Build a PostgREST select string from column names and embedded resources.
+
+    `fields=None` selects every column. `id` is always included so clients
+    can address the rows they get back.
+    """
+    if fields is None:
+        columns = ["*"]
+    else:
+        columns = ["id"] + [f for f in fields if f != "id"]
+    return ", ".join(columns + list(embeds or []))
+
+
+def truncate_fields(
+    rows: list[dict[str, Any]], fields: tuple[str, ...], limit: int | None
+) -> list[dict[str, Any]]:
+    """Truncate long text fields in place to `limit` characters."""
+    if not limit:
+        return rows
+    for row in rows:
+        for field in fields:
+            text = row.get(field)
+            if isinstance(text, str) and len(text) > limit:
+                row[field] = text[:limit].rstrip() + "..."
+    return rows
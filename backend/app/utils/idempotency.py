@@ -0,0 +1,177 @@
+"""Idempotency-Key support and in-process single-flight coalescing.
+
+`@idempotent(...)` wraps a route so that:
+- concurrent identical requests in this process share one execution
+  (single-flight) and all receive the same response;
+- requests carrying an `Idempotency-Key` header store their response in the
+  `idempotency_keys` table, and retries replay it instead of re-running.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from flask import current_app, jsonify, request
+from postgrest.exceptions import APIError
+
+from app.db import supabase
+
+KEY_TTL = timedelta(hours=24)
+HEADER = "Idempotency-Key"
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, "_Call"] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+_flight = SingleFlight()
+
+
+def _request_hash() -> str:
+    body = request.get_json(silent=True)
+    payload = json.dumps(
+        [request.method, request.path, body], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _claim(key: str, endpoint: str, request_hash: str) -> dict[str, Any] | None:
+    """Reserve the key. Returns the existing row if it was already taken."""
+    try:
+        supabase.table("idempotency_keys").insert({
+            "key": key,
+            "endpoint": endpoint,
+            "request_hash": request_hash,
+        }).execute()
+        return None
+    except APIError as e:
+        if e.code != "23505":  # unique_violation
+            raise
+        rows = (
+            supabase.table("idempotency_keys")
+            .select("*")
+            .eq("key", key)
+            .execute()
+        ).data
+        if not rows:
+            raise
+        row = rows[0]
+        created = datetime.fromisoformat(row["created_at"])
+        if datetime.now(timezone.utc) - created > KEY_TTL:
+            # Expired — take the key over for this request
+            supabase.table("idempotency_keys").update({
+                "endpoint": endpoint,
+                "request_hash": request_hash,
+                "status_code": None,
+                "response": None,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }).eq("key", key).execute()
+            return None
+        return row
+
+
+def _materialize(rv: Any) -> tuple[Any, int]:
+    """Turn a view return value into (json body, status) for sharing/storing."""
+    response = current_app.make_response(rv)
+    return response.get_json(silent=True), response.status_code
+
+
+def idempotent(endpoint: str, flight_key: Callable[..., str] | None = None):
+    """Decorate a JSON route with idempotency keys and single-flight.
+
+    `flight_key(**view_kwargs)` picks the coalescing key for requests without
+    an Idempotency-Key; by default it is a hash of method, path and JSON
+    body, so only identical requests are coalesced.
+    """
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(view)
+        def wrapper(**kwargs: Any):
+            key = request.headers.get(HEADER)
+            request_hash = _request_hash()
+
+            def run() -> tuple[Any, int, bool]:
+                if key is None:
+                    return (*_materialize(view(**kwargs)), False)
+
+                existing = _claim(key, endpoint, request_hash)
+                if existing is not None:
+                    if existing["endpoint"] != endpoint or existing["request_hash"] != request_hash:
+                        error = "Idempotency-Key was used with a different request"
+                        return {"error": error, "code": 422}, 422, False
+                    if existing.get("status_code") is None:
+                        error = "A request with this Idempotency-Key is in progress"
+                        return {"error": error, "code": 409}, 409, False
+                    return existing["response"], existing["status_code"], True
+
+                try:
+                    body, status = _materialize(view(**kwargs))
+                except Exception:
+                    supabase.table("idempotency_keys").delete().eq("key", key).execute()
+                    raise
+                if status >= 500:
+                    # Let the client retry server errors
+                    supabase.table("idempotency_keys").delete().eq("key", key).execute()
+                else:
+                    supabase.table("idempotency_keys").update({
+                        "status_code": status,
+                        "response": body,
+                    }).eq("key", key).execute()
+                return body, status, False
+
+            if key is not None:
+                # A different body under the same key must reach _claim and
+                # get its 422, not share the first request's result
+                coalesce = f"key:{key}:{request_hash}"
+            elif flight_key is not None:
+                coalesce = f"{endpoint}:{flight_key(**kwargs)}"
+            else:
+                coalesce = f"{endpoint}:{request_hash}"
+
+            body, status, replayed = _flight.do(coalesce, run)
+            response = jsonify(body)
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return response, status
+
+        return wrapper
+
+    return decorator
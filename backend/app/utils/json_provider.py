@@ -0,0 +1,59 @@
+"""orjson-backed JSON provider for Flask.
+
+Serializes datetimes, dates, UUIDs and NumPy arrays natively and writes
+response bodies straight from orjson's bytes. `init_json(app)` installs it
+when JSON_PROVIDER is "orjson" and orjson is importable; otherwise Flask's
+standard-library provider stays in place.
+"""
+
+import decimal
+from typing import Any
+
+from flask import Flask
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    """Types orjson does not handle itself."""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """Drop-in replacement for flask.json.provider.DefaultJSONProvider."""
+
+    def _options(self, **kwargs: Any) -> int:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=self._options(**kwargs)).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self._app.debug
+        body = orjson.dumps(obj, default=_default, option=self._options(indent=indent))
+        return self._app.response_class(body + b"\n", mimetype="application/json")
+
+
+def init_json(app: Flask) -> None:
+    """Install the configured JSON provider on the app."""
+    if app.config.get("JSON_PROVIDER") == "orjson" and orjson is not None:
+        app.json = OrjsonProvider(app)
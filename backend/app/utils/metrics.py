@@ -0,0 +1,21 @@
+"""In-process counters, exposed read-only at /api/v1/metrics.
+
+Counters are per process and reset on restart — good enough to compare
+before/after on one deployment, not a replacement for a metrics backend.
+"""
+
+import threading
+from collections import defaultdict
+
+_counters: dict[str, float] = defaultdict(float)
+_lock = threading.Lock()
+
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] += value
+
+
+def snapshot() -> dict[str, float]:
+    with _lock:
+        return dict(sorted(_counters.items()))
@@ -0,0 +1,99 @@
+"""Helpers for reading large PostgREST result sets page by page, and keyset
+cursors for paginated list endpoints."""
+
+import base64
+import json
+import uuid
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from typing import Any
+
+from flask import abort, request
+
+PAGE_SIZE = 500
+
+
+def paged(query: Callable[[], Any], page_size: int = PAGE_SIZE) -> Iterator[dict[str, Any]]:
+    """Yield rows from a query one page at a time using range().
+
+    `query` builds a fresh filtered/ordered query for each page; the order
+    must be deterministic for pages not to overlap.
+    """
+    offset = 0
+    while True:
+        rows = query().range(offset, offset + page_size - 1).execute().data
+        yield from rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
+# ── Keyset cursors ──
+#
+# Client-facing lists are ordered by (column, id) and continue from the last
+# row of the previous page instead of an offset, so deep pages cost the same
+# as the first and rows inserted meanwhile do not shift the window. NULL
+# sort values are allowed and sort as PostgreSQL does by default: after all
+# other values ascending, before them descending.
+
+def encode_cursor(value: str | int | None, row_id: str) -> str:
+    """Opaque cursor for the row after which the next page starts."""
+    raw = json.dumps([value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str | int | None, str]:
+    """Returns (value, id). Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        # Both values end up inside a PostgREST filter string: only
+        # integers, timestamps and null are valid sort values (JSON
+        # true/false decode to bool, which is an int subclass)
+        if isinstance(value, bool):
+            raise ValueError("Boolean sort value")
+        if value is not None and not isinstance(value, int):
+            datetime.fromisoformat(value)
+        uuid.UUID(row_id)
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError("Invalid cursor") from e
+    return value, row_id
+
+
+def after_cursor(
+    query: Any, cursor: tuple[str | int | None, str], column: str, desc: bool = True
+) -> Any:
+    """Filter `query` to rows after `cursor` in (column, id) order."""
+    value, row_id = cursor
+    op = "lt" if desc else "gt"
+    if value is None:
+        # Ascending, NULLs are last; descending, every non-NULL value follows
+        rest = "" if not desc else f"{column}.not.is.null,"
+        return query.or_(f"{rest}and({column}.is.null,id.{op}.{row_id})")
+    nulls = f",{column}.is.null" if not desc else ""
+    return query.or_(
+        f'{column}.{op}."{value}",and({column}.eq."{value}",id.{op}.{row_id}){nulls}'
+    )
+
+
+def keyset_page(
+    rows: list[dict[str, Any]], limit: int, column: str
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Trim rows fetched with limit + 1 to one page, plus the next cursor
+    (None on the last page)."""
+    page = rows[:limit]
+    if len(rows) <= limit:
+        return page, None
+    return page, encode_cursor(page[-1][column], page[-1]["id"])
+
+
+def parse_page_args(default_limit: int, max_limit: int) -> tuple[tuple[str | int, str] | None, int]:
+    """Validated `cursor` and `limit` query params; aborts with 400."""
+    limit = request.args.get("limit", default_limit, type=int)
+    if not 1 <= limit <= max_limit:
+        abort(400, description=f"limit must be between 1 and {max_limit}")
+    cursor = request.args.get("cursor")
+    try:
+        return (decode_cursor(cursor) if cursor else None), limit
+    except ValueError as e:
+        abort(400, description=str(e))
@@ -0,0 +1,194 @@
+"""Opt-in sampling profiler for request handling.
+
+While enabled, one background thread snapshots the Python stack of every
+thread that is handling a request, every PROFILE_INTERVAL_MS. When a
+request finishes its samples are kept if it was picked by
+PROFILE_SAMPLE_RATE or took longer than PROFILE_SLOW_MS, and dropped
+otherwise, so slow requests are caught without profiling everything
+deterministically.
+
+Kept requests produce:
+- `<PROFILE_DIR>/<time>-<endpoint>.folded` — collapsed stacks
+  ("frame;frame;frame count"), ready for flamegraph.pl or speedscope;
+- `<PROFILE_DIR>/routes-<pid>.json` — per-route aggregates for this worker
+  process, with the time split into DB (Supabase/PostgREST), LLM (Gemini),
+  wait (blocked on other threads, e.g. batch sub-requests) and CPU
+  (everything else).
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from flask import Flask, g, request
+
+# Module prefixes that attribute a sample to a category. LLM is checked
+# first because the Gemini SDK also makes its calls through httpx.
+LLM_MODULES = ("google.genai", "app.services.llm_service")
+DB_MODULES = ("postgrest", "supabase", "gotrue", "storage3", "httpx", "httpcore")
+WAIT_MODULES = ("threading:", "queue:", "concurrent.futures")
+CATEGORIES = ("db", "llm", "wait", "cpu")
+
+
+class _RequestProfile:
+    def __init__(self, route: str, sampled: bool):
+        self.route = route
+        self.sampled = sampled
+        self.started = time.perf_counter()
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+
+
+def _stack(frame: FrameType | None) -> tuple[str, ...]:
+    """Frames from outermost to innermost as 'module:function'."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}:{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    return tuple(reversed(names))
+
+
+def _category(stack: tuple[str, ...]) -> str:
+    if any(f.startswith(LLM_MODULES) for f in stack):
+        return "llm"
+    if any(f.startswith(DB_MODULES) for f in stack):
+        return "db"
+    if stack and stack[-1].startswith(WAIT_MODULES):
+        return "wait"
+    return "cpu"
+
+
+class SamplingProfiler:
+    """Stack sampler plus per-route aggregation and file output."""
+
+    def __init__(self, out_dir: str, interval_ms: float, sample_rate: float, slow_ms: float):
+        self.out_dir = Path(out_dir)
+        self.interval = interval_ms / 1000
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self._active: dict[int, _RequestProfile] = {}
+        self._routes: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    continue
+                active = dict(self._active)
+            frames = sys._current_frames()
+            for thread_id, profile in active.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    profile.stacks[_stack(frame)] += 1
+
+    def begin(self, route: str) -> bool:
+        """Start profiling this thread's request. Returns False if the thread
+        is already profiling one (batch sub-requests run inside their parent)."""
+        profile = _RequestProfile(route, random.random() < self.sample_rate)
+        with self._lock:
+            if threading.get_ident() in self._active:
+                return False
+            self._active[threading.get_ident()] = profile
+        return True
+
+    def end(self) -> None:
+        with self._lock:
+            profile = self._active.pop(threading.get_ident(), None)
+        if profile is None:
+            return
+        elapsed_ms = (time.perf_counter() - profile.started) * 1000
+        keep = profile.sampled or elapsed_ms >= self.slow_ms
+
+        breakdown = Counter()
+        for stack, count in profile.stacks.items():
+            breakdown[_category(stack)] += count * self.interval * 1000
+
+        with self._lock:
+            agg = self._routes.setdefault(profile.route, {
+                "requests": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "profiled": 0, **{f"{c}_ms": 0.0 for c in CATEGORIES},
+            })
+            agg["requests"] += 1
+            agg["total_ms"] += elapsed_ms
+            agg["max_ms"] = max(agg["max_ms"], elapsed_ms)
+            if keep:
+                agg["profiled"] += 1
+                for category in CATEGORIES:
+                    agg[f"{category}_ms"] += breakdown[category]
+            routes = {route: dict(a) for route, a in self._routes.items()}
+
+        if keep:
+            self._write_profile(profile, elapsed_ms, breakdown)
+            self._write_routes(routes)
+
+    def _write_profile(self, profile: _RequestProfile, elapsed_ms: float, breakdown: Counter) -> None:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", profile.route)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        name = f"{stamp}-{int(elapsed_ms)}ms-{slug}-{os.getpid()}-{threading.get_ident()}.folded"
+        lines = [
+            f"# route={profile.route} elapsed_ms={elapsed_ms:.1f} "
+            + " ".join(f"{c}_ms={breakdown[c]:.1f}" for c in CATEGORIES)
+        ]
+        lines += [f"{';'.join(stack)} {count}" for stack, count in profile.stacks.most_common()]
+        (self.out_dir / name).write_text("\n".join(lines) + "\n")
+
+    def _write_routes(self, routes: dict[str, Any]) -> None:
+        path = self.out_dir / f"routes-{os.getpid()}.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(routes, indent=2, sort_keys=True))
+        os.replace(tmp, path)
+
+
+def init_profiler(app: Flask, start: bool = True) -> None:
+    """Profile requests according to the PROFILE_* settings (if enabled).
+
+    With `start=False` the sampling thread is left to `start_profiler`,
+    for a preloaded app whose threads would not survive the fork.
+    """
+    if not app.config.get("PROFILE_ENABLED"):
+        return
+
+    profiler = SamplingProfiler(
+        out_dir=app.config["PROFILE_DIR"],
+        interval_ms=app.config["PROFILE_INTERVAL_MS"],
+        sample_rate=app.config["PROFILE_SAMPLE_RATE"],
+        slow_ms=app.config["PROFILE_SLOW_MS"],
+    )
+    app.extensions["profiler"] = profiler
+    if start:
+        profiler.start()
+
+    @app.before_request
+    def _begin_profile():
+        g._profiling = profiler.begin(f"{request.method} {request.url_rule or request.path}")
+
+    @app.teardown_request
+    def _end_profile(exc):
+        if g.pop("_profiling", False):
+            profiler.end()
+
+
+def start_profiler(app: Flask) -> None:
+    """Start the sampling thread in this process, if profiling is enabled."""
+    profiler = app.extensions.get("profiler")
+    if profiler is not None:
+        profiler.start()
@@ -0,0 +1,138 @@
+"""Token budgeting for summary prompts — estimate, dedupe and compact updates.
+
+Token counts are estimated (about 4 characters per token for English
+prose), which is accurate enough to choose a model tier and to keep a
+prompt under a budget without calling a tokenizer.
+"""
+
+import math
+import re
+from typing import Any
+
+CHARS_PER_TOKEN = 4
+# Near-duplicate threshold: Jaccard similarity of the updates' word sets
+DUPLICATE_SIMILARITY = 0.9
+# Update types kept ahead of routine progress notes when trimming
+PRIORITY_TYPES = ("blocker", "completed")
+MIN_UPDATE_CHARS = 160
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _words(text: str) -> frozenset[str]:
+    return frozenset(_WORD.findall(text.lower()))
+
+
+def _is_duplicate(words: frozenset[str], seen: list[frozenset[str]]) -> bool:
+    for other in seen:
+        union = len(words | other)
+        if union and len(words & other) / union >= DUPLICATE_SIMILARITY:
+            return True
+    return False
+
+
+def _dedupe(updates: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Drop repeated updates per milestone, keeping the first (most recent)."""
+    seen: dict[tuple[str, str], list[frozenset[str]]] = {}
+    kept = []
+    for u in updates:
+        words = _words(u["content"])
+        key = (u["milestone"], u["update_type"])
+        if _is_duplicate(words, seen.setdefault(key, [])):
+            continue
+        seen[key].append(words)
+        kept.append(u)
+    return kept
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def _update_line(u: dict[str, Any], clip: int | None) -> str:
+    content = _clip(u["content"], clip) if clip else " ".join(u["content"].split())
+    return f"- ({u['update_type']}) {content}"
+
+
+def _omitted_line(count: int) -> str:
+    return f"- (+{count} earlier updates omitted)"
+
+
+def _render(groups: dict[str, list[dict[str, Any]]], dropped: dict[str, int], clip: int | None) -> str:
+    lines = []
+    for milestone, items in groups.items():
+        lines.append(f"[{milestone}]")
+        lines.extend(_update_line(u, clip) for u in items)
+        if dropped.get(milestone):
+            lines.append(_omitted_line(dropped[milestone]))
+    return "\n".join(lines)
+
+
+def compact_updates(
+    updates: list[dict[str, Any]], budget_tokens: int
+) -> tuple[str, dict[str, Any]]:
+    """Format updates grouped by milestone within `budget_tokens`.
+
+    `updates` are dicts with milestone, update_type and content, most recent
+    first. Near-duplicates are removed; if the text is still over budget,
+    long updates are clipped and then the oldest progress/note updates are
+    dropped (blockers and completions go last). Returns the text and stats
+    describing what was done.
+    """
+    kept = _dedupe(updates)
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for u in kept:
+        groups.setdefault(u["milestone"], []).append(u)
+    dropped: dict[str, int] = {}
+
+    stats = {
+        "updates_in": len(updates),
+        "duplicates_removed": len(updates) - len(kept),
+        "clipped_to_chars": None,
+        "updates_dropped": 0,
+    }
+
+    text = _render(groups, dropped, None)
+    if estimate_tokens(text) <= budget_tokens:
+        return text, stats
+
+    # Clip long updates to an even share of the budget
+    share = budget_tokens * CHARS_PER_TOKEN // max(len(kept), 1)
+    clip = max(share, MIN_UPDATE_CHARS)
+    stats["clipped_to_chars"] = clip
+    text = _render(groups, dropped, clip)
+
+    # Drop the oldest routine updates, always from the busiest milestone.
+    # The rendered length is kept up to date line by line rather than
+    # re-rendering the text after every drop.
+    length = len(text)
+    # Positions of each milestone's routine updates; popping the oldest one
+    # only shifts the priority updates after it, so the rest stay valid
+    routine = {
+        m: [i for i, u in enumerate(items) if u["update_type"] not in PRIORITY_TYPES]
+        for m, items in groups.items()
+    }
+    while math.ceil(length / CHARS_PER_TOKEN) > budget_tokens:
+        candidates = [(m, positions[-1]) for m, positions in routine.items() if positions]
+        from_routine = bool(candidates)
+        if not candidates:
+            candidates = [(m, len(items) - 1) for m, items in groups.items() if items]
+        if not candidates:
+            break
+        # Take from the milestone with the most remaining updates
+        milestone, index = max(candidates, key=lambda c: len(groups[c[0]]))
+        if from_routine:
+            routine[milestone].pop()
+        length -= len(_update_line(groups[milestone].pop(index), clip)) + 1
+        count = dropped.get(milestone, 0)
+        # The omitted-updates line is added, or its count grows
+        length += len(_omitted_line(count + 1)) - (len(_omitted_line(count)) if count else -1)
+        dropped[milestone] = count + 1
+        stats["updates_dropped"] += 1
+
+    return _render(groups, dropped, clip), stats
@@ -22,6 +22,32 @@ def build_scope_prompt(
     return "\n".join(parts)
 
 
+def build_scope_example(scope: dict) -> str:
+    """Render a similar past scope as a few-shot example for generation.
+
+    Epics are listed with their effort and story titles only; story
+    descriptions are left out to keep the example short.
+    """
+    idea = " ".join(scope["idea_text"].split())
+    parts = [
+        "A similar scope we generated before, for reference. Reuse its "
+        "structure where it fits, but adapt epics, stories and estimates "
+        "to the idea above:",
+        f"Product: {scope['product_name']}.",
+        f"Idea: {idea[:400]}.",
+        "Epics:",
+    ]
+    for epic in sorted(scope.get("epics") or [], key=lambda e: e.get("order_index", 0)):
+        parts.append(f"- {epic['name']} ({epic['effort_days']} days): {epic['description']}")
+        stories = sorted(epic.get("user_stories") or [], key=lambda s: s.get("order_index", 0))
+        parts += [f"  - {s['title']}" for s in stories]
+    if scope.get("suggested_stack"):
+        parts.append(f"Stack: {', '.join(scope['suggested_stack'])}.")
+    if scope.get("timeline_weeks"):
+        parts.append(f"Timeline: {scope['timeline_weeks']} weeks.")
+    return "\n".join(parts)
+
+
 SCOPE_SYSTEM_PROMPT = (
     "You are an experienced product manager and software architect at a product "
     "development studio. Your job is to take a startup idea and break it into a "
@@ -37,20 +63,10 @@ SCOPE_SYSTEM_PROMPT = (
 )
 
 
-def build_summary_prompt(
-    project_name: str,
-    description: str,
-    week_start: str,
-    milestone_statuses: str,
-    updates_formatted: str,
-    tone: str = "executive",
-) -> tuple[str, str]:
-    """Build the system and user prompts for weekly summary generation.
-
-    Returns (system_prompt, user_prompt).
-    """
+def _summary_system_prompt(tone: str) -> str:
+    """System prompt for weekly summaries in the requested tone."""
     if tone == "technical":
-        system = (
+        return (
             "You are a senior engineering lead writing an internal weekly status "
             "report for the development team. Write in professional prose, 3-4 "
             "paragraphs. Be specific — use actual milestone names and update "
@@ -59,7 +75,7 @@ def build_summary_prompt(
             "Never use bullet points — write in full paragraphs only."
         )
     else:
-        system = (
+        return (
             "You are a senior project manager writing a weekly status report for "
             "a client. Write in professional prose, 3-4 paragraphs. Be specific — "
             "use actual milestone names and update content. Cover: overall "
@@ -68,6 +84,21 @@ def build_summary_prompt(
             "— write in full paragraphs only."
         )
 
+
+def build_summary_prompt(
+    project_name: str,
+    description: str,
+    week_start: str,
+    milestone_statuses: str,
+    updates_formatted: str,
+    tone: str = "executive",
+) -> tuple[str, str]:
+    """Build the system and user prompts for weekly summary generation.
+
+    Returns (system_prompt, user_prompt).
+    """
+    system = _summary_system_prompt(tone)
+
     user = (
         f"Project: {project_name}.\n"
         f"Description: {description}.\n"
@@ -77,3 +108,78 @@ def build_summary_prompt(
     )
 
     return system, user
+
+
+def build_summary_extension_prompt(
+    project_name: str,
+    previous_summary: str,
+    milestone_statuses: str,
+    new_updates_formatted: str,
+    tone: str = "executive",
+) -> tuple[str, str]:
+    """Build prompts that revise an existing summary with a few new updates.
+
+    Returns (system_prompt, user_prompt).
+    """
+    system = _summary_system_prompt(tone) + (
+        " You are revising an existing report: keep its structure and wording "
+        "where still accurate, and work the new updates in."
+    )
+
+    user = (
+        f"Project: {project_name}.\n\n"
+        f"Current report:\n{previous_summary}\n\n"
+        f"Milestone statuses:\n{milestone_statuses}\n\n"
+        f"New updates since the report was written:\n{new_updates_formatted}"
+    )
+
+    return system, user
+
+
+EPIC_SYSTEM_PROMPT = (
+    "You are an experienced product manager and software architect revising "
+    "one epic of an existing engineering scope. Keep it consistent with the "
+    "product and with the other epics, which stay unchanged: do not duplicate "
+    "their work, and cover what this epic is responsible for.\n\n"
+    "Write 3 to 6 user stories in the format "
+    '"As a [user], I want [action] so that [outcome]", with order_index '
+    "starting at 0."
+)
+
+
+def build_epic_prompt(
+    scope: dict,
+    epic: dict,
+    other_epics: list[dict],
+    stories_only: bool = False,
+    instructions: str | None = None,
+) -> str:
+    """Build the user prompt for regenerating one epic or its stories.
+
+    Other epics are summarized by name and description only, to keep the
+    context small.
+    """
+    parts = [
+        build_scope_prompt(
+            scope["product_name"],
+            scope["idea_text"],
+            scope.get("target_audience"),
+            scope.get("budget_range"),
+            scope.get("timeline_pressure"),
+        ),
+        "",
+        "Other epics (unchanged):",
+        *(f"- {e['name']}: {e['description']}" for e in other_epics),
+        "",
+        f"Epic to {'rewrite the user stories of' if stories_only else 'regenerate'}:",
+        f"{epic['name']} ({epic['effort_days']} days): {epic['description']}",
+        "Current user stories:",
+        *(f"- {s['title']}" for s in epic.get("user_stories") or []),
+    ]
+    if stories_only:
+        parts += ["", "Keep the epic itself; return only its new user stories."]
+    else:
+        parts += ["", "Return the improved epic: name, description, effort_days and user stories."]
+    if instructions:
+        parts += [f"Reviewer feedback: {instructions}"]
+    return "\n".join(parts)
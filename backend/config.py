@@ -10,6 +10,92 @@ class Config:
     SUPABASE_KEY: str = os.environ.get("SUPABASE_KEY", "")
     GEMINI_API_KEY: str = os.environ.get("GEMINI_API_KEY", "")
 
+    # /api/v1/batch limits
+    BATCH_MAX_REQUESTS: int = int(os.environ.get("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_WORKERS: int = int(os.environ.get("BATCH_MAX_WORKERS", "6"))
+
+    # Response serialization and compression
+    JSON_PROVIDER: str = os.environ.get("JSON_PROVIDER", "orjson")  # orjson | default
+    COMPRESS_MIN_SIZE: int = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_GZIP_LEVEL: int = int(os.environ.get("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY: int = int(os.environ.get("COMPRESS_BROTLI_QUALITY", "4"))
+
+    # Opt-in sampling profiler (writes collapsed stacks + per-route aggregates)
+    PROFILE_ENABLED: bool = os.environ.get("PROFILE_ENABLED") == "1"
+    PROFILE_SAMPLE_RATE: float = float(os.environ.get("PROFILE_SAMPLE_RATE", "0.01"))
+    PROFILE_SLOW_MS: float = float(os.environ.get("PROFILE_SLOW_MS", "500"))
+    PROFILE_INTERVAL_MS: float = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_DIR: str = os.environ.get(
+        "PROFILE_DIR",
+        "/tmp/profiles" if os.environ.get("VERCEL") or not os.access(".", os.W_OK) else "profiles",
+    )
+
+    # Portfolio-wide summary runs (summarize.py / in-process scheduler)
+    SUMMARY_BATCH_TONE: str = os.environ.get("SUMMARY_BATCH_TONE", "executive")
+    SUMMARY_BATCH_WORKERS: int = int(os.environ.get("SUMMARY_BATCH_WORKERS", "4"))
+    SUMMARY_BATCH_RATE_PER_MINUTE: float = float(
+        os.environ.get("SUMMARY_BATCH_RATE_PER_MINUTE", "30")
+    )
+    SUMMARY_BATCH_STATE_PATH: str = os.environ.get(
+        "SUMMARY_BATCH_STATE_PATH",
+        "/tmp/summary_batch_state.json"
+        if os.environ.get("VERCEL") or not os.access(".", os.W_OK)
+        else "summary_batch_state.json",
+    )
+    SUMMARY_SCHEDULER_ENABLED: bool = os.environ.get("SUMMARY_SCHEDULER_ENABLED") == "1"
+    SUMMARY_SCHEDULE_WEEKDAY: int = int(os.environ.get("SUMMARY_SCHEDULE_WEEKDAY", "0"))
+    SUMMARY_SCHEDULE_HOUR: int = int(os.environ.get("SUMMARY_SCHEDULE_HOUR", "6"))
+
+    # Bulk delete job runner: how often it looks for jobs, and how long a
+    # job may go without a heartbeat before another runner resumes it
+    BULK_JOB_POLL_SECONDS: float = float(os.environ.get("BULK_JOB_POLL_SECONDS", "5"))
+    BULK_JOB_LEASE_SECONDS: int = int(os.environ.get("BULK_JOB_LEASE_SECONDS", "300"))
+
+    # Scheduled invocations (Vercel Cron) authenticate with this bearer
+    # token; the cron routes are disabled without it. A bulk job run stops
+    # taking new work after BULK_JOB_CRON_SECONDS, below the function timeout
+    CRON_SECRET: str = os.environ.get("CRON_SECRET", "")
+    BULK_JOB_CRON_SECONDS: float = float(os.environ.get("BULK_JOB_CRON_SECONDS", "50"))
+
+    # Reuse of similar past scopes on generate (see scope_service)
+    SCOPE_CLONE_MIN_SIMILARITY: float = float(os.environ.get("SCOPE_CLONE_MIN_SIMILARITY", "0.85"))
+    SCOPE_EXAMPLE_MIN_SIMILARITY: float = float(
+        os.environ.get("SCOPE_EXAMPLE_MIN_SIMILARITY", "0.2")
+    )
+
+    # Summary prompts: whole-prompt token budget, the largest prompt sent to
+    # the small model tier, and the model of each tier
+    SUMMARY_PROMPT_BUDGET_TOKENS: int = int(os.environ.get("SUMMARY_PROMPT_BUDGET_TOKENS", "6000"))
+    SUMMARY_SMALL_TIER_MAX_TOKENS: int = int(
+        os.environ.get("SUMMARY_SMALL_TIER_MAX_TOKENS", "1500")
+    )
+    SUMMARY_SMALL_MODEL: str = os.environ.get("SUMMARY_SMALL_MODEL", "gemini-2.5-flash-lite")
+    SUMMARY_LARGE_MODEL: str = os.environ.get("SUMMARY_LARGE_MODEL", "gemini-2.5-flash")
+
+    # Production server (serve.py): preforked gunicorn workers, each with a
+    # thread pool, since requests mostly wait on Supabase and Gemini
+    SERVER_BIND: str = os.environ.get("SERVER_BIND", f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+    SERVER_WORKERS: int = int(
+        os.environ.get("SERVER_WORKERS", str(min(2 * (os.cpu_count() or 1) + 1, 8)))
+    )
+    SERVER_THREADS: int = int(os.environ.get("SERVER_THREADS", "8"))
+    SERVER_TIMEOUT: int = int(os.environ.get("SERVER_TIMEOUT", "120"))  # LLM calls are slow
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.environ.get("SERVER_GRACEFUL_TIMEOUT", "30"))
+    SERVER_KEEPALIVE: int = int(os.environ.get("SERVER_KEEPALIVE", "5"))
+    SERVER_MAX_REQUESTS: int = int(os.environ.get("SERVER_MAX_REQUESTS", "2000"))  # 0 = never recycle
+
+    # Share published changes between processes through `change_events`, and
+    # how often each serve.py worker polls it (SSE fan-out and cache drops)
+    CHANGE_FEED_SHARED: bool = os.environ.get("CHANGE_FEED_SHARED", "1") == "1"
+    CHANGE_FEED_POLL_SECONDS: float = float(os.environ.get("CHANGE_FEED_POLL_SECONDS", "1"))
+
+    # Event streams (/events) each hold a server thread while open, so at
+    # most this many per process, leaving SSE_RESERVED_THREADS for requests
+    SSE_RESERVED_THREADS: int = int(os.environ.get("SSE_RESERVED_THREADS", "2"))
+    SSE_MAX_SUBSCRIBERS: int = int(
+        os.environ.get("SSE_MAX_SUBSCRIBERS", str(max(SERVER_THREADS - SSE_RESERVED_THREADS, 1)))
+    )
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
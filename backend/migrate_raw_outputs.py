@@ -0,0 +1,106 @@
+"""Move scopes.ai_output_raw into compressed scope_outputs rows.
+
+    python migrate_raw_outputs.py --dry-run     # report sizes, change nothing
+    python migrate_raw_outputs.py               # backfill, then clear the column
+    python migrate_raw_outputs.py --measure 20  # time get_scope before and after
+
+Safe to re-run: each batch is upserted into scope_outputs before the legacy
+column is cleared, and only scopes that still have a legacy value are read.
+Once it reports no remaining rows, the column can be dropped.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app import create_app
+from app.db import supabase
+from app.services.raw_output_service import encode_output
+from app.services.scope_service import get_scope
+
+BATCH_SIZE = 100
+
+
+def _legacy_batch(after_id: str | None) -> list[dict]:
+    q = (
+        supabase.table("scopes")
+        .select("id, ai_output_raw")
+        .not_.is_("ai_output_raw", "null")
+    )
+    if after_id is not None:
+        q = q.gt("id", after_id)
+    return q.order("id").limit(BATCH_SIZE).execute().data
+
+
+def backfill(dry_run: bool) -> dict:
+    report = {"scopes": 0, "raw_bytes": 0, "stored_bytes": 0}
+    after_id = None
+    while rows := _legacy_batch(after_id):
+        encoded = [{"scope_id": r["id"], **encode_output(r["ai_output_raw"])} for r in rows]
+        report["scopes"] += len(rows)
+        report["raw_bytes"] += sum(e["raw_bytes"] for e in encoded)
+        report["stored_bytes"] += sum(e["stored_bytes"] for e in encoded)
+        if not dry_run:
+            supabase.table("scope_outputs").upsert(encoded).execute()
+            supabase.table("scopes").update({"ai_output_raw": None}).in_(
+                "id", [r["id"] for r in rows]
+            ).execute()
+        # Cleared rows drop out of the filter; a dry run has to page past them
+        after_id = rows[-1]["id"]
+    if report["raw_bytes"]:
+        report["ratio"] = round(report["stored_bytes"] / report["raw_bytes"], 3)
+    return report
+
+
+def measure(sample: int) -> dict:
+    """Median get_scope latency over `sample` scopes, with and without the
+    raw output, plus the raw scopes row size as PostgREST returns it."""
+    ids = [
+        r["id"]
+        for r in supabase.table("scopes")
+        .select("id")
+        .order("created_at", desc=True)
+        .limit(sample)
+        .execute()
+        .data
+    ]
+    results = {}
+    for label, include in (("default", None), ("with_raw", ["epics", "user_stories", "ai_output_raw"])):
+        timings = []
+        for scope_id in ids:
+            started = time.perf_counter()
+            get_scope(scope_id, include=include)
+            timings.append((time.perf_counter() - started) * 1000)
+        results[f"get_scope_{label}_ms"] = round(statistics.median(timings), 1) if timings else None
+
+    # What a select("*") on scopes transfers per row
+    rows = supabase.table("scopes").select("*").in_("id", ids).execute().data if ids else []
+    results["scopes_row_bytes"] = round(
+        statistics.mean(len(json.dumps(r, default=str)) for r in rows)
+    ) if rows else None
+    results["sample"] = len(ids)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="only report sizes")
+    parser.add_argument("--measure", type=int, metavar="N", help="time get_scope on N scopes")
+    args = parser.parse_args()
+
+    create_app("production")
+    report = {}
+    if args.measure:
+        report["before"] = measure(args.measure)
+    report["backfill"] = backfill(args.dry_run)
+    if args.measure:
+        report["after"] = measure(args.measure)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Recount milestone story counts from user_stories and fix any that drifted.
+
+    python recount_stories.py                 # every milestone
+    python recount_stories.py --project ID    # one project's milestones
+
+Counts are normally kept by the story write paths (see progress_service);
+this repairs milestones left behind by a write whose count update never
+ran. Safe to re-run at any time.
+"""
+
+import argparse
+import json
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app import create_app
+from app.services.progress_service import reconcile_story_counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project", metavar="ID", help="only this project's milestones")
+    args = parser.parse_args()
+
+    create_app("production")
+    print(json.dumps(reconcile_story_counts(args.project), indent=2))
+
+
+if __name__ == "__main__":
+    main()
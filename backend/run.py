@@ -1,9 +1,13 @@
+import os
+
 from dotenv import load_dotenv
 load_dotenv()
 
 from app import create_app
 
-app = create_app("development")
+# The reloader runs this file twice; background work belongs in the child
+# that serves requests
+app = create_app("development", background=os.environ.get("WERKZEUG_RUN_MAIN") == "true")
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
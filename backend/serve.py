@@ -0,0 +1,131 @@
+"""Production server: create_app("production") on preforked gunicorn workers.
+
+    python serve.py                          # sizes from config.py / SERVER_* env
+    python serve.py --workers 4 --threads 8 --bind 0.0.0.0:8000
+
+The app is built once in the master process (preload) and forked into
+SERVER_WORKERS workers with SERVER_THREADS threads each. Before a worker
+accepts requests it opens its own Supabase and Gemini connections with one
+cheap call to each and starts its own profiler thread — no connections or
+threads are started in the master, so none are lost or shared across forks.
+Each worker also follows the changes the other processes publish, so event
+streams and caches do not depend on which worker took a write. Background
+work (bulk jobs, the weekly summary scheduler) does not run here; run
+worker.py alongside. On SIGTERM workers stop accepting, end open event
+streams (clients reconnect elsewhere) and finish in-flight requests within
+SERVER_GRACEFUL_TIMEOUT.
+"""
+
+import argparse
+import logging
+import signal
+import time
+from typing import Any
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+
+from app import create_app, follow_shared_changes
+from app.db import supabase
+from app.services import llm_service
+from app.services.change_feed import hub, set_max_subscribers
+from app.utils.profiler import start_profiler
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def warm_up() -> None:
+    """Open this process's connections to Supabase and Gemini."""
+    started = time.perf_counter()
+    for name, call in (
+        ("supabase", lambda: supabase.table("projects").select("id").limit(1).execute()),
+        ("gemini", lambda: llm_service.client.models.get(model=llm_service.MODEL)),
+    ):
+        try:
+            call()
+        except Exception as e:
+            # Serve with a cold client rather than not at all
+            logger.warning("Warm-up of %s failed: %s", name, e)
+    logger.info("Worker warmed up in %.0f ms", (time.perf_counter() - started) * 1000)
+
+
+def _post_worker_init(worker: Any) -> None:
+    app = worker.app.application
+    warm_up()
+    start_profiler(app)
+    # Changes written by other workers reach this one's streams and caches
+    follow_shared_changes(app)
+
+    # Event streams hold a thread each; keep some free for other requests
+    # even when --threads is below SERVER_THREADS
+    set_max_subscribers(min(
+        app.config["SSE_MAX_SUBSCRIBERS"],
+        worker.cfg.threads - app.config["SSE_RESERVED_THREADS"],
+    ))
+
+    # Event streams never end on their own, so a graceful stop would always
+    # wait out the timeout; close them first
+    drain = signal.getsignal(signal.SIGTERM)
+
+    def _on_sigterm(signum, frame):
+        hub.close()
+        if callable(drain):
+            drain(signum, frame)
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, app: Flask, options: dict[str, Any]):
+        self.application = app
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Flask:
+        return self.application
+
+
+def server_options(app: Flask) -> dict[str, Any]:
+    """gunicorn settings taken from app config."""
+    max_requests = app.config["SERVER_MAX_REQUESTS"]
+    return {
+        "bind": app.config["SERVER_BIND"],
+        "workers": app.config["SERVER_WORKERS"],
+        "threads": app.config["SERVER_THREADS"],
+        "worker_class": "gthread",
+        "preload_app": True,
+        "timeout": app.config["SERVER_TIMEOUT"],
+        "graceful_timeout": app.config["SERVER_GRACEFUL_TIMEOUT"],
+        "keepalive": app.config["SERVER_KEEPALIVE"],
+        # Recycle workers now and then, staggered so they do not restart together
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        "post_worker_init": _post_worker_init,
+        "accesslog": "-",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bind", help="host:port")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--threads", type=int)
+    args = parser.parse_args()
+
+    app = create_app("production", preload=True)
+    options = server_options(app)
+    for key in ("bind", "workers", "threads"):
+        if getattr(args, key):
+            options[key] = getattr(args, key)
+    ProductionServer(app, options).run()
+
+
+if __name__ == "__main__":
+    main()
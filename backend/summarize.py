@@ -0,0 +1,55 @@
+"""Generate weekly summaries for every active project.
+
+    python summarize.py                 # run once, resuming this week's run
+    python summarize.py --fresh         # ignore saved progress
+    python summarize.py --schedule      # keep running, weekly per config
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app import create_app, summary_batch_options
+from app.services.summary_batch_service import run_summary_batch, start_weekly_scheduler
+from app.utils.validators import VALID_SUMMARY_TONES
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tone", choices=sorted(VALID_SUMMARY_TONES))
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--rate", type=float, help="LLM calls per minute")
+    parser.add_argument("--fresh", action="store_true", help="do not resume saved progress")
+    parser.add_argument("--schedule", action="store_true", help="run weekly in-process")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    app = create_app("production")
+    options = summary_batch_options(app)
+    if args.tone:
+        options["tone"] = args.tone
+    if args.workers:
+        options["max_workers"] = args.workers
+    if args.rate:
+        options["rate_per_minute"] = args.rate
+
+    if args.schedule:
+        start_weekly_scheduler(
+            weekday=app.config["SUMMARY_SCHEDULE_WEEKDAY"],
+            hour=app.config["SUMMARY_SCHEDULE_HOUR"],
+            **options,
+        )
+        while True:
+            time.sleep(3600)
+
+    report = run_summary_batch(resume=not args.fresh, **options)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Background work for a serve.py deployment, in one dedicated process.
+
+    python worker.py
+
+Runs the bulk job runner and, with SUMMARY_SCHEDULER_ENABLED=1, the weekly
+summary scheduler. Run one alongside serve.py; a second one is harmless
+for bulk jobs (each job is leased to one runner) but would run the weekly
+batch twice.
+"""
+
+import logging
+import time
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app import create_app
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    create_app("production", background=True)
+    while True:
+        time.sleep(3600)
+
+
+if __name__ == "__main__":
+    main()
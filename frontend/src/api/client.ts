@@ -1,23 +1,45 @@
 import type {
   Scope,
-  ScopeListItem,
+  Epic,
+  ScopePage,
+  ScopeListParams,
   Project,
   ProjectCardData,
   Milestone,
+  MilestoneProgress,
   Update,
   Summary,
   TeamMember,
   Notification,
   SearchResult,
   GenerateScopePayload,
+  SimilarScope,
   ConvertToProjectPayload,
+  RegenerateEpicPayload,
   LogUpdatePayload,
   GenerateSummaryPayload,
   AddTeamMemberPayload,
   UserStory,
+  UserStoryPage,
+  UpdatePage,
   CreateMilestonePayload,
   CreateUserStoryPayload,
+  BulkUserStoryPayload,
+  BulkUserStoryResult,
+  MemberWorkload,
+  PersonWorkload,
+  PortfolioUpdatePage,
+  ScopeBulkResult,
+  ProjectBulkResult,
+  BulkJob,
+  ProjectStatus,
+  UpdateType,
   UpdateProjectPayload,
+  BatchSubRequest,
+  BatchSubResponse,
+  ProjectBundle,
+  ChangeEvent,
+  SyncResponse,
 } from "@/types";
 
 const API_BASE = "/api/v1";
@@ -26,8 +48,8 @@ const API_BASE = "/api/v1";
 
 async function api<T>(path: string, options?: RequestInit): Promise<T> {
   const res = await fetch(`${API_BASE}${path}`, {
-    headers: { "Content-Type": "application/json" },
     ...options,
+    headers: { "Content-Type": "application/json", ...options?.headers },
   });
   if (!res.ok) {
     const err = await res.json().catch(() => ({ error: "Request failed" }));
@@ -36,23 +58,78 @@ async function api<T>(path: string, options?: RequestInit): Promise<T> {
   return res.json() as Promise<T>;
 }
 
+/* ─── Batch ─── */
+
+export function batch(
+  requests: BatchSubRequest[],
+): Promise<BatchSubResponse[]> {
+  return api<{ responses: BatchSubResponse[] }>("/batch", {
+    method: "POST",
+    body: JSON.stringify({ requests }),
+  }).then((r) => r.responses);
+}
+
+/** Project page data in a single round trip via /batch. */
+export async function fetchProjectBundle(id: string): Promise<ProjectBundle> {
+  const responses = await batch([
+    { id: "project", path: `/projects/${id}` },
+    { id: "milestones", path: `/projects/${id}/milestones` },
+    { id: "team", path: `/projects/${id}/team` },
+    { id: "updates", path: `/projects/${id}/updates?page=1` },
+    { id: "summaries", path: `/projects/${id}/summaries` },
+  ]);
+  const byId = Object.fromEntries(responses.map((r) => [r.id, r]));
+  const failed = responses.find((r) => r.status >= 400);
+  if (failed) {
+    const err = failed.body as { error?: string } | null;
+    throw new Error(err?.error ?? `HTTP ${failed.status}`);
+  }
+  return {
+    project: (byId.project.body as { project: Project }).project,
+    milestones: (byId.milestones.body as { milestones: Milestone[] })
+      .milestones,
+    teamMembers: (byId.team.body as { team_members: TeamMember[] })
+      .team_members,
+    updates: (byId.updates.body as { updates: Update[] }).updates,
+    summaries: (byId.summaries.body as { summaries: Summary[] }).summaries,
+  };
+}
+
 /* ─── Scopes ─── */
 
-export function fetchScopes(): Promise<ScopeListItem[]> {
-  return api<{ scopes: ScopeListItem[] }>("/scopes").then((r) => r.scopes);
+export function fetchScopes(params: ScopeListParams = {}): Promise<ScopePage> {
+  const query = new URLSearchParams({ truncate: "120" });
+  for (const [key, value] of Object.entries(params)) {
+    if (value !== undefined && value !== "") query.set(key, String(value));
+  }
+  return api<ScopePage>(`/scopes?${query}`);
 }
 
 export function fetchScope(id: string): Promise<Scope> {
   return api<{ scope: Scope }>(`/scopes/${id}`).then((r) => r.scope);
 }
 
-export function generateScope(payload: GenerateScopePayload): Promise<Scope> {
+export function generateScope(
+  payload: GenerateScopePayload,
+  idempotencyKey: string,
+): Promise<Scope> {
   return api<{ scope: Scope }>("/scopes/generate", {
     method: "POST",
+    headers: { "Idempotency-Key": idempotencyKey },
     body: JSON.stringify(payload),
   }).then((r) => r.scope);
 }
 
+export function fetchSimilarScopes(
+  payload: GenerateScopePayload,
+  limit = 5,
+): Promise<SimilarScope[]> {
+  return api<{ scopes: SimilarScope[] }>("/scopes/similar", {
+    method: "POST",
+    body: JSON.stringify({ ...payload, limit }),
+  }).then((r) => r.scopes);
+}
+
 export function updateScope(id: string, data: Partial<Scope>): Promise<Scope> {
   return api<{ scope: Scope }>(`/scopes/${id}`, {
     method: "PATCH",
@@ -63,13 +140,41 @@ export function updateScope(id: string, data: Partial<Scope>): Promise<Scope> {
 export function convertScopeToProject(
   scopeId: string,
   payload: ConvertToProjectPayload,
+  idempotencyKey: string,
 ): Promise<Project> {
   return api<{ project: Project }>(`/scopes/${scopeId}/convert`, {
     method: "POST",
+    headers: { "Idempotency-Key": idempotencyKey },
     body: JSON.stringify(payload),
   }).then((r) => r.project);
 }
 
+export function fetchEpicStories(
+  scopeId: string,
+  epicId: string,
+  cursor: string,
+): Promise<UserStoryPage> {
+  return api<UserStoryPage>(
+    `/scopes/${scopeId}/epics/${epicId}/user-stories?cursor=${encodeURIComponent(cursor)}`,
+  );
+}
+
+export function regenerateEpic(
+  scopeId: string,
+  epicId: string,
+  payload: RegenerateEpicPayload,
+  idempotencyKey: string,
+): Promise<Epic> {
+  return api<{ epic: Epic }>(
+    `/scopes/${scopeId}/epics/${epicId}/regenerate`,
+    {
+      method: "POST",
+      headers: { "Idempotency-Key": idempotencyKey },
+      body: JSON.stringify(payload),
+    },
+  ).then((r) => r.epic);
+}
+
 export function deleteScope(id: string): Promise<void> {
   return api(`/scopes/${id}`, { method: "DELETE" });
 }
@@ -110,6 +215,24 @@ export function fetchMilestone(id: string): Promise<Milestone> {
   );
 }
 
+export function fetchMilestoneStories(
+  id: string,
+  cursor: string,
+): Promise<UserStoryPage> {
+  return api<UserStoryPage>(
+    `/milestones/${id}/user-stories?cursor=${encodeURIComponent(cursor)}`,
+  );
+}
+
+export function fetchMilestoneUpdates(
+  id: string,
+  cursor: string,
+): Promise<UpdatePage> {
+  return api<UpdatePage>(
+    `/milestones/${id}/updates?cursor=${encodeURIComponent(cursor)}`,
+  );
+}
+
 export function updateMilestone(
   id: string,
   data: Partial<Milestone>,
@@ -217,14 +340,18 @@ export function search(query: string): Promise<SearchResult[]> {
 
 /* ─── User Stories ─── */
 
+/** Resolves with the milestone's new progress when the story was toggled. */
 export function updateUserStory(
   id: string,
   data: { is_completed?: boolean; title?: string; description?: string },
-): Promise<void> {
-  return api(`/user-stories/${id}`, {
-    method: "PATCH",
-    body: JSON.stringify(data),
-  });
+): Promise<MilestoneProgress | null> {
+  return api<{ user_story: UserStory; milestone: MilestoneProgress | null }>(
+    `/user-stories/${id}`,
+    {
+      method: "PATCH",
+      body: JSON.stringify(data),
+    },
+  ).then((r) => r.milestone);
 }
 
 export function deleteProject(id: string): Promise<void> {
@@ -248,16 +375,134 @@ export function deleteMilestone(id: string): Promise<void> {
 export function createUserStory(
   milestoneId: string,
   payload: CreateUserStoryPayload,
-): Promise<UserStory> {
-  return api<{ user_story: UserStory }>(
-    `/milestones/${milestoneId}/user-stories`,
-    {
-      method: "POST",
-      body: JSON.stringify(payload),
-    },
-  ).then((r) => r.user_story);
+): Promise<{ user_story: UserStory; milestone: MilestoneProgress | null }> {
+  return api(`/milestones/${milestoneId}/user-stories`, {
+    method: "POST",
+    body: JSON.stringify(payload),
+  });
+}
+
+export function deleteUserStory(id: string): Promise<MilestoneProgress | null> {
+  return api<{ success: boolean; milestone: MilestoneProgress | null }>(
+    `/user-stories/${id}`,
+    { method: "DELETE" },
+  ).then((r) => r.milestone);
+}
+
+/** Apply one patch to many stories, or a patch per story, in one request. */
+export function bulkUpdateUserStories(payload: BulkUserStoryPayload): Promise<{
+  results: BulkUserStoryResult[];
+  milestones: MilestoneProgress[];
+}> {
+  return api("/user-stories/bulk", {
+    method: "POST",
+    body: JSON.stringify(payload),
+  });
+}
+
+/** One page of updates across all projects, newest first. */
+export function fetchPortfolioUpdates(
+  params: {
+    updateTypes?: UpdateType[];
+    projectStatuses?: ProjectStatus[];
+    cursor?: string | null;
+    limit?: number;
+  } = {},
+): Promise<PortfolioUpdatePage> {
+  const query = new URLSearchParams();
+  if (params.updateTypes?.length)
+    query.set("update_type", params.updateTypes.join(","));
+  if (params.projectStatuses?.length)
+    query.set("project_status", params.projectStatuses.join(","));
+  if (params.cursor) query.set("cursor", params.cursor);
+  if (params.limit) query.set("limit", String(params.limit));
+  return api(`/updates?${query}`);
+}
+
+/* ─── Bulk archive / delete ─── */
+
+export function setScopesArchived(
+  ids: string[],
+  archived: boolean,
+): Promise<ScopeBulkResult[]> {
+  return api<{ results: ScopeBulkResult[] }>("/scopes/bulk", {
+    method: "POST",
+    body: JSON.stringify({ ids, action: archived ? "archive" : "unarchive" }),
+  }).then((r) => r.results);
+}
+
+export function setProjectsArchived(
+  ids: string[],
+  archived: boolean,
+): Promise<ProjectBulkResult[]> {
+  return api<{ results: ProjectBulkResult[] }>("/projects/bulk", {
+    method: "POST",
+    body: JSON.stringify({ ids, action: archived ? "archive" : "unarchive" }),
+  }).then((r) => r.results);
+}
+
+/** Starts a background delete; poll its progress with fetchBulkJob. */
+export function deleteInBulk(
+  target: BulkJob["target"],
+  ids: string[],
+): Promise<BulkJob> {
+  return api<{ job: BulkJob }>(`/${target}/bulk`, {
+    method: "POST",
+    body: JSON.stringify({ ids, action: "delete" }),
+  }).then((r) => r.job);
+}
+
+export function fetchBulkJob(id: string): Promise<BulkJob> {
+  return api<{ job: BulkJob }>(`/bulk-jobs/${id}`).then((r) => r.job);
+}
+
+/* ─── Workload ─── */
+
+export function fetchProjectWorkload(projectId: string): Promise<MemberWorkload[]> {
+  return api<{ workload: { members: MemberWorkload[] } }>(
+    `/projects/${projectId}/workload`,
+  ).then((r) => r.workload.members);
+}
+
+export function fetchPortfolioWorkload(): Promise<PersonWorkload[]> {
+  return api<{ workload: { members: PersonWorkload[] } }>("/workload").then(
+    (r) => r.workload.members,
+  );
+}
+
+/* ─── Delta sync ─── */
+
+/**
+ * Rows changed since `since` (a token from a previous sync), or every row
+ * when omitted. Keep the returned token for the next call.
+ */
+export function syncChanges(
+  since?: string,
+  projectId?: string,
+): Promise<SyncResponse> {
+  const params = new URLSearchParams();
+  if (since) params.set("since", since);
+  if (projectId) params.set("project_id", projectId);
+  const qs = params.toString();
+  return api<SyncResponse>(`/sync${qs ? `?${qs}` : ""}`);
 }
 
-export function deleteUserStory(id: string): Promise<void> {
-  return api(`/user-stories/${id}`, { method: "DELETE" });
+/* ─── Change feed ─── */
+
+/**
+ * Subscribe to server-sent change events for one project (or the whole
+ * portfolio when projectId is null). `onReset` fires when the server could
+ * not replay missed events and the caller should refetch. Returns an
+ * unsubscribe function.
+ */
+export function subscribeToChanges(
+  projectId: string | null,
+  onEvent: (event: ChangeEvent) => void,
+  onReset?: () => void,
+): () => void {
+  const path = projectId ? `/projects/${projectId}/events` : "/events";
+  const source = new EventSource(`${API_BASE}${path}`);
+  source.onmessage = (e) => onEvent(JSON.parse(e.data) as ChangeEvent);
+  if (onReset) source.addEventListener("reset", onReset);
+  return () => source.close();
 }
@@ -1,6 +1,8 @@
 import { useState, useEffect, useCallback } from "react";
 import {
   fetchMilestone,
+  fetchMilestoneStories,
+  fetchMilestoneUpdates,
   updateMilestone,
   logUpdate,
   updateUserStory,
@@ -108,6 +110,52 @@ export function MilestoneDrawer({
       .finally(() => setLoading(false));
   }, [milestoneId]);
 
+  // Older updates / further stories beyond what the drawer embeds
+  const [loadingMore, setLoadingMore] = useState<
+    "updates" | "user_stories" | null
+  >(null);
+
+  const handleLoadMore = useCallback(
+    async (collection: "updates" | "user_stories") => {
+      const cursor = milestone?.[`${collection}_next_cursor`];
+      if (!milestone || !cursor) return;
+      setLoadingMore(collection);
+      try {
+        if (collection === "updates") {
+          const page = await fetchMilestoneUpdates(milestone.id, cursor);
+          setMilestone((prev) =>
+            prev
+              ? {
+                  ...prev,
+                  updates: [...(prev.updates ?? []), ...page.updates],
+                  updates_next_cursor: page.next_cursor,
+                }
+              : prev,
+          );
+        } else {
+          const page = await fetchMilestoneStories(milestone.id, cursor);
+          setMilestone((prev) =>
+            prev
+              ? {
+                  ...prev,
+                  user_stories: [
+                    ...(prev.user_stories ?? []),
+                    ...page.user_stories,
+                  ],
+                  user_stories_next_cursor: page.next_cursor,
+                }
+              : prev,
+          );
+        }
+      } catch {
+        /* */
+      } finally {
+        setLoadingMore(null);
+      }
+    },
+    [milestone],
+  );
+
   const handleStatusChange = useCallback(
     async (status: Milestone["status"]) => {
       if (!milestone) return;
@@ -190,12 +238,14 @@ export function MilestoneDrawer({
     if (!newStoryTitle.trim()) return;
     setSubmittingStory(true);
     try {
-      const story = await createUserStory(milestoneId, {
-        title: newStoryTitle,
-      });
+      const { user_story: story, milestone: progress } =
+        await createUserStory(milestoneId, {
+          title: newStoryTitle,
+        });
       if (milestone) {
         setMilestone({
           ...milestone,
+          ...progress,
           user_stories: [...(milestone.user_stories || []), story],
         });
       }
@@ -213,10 +263,11 @@ export function MilestoneDrawer({
     if (!confirm("Delete this user story?")) return;
     setDeletingStoryIds((prev) => new Set(prev).add(storyId));
     try {
-      await deleteUserStory(storyId);
+      const progress = await deleteUserStory(storyId);
       if (milestone) {
         setMilestone({
           ...milestone,
+          ...progress,
           user_stories: milestone.user_stories?.filter((s) => s.id !== storyId),
         });
       }
@@ -235,11 +286,14 @@ export function MilestoneDrawer({
   const handleToggleStory = useCallback(
     async (storyId: string, completed: boolean) => {
       try {
-        await updateUserStory(storyId, { is_completed: completed });
+        const progress = await updateUserStory(storyId, {
+          is_completed: completed,
+        });
         setMilestone((prev) =>
           prev
             ? {
                 ...prev,
+                ...progress,
                 user_stories: prev.user_stories?.map((s) =>
                   s.id === storyId ? { ...s, is_completed: completed } : s,
                 ),
@@ -479,6 +533,12 @@ export function MilestoneDrawer({
                     <p className="text-[10px] uppercase tracking-wider text-text-tertiary font-bold">
                       Progress
                     </p>
+                    {milestone.stories_total > 0 && (
+                      <span className="text-[10px] text-text-tertiary">
+                        {milestone.stories_completed}/{milestone.stories_total}{" "}
+                        stories
+                      </span>
+                    )}
                   </div>
                   <div className="flex gap-1.5 overflow-x-auto no-scrollbar pb-1">
                     {PROGRESS_OPTIONS.map((p) => (
@@ -487,6 +547,7 @@ export function MilestoneDrawer({
                         variant="ghost"
                         size="sm"
                         onClick={() => handleProgressChange(p)}
+                        disabled={milestone.stories_total > 0}
                         className={`min-w-[40px] flex-1 h-7 px-0 text-[10px] font-bold rounded-md transition-all ${milestone.progress_percent === p ? "bg-primary text-primary-foreground shadow-sm" : "bg-surface-dim text-text-secondary hover:bg-border"}`}
                       >
                         {p}%
@@ -593,6 +654,12 @@ export function MilestoneDrawer({
                     No user stories yet.
                   </p>
                 )}
+                {milestone.user_stories_next_cursor && (
+                  <LoadMoreButton
+                    loading={loadingMore === "user_stories"}
+                    onClick={() => handleLoadMore("user_stories")}
+                  />
+                )}
               </div>
 
               {/* Updates */}
@@ -630,6 +697,12 @@ export function MilestoneDrawer({
                 ) : (
                   <p className="text-sm text-text-tertiary">No updates yet</p>
                 )}
+                {milestone.updates_next_cursor && (
+                  <LoadMoreButton
+                    loading={loadingMore === "updates"}
+                    onClick={() => handleLoadMore("updates")}
+                  />
+                )}
               </div>
             </div>
 
@@ -673,3 +746,23 @@ export function MilestoneDrawer({
     </Sheet>
   );
 }
+
+function LoadMoreButton({
+  loading,
+  onClick,
+}: {
+  loading: boolean;
+  onClick: () => void;
+}) {
+  return (
+    <Button
+      variant="ghost"
+      size="sm"
+      onClick={onClick}
+      disabled={loading}
+      className="mt-2 w-full text-xs text-text-secondary"
+    >
+      {loading ? <Loader2 className="w-4 h-4 animate-spin" /> : "Load more"}
+    </Button>
+  );
+}
@@ -1,6 +1,6 @@
 import { useState } from "react";
 import type { Epic } from "@/types";
-import { ChevronRight } from "lucide-react";
+import { ChevronRight, Loader2, RotateCw } from "lucide-react";
 import { Checkbox } from "@/components/ui/checkbox";
 
 interface EpicCardProps {
@@ -8,9 +8,22 @@ interface EpicCardProps {
   color: string;
   editedFields?: Partial<Epic>;
   onEdit: (epicId: string, field: string, value: string) => void;
+  onRegenerate?: (epicId: string, mode: "epic" | "stories") => void;
+  regenerating?: boolean;
+  onLoadMoreStories?: (epicId: string) => void;
+  loadingStories?: boolean;
 }
 
-export function EpicCard({ epic, color, editedFields, onEdit }: EpicCardProps) {
+export function EpicCard({
+  epic,
+  color,
+  editedFields,
+  onEdit,
+  onRegenerate,
+  regenerating = false,
+  onLoadMoreStories,
+  loadingStories = false,
+}: EpicCardProps) {
   const [isExpanded, setIsExpanded] = useState(false);
   const [editingField, setEditingField] = useState<string | null>(null);
 
@@ -73,18 +86,46 @@ export function EpicCard({ epic, color, editedFields, onEdit }: EpicCardProps) {
           </span>
         </div>
 
-        {/* Toggle stories */}
-        <button
-          onClick={() => setIsExpanded(!isExpanded)}
-          className="mt-3 flex items-center gap-1.5 text-xs font-medium text-text-tertiary
-            hover:text-primary transition-colors"
-        >
-          <ChevronRight
-            className={`w-4 h-4 transition-transform duration-200 ${isExpanded ? "rotate-90" : ""}`}
-          />
-          {epic.user_stories.length} user{" "}
-          {epic.user_stories.length === 1 ? "story" : "stories"}
-        </button>
+        <div className="mt-3 flex items-center justify-between gap-4">
+          {/* Toggle stories */}
+          <button
+            onClick={() => setIsExpanded(!isExpanded)}
+            className="flex items-center gap-1.5 text-xs font-medium text-text-tertiary
+              hover:text-primary transition-colors"
+          >
+            <ChevronRight
+              className={`w-4 h-4 transition-transform duration-200 ${isExpanded ? "rotate-90" : ""}`}
+            />
+            {epic.user_stories.length}
+            {epic.user_stories_next_cursor ? "+" : ""} user{" "}
+            {epic.user_stories.length === 1 ? "story" : "stories"}
+          </button>
+
+          {/* Regenerate just this epic */}
+          {onRegenerate && (
+            <div className="flex items-center gap-3 text-xs font-medium text-text-tertiary">
+              {regenerating ? (
+                <Loader2 className="w-3.5 h-3.5 animate-spin" />
+              ) : (
+                <RotateCw className="w-3.5 h-3.5" />
+              )}
+              <button
+                disabled={regenerating}
+                onClick={() => onRegenerate(epic.id, "stories")}
+                className="hover:text-primary transition-colors disabled:opacity-50"
+              >
+                Regenerate stories
+              </button>
+              <button
+                disabled={regenerating}
+                onClick={() => onRegenerate(epic.id, "epic")}
+                className="hover:text-primary transition-colors disabled:opacity-50"
+              >
+                Regenerate epic
+              </button>
+            </div>
+          )}
+        </div>
       </div>
 
       {/* Expanded: User Stories */}
@@ -103,6 +144,16 @@ export function EpicCard({ epic, color, editedFields, onEdit }: EpicCardProps) {
                 </div>
               </div>
             ))}
+          {epic.user_stories_next_cursor && onLoadMoreStories && (
+            <button
+              disabled={loadingStories}
+              onClick={() => onLoadMoreStories(epic.id)}
+              className="flex items-center gap-1.5 text-xs font-medium text-text-tertiary hover:text-primary transition-colors disabled:opacity-50"
+            >
+              {loadingStories && <Loader2 className="w-3.5 h-3.5 animate-spin" />}
+              Load more stories
+            </button>
+          )}
         </div>
       )}
     </div>
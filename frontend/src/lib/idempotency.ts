@@ -0,0 +1,29 @@
+import { useCallback, useMemo, useRef } from "react";
+
+/**
+ * Idempotency keys that last for one user action.
+ *
+ * `keyFor(action, payload)` returns the same key for as long as `action` is
+ * retried with the same payload, so a double click or a retry after a
+ * network error replays the first request instead of running it again.
+ * Changing the payload starts a new action. Call `done(action)` once it
+ * succeeded, so doing the same thing again is a new request.
+ */
+export function useIdempotencyKeys() {
+  const keys = useRef(new Map<string, { key: string; payload: string }>());
+
+  const keyFor = useCallback((action: string, payload: unknown): string => {
+    const serialized = JSON.stringify(payload);
+    const current = keys.current.get(action);
+    if (current && current.payload === serialized) return current.key;
+    const key = crypto.randomUUID();
+    keys.current.set(action, { key, payload: serialized });
+    return key;
+  }, []);
+
+  const done = useCallback((action: string) => {
+    keys.current.delete(action);
+  }, []);
+
+  return useMemo(() => ({ keyFor, done }), [keyFor, done]);
+}
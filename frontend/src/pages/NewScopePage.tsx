@@ -4,12 +4,14 @@ import { useForm } from "react-hook-form";
 import { zodResolver } from "@hookform/resolvers/zod";
 import { z } from "zod";
 import { generateScope } from "@/api/client";
-import type { BudgetRange, TimelinePressure } from "@/types";
+import { useIdempotencyKeys } from "@/lib/idempotency";
+import type { BudgetRange, GenerateScopePayload, TimelinePressure } from "@/types";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Textarea } from "@/components/ui/textarea";
 import { Card, CardContent } from "@/components/ui/card";
-import { Zap, Target, DollarSign, Clock, Sparkles } from "lucide-react";
+import { Checkbox } from "@/components/ui/checkbox";
+import { Zap, Target, DollarSign, Clock, Sparkles, Copy } from "lucide-react";
 
 const scopeSchema = z.object({
   product_name: z.string().min(1, "Product name is required"),
@@ -19,6 +21,7 @@ const scopeSchema = z.object({
   timeline_pressure: z
     .enum(["asap", "1_3_months", "3_6_months", "flexible"])
     .optional(),
+  clone_similar: z.boolean().optional(),
 });
 
 type ScopeFormData = z.infer<typeof scopeSchema>;
@@ -50,6 +53,7 @@ export function NewScopePage() {
   const [isGenerating, setIsGenerating] = useState(false);
   const [loadingMsgIndex, setLoadingMsgIndex] = useState(0);
   const [error, setError] = useState<string | null>(null);
+  const idempotency = useIdempotencyKeys();
 
   const {
     register,
@@ -63,12 +67,14 @@ export function NewScopePage() {
       product_name: "",
       idea_text: "",
       target_audience: "",
+      clone_similar: false,
     },
   });
 
   const ideaText = watch("idea_text");
   const budgetRange = watch("budget_range");
   const timelinePressure = watch("timeline_pressure");
+  const cloneSimilar = watch("clone_similar");
 
   const onSubmit = useCallback(
     async (data: ScopeFormData) => {
@@ -82,13 +88,22 @@ export function NewScopePage() {
       }, 2000);
 
       try {
-        const scope = await generateScope({
+        const payload: GenerateScopePayload = {
           product_name: data.product_name,
           idea_text: data.idea_text,
           target_audience: data.target_audience,
           budget_range: data.budget_range,
           timeline_pressure: data.timeline_pressure,
-        });
+          // The nearest past scope is an example for the LLM; copying a
+          // near-identical one instead is opt-in
+          reuse: data.clone_similar ? "clone" : "example",
+        };
+        // Retrying the same form replays the first generation if it got through
+        const scope = await generateScope(
+          payload,
+          idempotency.keyFor("generate", payload),
+        );
+        idempotency.done("generate");
         clearInterval(interval);
         navigate(`/scopes/${scope.id}`);
       } catch (err) {
@@ -101,7 +116,7 @@ export function NewScopePage() {
         );
       }
     },
-    [navigate],
+    [navigate, idempotency],
   );
 
   if (isGenerating) {
@@ -274,6 +289,25 @@ export function NewScopePage() {
                     ))}
                   </div>
                 </div>
+
+                {/* Reuse */}
+                <div className="flex items-start gap-2">
+                  <Checkbox
+                    id="clone_similar"
+                    checked={cloneSimilar}
+                    onCheckedChange={(checked) =>
+                      setValue("clone_similar", checked === true)
+                    }
+                    className="mt-0.5"
+                  />
+                  <label
+                    htmlFor="clone_similar"
+                    className="text-sm text-text-secondary flex items-start gap-1.5"
+                  >
+                    <Copy className="w-4 h-4 text-text-tertiary shrink-0" />
+                    Copy a near-identical past scope instead of generating
+                  </label>
+                </div>
               </CardContent>
             </Card>
           </div>
@@ -1,11 +1,10 @@
 import { useState, useEffect, useCallback } from "react";
 import { useParams, Link } from "react-router";
 import {
-  fetchProject,
+  fetchProjectBundle,
+  subscribeToChanges,
   fetchMilestones,
-  fetchTeamMembers,
   fetchProjectUpdates,
-  fetchSummaries,
   logUpdate,
   addTeamMember,
   reorderMilestones,
@@ -13,11 +12,13 @@ import {
   deleteProject,
   updateProject,
   createMilestone,
+  fetchProjectWorkload,
 } from "@/api/client";
 import type {
   Project,
   Milestone,
   TeamMember,
+  MemberWorkload,
   Update,
   Summary,
   MilestoneStatus,
@@ -129,6 +130,9 @@ export function ProjectPage() {
   const [project, setProject] = useState<Project | null>(null);
   const [milestones, setMilestones] = useState<Milestone[]>([]);
   const [teamMembers, setTeamMembers] = useState<TeamMember[]>([]);
+  const [workload, setWorkload] = useState<Record<string, MemberWorkload>>(
+    {},
+  );
   const [updates, setUpdates] = useState<Update[]>([]);
   const [summaries, setSummaries] = useState<Summary[]>([]);
   const [loading, setLoading] = useState(true);
@@ -163,26 +167,48 @@ export function ProjectPage() {
   // Drag and drop
   const [draggedIndex, setDraggedIndex] = useState<number | null>(null);
 
+  const loadBundle = useCallback((projectId: string) => {
+    return fetchProjectBundle(projectId).then((bundle) => {
+      setProject(bundle.project);
+      setMilestones(bundle.milestones);
+      setTeamMembers(bundle.teamMembers);
+      setUpdates(bundle.updates);
+      setSummaries(bundle.summaries);
+    });
+  }, []);
+
   useEffect(() => {
     if (!id) return;
     setLoading(true);
-    Promise.all([
-      fetchProject(id),
-      fetchMilestones(id),
-      fetchTeamMembers(id),
-      fetchProjectUpdates(id),
-      fetchSummaries(id),
-    ])
-      .then(([proj, ms, tm, ups, sums]) => {
-        setProject(proj);
-        setMilestones(ms);
-        setTeamMembers(tm);
-        setUpdates(ups.updates);
-        setSummaries(sums);
-      })
+    loadBundle(id)
       .catch(() => {})
       .finally(() => setLoading(false));
-  }, [id]);
+  }, [id, loadBundle]);
+
+  // Refetch when the server pushes changes, coalescing bursts of events
+  useEffect(() => {
+    if (!id) return;
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const refresh = () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => loadBundle(id).catch(() => {}), 300);
+    };
+    const unsubscribe = subscribeToChanges(id, refresh, refresh);
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, [id, loadBundle]);
+
+  // Workload is computed server-side; refetch it whenever the bundle changes
+  useEffect(() => {
+    if (!id || activeTab !== "team") return;
+    fetchProjectWorkload(id)
+      .then((members) =>
+        setWorkload(Object.fromEntries(members.map((m) => [m.id, m]))),
+      )
+      .catch(() => {});
+  }, [id, activeTab, teamMembers, milestones]);
 
   const overallProgress =
     milestones.length > 0
@@ -795,6 +821,12 @@ export function ProjectPage() {
                       <th className="text-left px-4 py-3 text-xs font-semibold text-text-tertiary uppercase tracking-wider">
                         Milestones
                       </th>
+                      <th className="text-left px-4 py-3 text-xs font-semibold text-text-tertiary uppercase tracking-wider">
+                        Open Stories
+                      </th>
+                      <th className="text-left px-4 py-3 text-xs font-semibold text-text-tertiary uppercase tracking-wider">
+                        Overdue
+                      </th>
                     </tr>
                   </thead>
                   <tbody>
@@ -820,11 +852,20 @@ export function ProjectPage() {
                           {member.role}
                         </td>
                         <td className="px-4 py-3 text-text-secondary">
-                          {
-                            milestones.filter(
-                              (m) => m.assigned_to === member.id,
-                            ).length
-                          }
+                          {workload[member.id]?.milestones_assigned ?? "–"}
+                        </td>
+                        <td className="px-4 py-3 text-text-secondary">
+                          {workload[member.id]?.stories_open ?? "–"}
+                        </td>
+                        <td
+                          className={cn(
+                            "px-4 py-3",
+                            workload[member.id]?.milestones_overdue
+                              ? "text-status-blocked font-medium"
+                              : "text-text-secondary",
+                          )}
+                        >
+                          {workload[member.id]?.milestones_overdue ?? "–"}
                         </td>
                       </tr>
                     ))}
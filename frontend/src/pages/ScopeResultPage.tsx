@@ -1,7 +1,14 @@
 import { useState, useEffect, useCallback } from "react";
 import { useParams, useNavigate } from "react-router";
-import { fetchScope, updateScope, convertScopeToProject } from "@/api/client";
+import {
+  fetchScope,
+  updateScope,
+  convertScopeToProject,
+  regenerateEpic,
+  fetchEpicStories,
+} from "@/api/client";
 import type { Scope, Epic } from "@/types";
+import { useIdempotencyKeys } from "@/lib/idempotency";
 import { EpicCard } from "@/components/scopes/EpicCard";
 import { getEpicColor, formatDate } from "@/lib/utils";
 import { Button } from "@/components/ui/button";
@@ -49,6 +56,13 @@ export function ScopeResultPage() {
   const [converting, setConverting] = useState(false);
   const [showConvertModal, setShowConvertModal] = useState(false);
   const [saving, setSaving] = useState(false);
+  const [regeneratingEpicId, setRegeneratingEpicId] = useState<string | null>(
+    null,
+  );
+  const [loadingStoriesEpicId, setLoadingStoriesEpicId] = useState<
+    string | null
+  >(null);
+  const idempotency = useIdempotencyKeys();
 
   useEffect(() => {
     if (!id) return;
@@ -71,6 +85,69 @@ export function ScopeResultPage() {
     [],
   );
 
+  const handleRegenerateEpic = useCallback(
+    async (epicId: string, mode: "epic" | "stories") => {
+      if (!scope) return;
+      setRegeneratingEpicId(epicId);
+      try {
+        const action = `regenerate:${epicId}`;
+        const epic = await regenerateEpic(
+          scope.id,
+          epicId,
+          { mode },
+          idempotency.keyFor(action, mode),
+        );
+        idempotency.done(action);
+        setScope((prev) =>
+          prev
+            ? {
+                ...prev,
+                epics: prev.epics.map((e) => (e.id === epicId ? epic : e)),
+              }
+            : prev,
+        );
+      } catch {
+        // silently fail — the existing epic is left unchanged
+      } finally {
+        setRegeneratingEpicId(null);
+      }
+    },
+    [scope, idempotency],
+  );
+
+  const handleLoadMoreStories = useCallback(
+    async (epicId: string) => {
+      const cursor = scope?.epics.find((e) => e.id === epicId)
+        ?.user_stories_next_cursor;
+      if (!scope || !cursor) return;
+      setLoadingStoriesEpicId(epicId);
+      try {
+        const page = await fetchEpicStories(scope.id, epicId, cursor);
+        setScope((prev) =>
+          prev
+            ? {
+                ...prev,
+                epics: prev.epics.map((e) =>
+                  e.id === epicId
+                    ? {
+                        ...e,
+                        user_stories: [...e.user_stories, ...page.user_stories],
+                        user_stories_next_cursor: page.next_cursor,
+                      }
+                    : e,
+                ),
+              }
+            : prev,
+        );
+      } catch {
+        // leave the stories loaded so far
+      } finally {
+        setLoadingStoriesEpicId(null);
+      }
+    },
+    [scope],
+  );
+
   const handleSaveEdits = useCallback(async () => {
     if (!scope) return;
     setSaving(true);
@@ -98,15 +175,19 @@ export function ScopeResultPage() {
     if (!scope) return;
     setConverting(true);
     try {
-      const project = await convertScopeToProject(scope.id, {
-        start_date: new Date().toISOString().split("T")[0],
-      });
+      const payload = { start_date: new Date().toISOString().split("T")[0] };
+      const project = await convertScopeToProject(
+        scope.id,
+        payload,
+        idempotency.keyFor(`convert:${scope.id}`, payload),
+      );
+      idempotency.done(`convert:${scope.id}`);
       navigate(`/projects/${project.id}`);
     } catch {
       setConverting(false);
       setShowConvertModal(false);
     }
-  }, [scope, navigate]);
+  }, [scope, navigate, idempotency]);
 
   if (loading) {
     return (
@@ -206,6 +287,14 @@ export function ScopeResultPage() {
                   color={getEpicColor(index)}
                   editedFields={editedEpics.get(epic.id)}
                   onEdit={handleEpicEdit}
+                  onRegenerate={
+                    scope.status === "converted"
+                      ? undefined
+                      : handleRegenerateEpic
+                  }
+                  regenerating={regeneratingEpicId === epic.id}
+                  onLoadMoreStories={handleLoadMoreStories}
+                  loadingStories={loadingStoriesEpicId === epic.id}
                 />
               ))}
           </div>
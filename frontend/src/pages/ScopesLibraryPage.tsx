@@ -23,37 +23,77 @@ const STATUS_LABELS: Record<ScopeStatus, string> = {
   archived: "Archived",
 };
 
+const SEARCH_DEBOUNCE_MS = 300;
+
 export function ScopesLibraryPage() {
   const [scopes, setScopes] = useState<ScopeListItem[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState<number | null>(null);
   const [filterStatus, setFilterStatus] = useState<ScopeStatus | "all">("all");
   const [searchQuery, setSearchQuery] = useState("");
+  const [prefix, setPrefix] = useState("");
+
+  // Filtering happens on the server; wait for typing to pause
+  useEffect(() => {
+    const timer = setTimeout(
+      () => setPrefix(searchQuery.trim()),
+      SEARCH_DEBOUNCE_MS,
+    );
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  const status = filterStatus === "all" ? undefined : filterStatus;
 
   useEffect(() => {
-    fetchScopes()
-      .then(setScopes)
-      .catch(() => setScopes([]))
-      .finally(() => setLoading(false));
-  }, []);
+    let cancelled = false;
+    setLoading(true);
+    fetchScopes({ status, prefix })
+      .then((page) => {
+        if (cancelled) return;
+        setScopes(page.scopes);
+        setNextCursor(page.next_cursor);
+        setTotal(page.total);
+      })
+      .catch(() => {
+        if (cancelled) return;
+        setScopes([]);
+        setNextCursor(null);
+        setTotal(null);
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [status, prefix]);
 
-  const filtered = scopes.filter((s) => {
-    if (filterStatus !== "all" && s.status !== filterStatus) return false;
-    if (
-      searchQuery &&
-      !s.product_name.toLowerCase().includes(searchQuery.toLowerCase())
-    )
-      return false;
-    return true;
-  });
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchScopes({ status, prefix, cursor: nextCursor });
+      setScopes((prev) => [...prev, ...page.scopes]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error("Failed to load more scopes:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const handleArchive = async (id: string) => {
     if (!confirm("Are you sure you want to archive this scope?")) return;
     try {
       await deleteScope(id);
       setScopes((prev) =>
-        prev.map((s) =>
-          s.id === id ? { ...s, status: "archived" as ScopeStatus } : s,
-        ),
+        prev
+          .map((s) =>
+            s.id === id ? { ...s, status: "archived" as ScopeStatus } : s,
+          )
+          .filter((s) => !status || s.status === status),
       );
     } catch (err) {
       console.error("Failed to archive scope:", err);
@@ -88,7 +128,7 @@ export function ScopesLibraryPage() {
           <Search className="absolute left-3 top-1/2 -translate-y-1/2 text-text-tertiary w-4 h-4" />
           <Input
             type="text"
-            placeholder="Search by product…"
+            placeholder="Search by product name…"
             value={searchQuery}
             onChange={(e) => setSearchQuery(e.target.value)}
             className="pl-9 bg-surface border-border focus-visible:ring-primary/30"
@@ -118,7 +158,7 @@ export function ScopesLibraryPage() {
             <Skeleton key={i} className="h-20 w-full rounded-xl" />
           ))}
         </div>
-      ) : filtered.length > 0 ? (
+      ) : scopes.length > 0 ? (
         <>
           {/* Desktop Table View */}
           <div className="hidden lg:block overflow-hidden">
@@ -144,7 +184,7 @@ export function ScopesLibraryPage() {
                   </tr>
                 </thead>
                 <tbody>
-                  {filtered.map((scope) => (
+                  {scopes.map((scope) => (
                     <tr
                       key={scope.id}
                       className="border-b border-border last:border-b-0 hover:bg-surface-dim/50 transition-colors"
@@ -201,7 +241,7 @@ export function ScopesLibraryPage() {
 
           {/* Mobile Card View */}
           <div className="lg:hidden space-y-3">
-            {filtered.map((scope) => (
+            {scopes.map((scope) => (
               <Card
                 key={scope.id}
                 className="bg-surface border-border p-4 hover:border-border-strong transition-all"
@@ -246,6 +286,26 @@ export function ScopesLibraryPage() {
               </Card>
             ))}
           </div>
+
+          <div className="flex flex-col items-center gap-2 mt-6">
+            {nextCursor && total !== null && (
+              <p className="text-xs text-text-tertiary">
+                Showing {scopes.length} of about{" "}
+                {Math.max(total, scopes.length)}
+              </p>
+            )}
+            {nextCursor && (
+              <Button
+                variant="outline"
+                size="sm"
+                onClick={handleLoadMore}
+                disabled={loadingMore}
+                className="text-xs"
+              >
+                {loadingMore ? "Loading…" : "Load more"}
+              </Button>
+            )}
+          </div>
         </>
       ) : (
         <Card className="bg-surface border-border border-dashed p-12 flex flex-col items-center justify-center text-center">
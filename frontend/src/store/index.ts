@@ -4,7 +4,7 @@ import type {
   Scope,
   Project,
   Milestone,
-  ScopeListItem,
+  ScopePage,
 } from "@/types";
 import {
   fetchProjects,
@@ -28,7 +28,7 @@ interface AppStore {
   projectsPromise: Promise<ProjectCardData[]> | null;
   invalidateProjects: () => void;
 
-  scopesPromise: Promise<ScopeListItem[]> | null;
+  scopesPromise: Promise<ScopePage> | null;
   invalidateScopes: () => void;
 
   activeScopePromise: Promise<Scope> | null;
@@ -42,6 +42,8 @@ export interface Epic {
   effort_days: number;
   order_index: number;
   user_stories: UserStory[];
+  /** Set when the epic has more stories than were embedded */
+  user_stories_next_cursor?: string | null;
 }
 
 export interface Scope {
@@ -56,6 +58,7 @@ export interface Scope {
   risks: Risk[];
   status: ScopeStatus;
   epics: Epic[];
+  reused_from?: ReusedFrom | null;
   created_at: string;
   updated_at: string;
 }
@@ -87,7 +90,10 @@ export interface Milestone {
   name: string;
   description: string;
   status: MilestoneStatus;
+  /** Derived from stories_completed / stories_total once there are stories */
   progress_percent: number;
+  stories_total: number;
+  stories_completed: number;
   start_date: string;
   due_date: string;
   order_index: number;
@@ -95,9 +101,28 @@ export interface Milestone {
   updated_at: string;
   user_stories?: UserStory[];
   updates?: Update[];
+  /** Cursors for the rest of the embedded (limited) collections */
+  user_stories_next_cursor?: string | null;
+  updates_next_cursor?: string | null;
   assigned_member?: TeamMember;
 }
 
+/** Story counts and derived progress returned by user story writes. */
+export type MilestoneProgress = Pick<
+  Milestone,
+  "id" | "stories_total" | "stories_completed" | "progress_percent"
+>;
+
+export interface UserStoryPage {
+  user_stories: UserStory[];
+  next_cursor: string | null;
+}
+
+export interface UpdatePage {
+  updates: Update[];
+  next_cursor: string | null;
+}
+
 export interface Project {
   id: string;
   scope_id: string;
@@ -118,6 +143,7 @@ export interface Summary {
   tone: SummaryTone;
   week_start: string;
   generated_at: string;
+  reused?: boolean;
 }
 
 export interface Notification {
@@ -140,6 +166,20 @@ export interface ScopeListItem {
   created_at: string;
 }
 
+export interface ScopePage {
+  scopes: ScopeListItem[];
+  next_cursor: string | null;
+  /** Estimated; only returned for the first page */
+  total: number | null;
+}
+
+export interface ScopeListParams {
+  status?: ScopeStatus;
+  prefix?: string;
+  cursor?: string;
+  limit?: number;
+}
+
 export interface ProjectCardData {
   id: string;
   name: string;
@@ -158,12 +198,29 @@ export interface GenerateScopePayload {
   target_audience?: string;
   budget_range?: BudgetRange;
   timeline_pressure?: TimelinePressure;
+  reuse?: "off" | "clone" | "example";
+}
+
+export interface ReusedFrom {
+  scope_id: string;
+  similarity: number;
+  mode: "clone" | "example";
+}
+
+export interface SimilarScope
+  extends Pick<Scope, "id" | "product_name" | "idea_text" | "status"> {
+  similarity: number;
 }
 
 export interface ConvertToProjectPayload {
   start_date: string;
 }
 
+export interface RegenerateEpicPayload {
+  mode?: "epic" | "stories";
+  instructions?: string;
+}
+
 export interface LogUpdatePayload {
   update_type: UpdateType;
   content: string;
@@ -191,6 +248,141 @@ export interface CreateUserStoryPayload {
   description?: string;
 }
 
+export interface BatchSubRequest {
+  id: string;
+  path: string;
+  method?: "GET" | "POST" | "PATCH" | "DELETE";
+  body?: unknown;
+}
+
+export interface BatchSubResponse<T = unknown> {
+  id: string;
+  status: number;
+  body: T;
+}
+
+/** Per-item result of a bulk archive/unarchive. */
+export interface ScopeBulkResult {
+  id: string;
+  status: number;
+  changed?: boolean;
+  scope?: Scope;
+  error?: string;
+}
+
+export interface ProjectBulkResult {
+  id: string;
+  status: number;
+  changed?: boolean;
+  project?: Project;
+  error?: string;
+}
+
+/** Progress of a bulk delete, polled from /bulk-jobs/:id. */
+export interface BulkJob {
+  id: string;
+  target: "scopes" | "projects";
+  action: "delete";
+  status: "queued" | "running" | "completed" | "failed";
+  total: number;
+  processed: number;
+  results: { id: string; status: number; error?: string }[];
+  created_at: string;
+  finished_at: string | null;
+}
+
+/** An update in the portfolio activity feed. */
+export interface PortfolioUpdate extends Update {
+  milestone_name: string;
+  project_id: string;
+  project_name: string;
+  project_status: ProjectStatus;
+}
+
+export interface PortfolioUpdatePage {
+  updates: PortfolioUpdate[];
+  next_cursor: string | null;
+}
+
+/** Assigned work of one team member (or person, across projects). */
+export interface WorkloadCounts {
+  milestones_assigned: number;
+  milestones_open: number;
+  milestones_blocked: number;
+  milestones_overdue: number;
+  stories_open: number;
+}
+
+export interface MemberWorkload extends WorkloadCounts {
+  id: string;
+  project_id: string;
+  name: string;
+  role: string;
+  avatar_color: string;
+}
+
+/** Portfolio view: a person's team member rows merged by name. */
+export interface PersonWorkload extends WorkloadCounts {
+  name: string;
+  role: string;
+  avatar_color: string;
+  member_ids: string[];
+  project_ids: string[];
+}
+
+/** One story's change in POST /user-stories/bulk. */
+export interface UserStoryPatch {
+  is_completed?: boolean;
+  title?: string;
+  description?: string;
+  milestone_id?: string;
+  delete?: true;
+}
+
+export type BulkUserStoryPayload =
+  | { ids: string[]; patch: UserStoryPatch }
+  | { items: (UserStoryPatch & { id: string })[] };
+
+export interface BulkUserStoryResult {
+  id: string;
+  status: number;
+  user_story?: UserStory;
+  deleted?: boolean;
+  error?: string;
+}
+
+export interface ChangeEvent {
+  table: string;
+  op: "insert" | "update" | "delete";
+  row_id: string;
+  project_id: string | null;
+  data: Record<string, unknown> | null;
+}
+
+export interface SyncResponse {
+  token: string;
+  full: boolean;
+  changes: {
+    projects: Project[];
+    team_members: TeamMember[];
+    milestones: Milestone[];
+    user_stories: UserStory[];
+    updates: Update[];
+  };
+  deleted: Record<
+    "projects" | "team_members" | "milestones" | "user_stories" | "updates",
+    string[]
+  >;
+}
+
+export interface ProjectBundle {
+  project: Project;
+  milestones: Milestone[];
+  teamMembers: TeamMember[];
+  updates: Update[];
+  summaries: Summary[];
+}
+
 export interface SearchResult {
   type: "project" | "milestone" | "update";
   id: string;